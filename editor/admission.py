@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+from django.conf import settings
+
+from . import metrics
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # Windows: cupos solo dentro del proceso
+    fcntl = None
+
+# Control de admision: cada clase de trabajo pesado tiene su cupo de ejecuciones
+# simultaneas (ADMISSION_LIMITS) y una cola acotada. Con la cola llena, o si la espera
+# supera ADMISSION_WAIT_SECONDS, se rechaza enseguida (503 con Retry-After) en vez de
+# ocupar todos los workers; las paginas livianas siguen respondiendo.
+#
+# Con ADMISSION_DIR los cupos se comparten entre workers: cada cupo (y cada lugar en la
+# cola) es un archivo con flock, que el sistema libera aunque el worker muera. Sin
+# directorio (o sin fcntl) los cupos son por proceso y solo sirven con varios hilos;
+# manage.py check lo avisa (editor.W003).
+OPERATIONS = ("parse_pdf", "parse_docx", "render_docx", "convert_pdf")
+
+_POLL_SECONDS = 0.05
+
+
+class Overloaded(Exception):
+    def __init__(self, operation: str, retry_after: int) -> None:
+        super().__init__(f"Sin cupo para {operation}")
+        self.operation = operation
+        self.retry_after = retry_after
+
+
+class _Budget:
+    # Conteo de este proceso (gauges); sin directorio compartido es ademas el cupo
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+
+
+_BUDGETS = {operation: _Budget() for operation in OPERATIONS}
+
+
+def limit(operation: str) -> int:
+    # 0 = sin limite
+    limits = getattr(settings, "ADMISSION_LIMITS", {}) or {}
+    return max(0, int(limits.get(operation, 0)))
+
+
+def retry_after() -> int:
+    return max(1, int(getattr(settings, "ADMISSION_RETRY_AFTER", 5)))
+
+
+def shared_dir() -> Path | None:
+    raw = str(getattr(settings, "ADMISSION_DIR", "") or "").strip()
+    if not raw or fcntl is None:
+        return None
+    return Path(raw)
+
+
+@contextmanager
+def admit(operation: str) -> Iterator[None]:
+    # Ocupa un cupo de la clase mientras dura el bloque; Overloaded si no hay cupo a tiempo
+    max_active = limit(operation)
+    if max_active <= 0:
+        yield
+        return
+    budget = _BUDGETS[operation]
+    directory = shared_dir()
+    started = time.perf_counter()
+    slot = None
+    if directory is None:
+        _wait_local(operation, budget, max_active)
+    else:
+        slot = _take_shared(operation, budget, max_active, directory)
+        with budget.condition:
+            budget.active += 1
+            metrics.set_gauge("trufadocs_admission_in_flight", budget.active, operation=operation)
+    metrics.observe("trufadocs_admission_wait_seconds", time.perf_counter() - started, operation=operation)
+    try:
+        yield
+    finally:
+        if slot is not None:
+            _release(slot)
+        with budget.condition:
+            budget.active -= 1
+            metrics.set_gauge("trufadocs_admission_in_flight", budget.active, operation=operation)
+            budget.condition.notify()
+
+
+def _queue_size() -> int:
+    return max(0, int(getattr(settings, "ADMISSION_QUEUE_SIZE", 8)))
+
+
+def _deadline() -> float:
+    return time.monotonic() + float(getattr(settings, "ADMISSION_WAIT_SECONDS", 10))
+
+
+def _wait_local(operation: str, budget: _Budget, max_active: int) -> None:
+    # Sale con el cupo tomado (active ya incrementado bajo el mismo lock)
+    with budget.condition:
+        if budget.active >= max_active:
+            if budget.waiting >= _queue_size():
+                _reject(operation, "queue_full")
+            _set_waiting(operation, budget, 1)
+            deadline = _deadline()
+            try:
+                while budget.active >= max_active:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        _reject(operation, "timeout")
+                    budget.condition.wait(remaining)
+            finally:
+                _set_waiting(operation, budget, -1)
+        budget.active += 1
+        metrics.set_gauge("trufadocs_admission_in_flight", budget.active, operation=operation)
+
+
+def _take_shared(operation: str, budget: _Budget, max_active: int, directory: Path) -> IO[bytes]:
+    directory.mkdir(parents=True, exist_ok=True)
+    slot = _try_lock(directory, f"{operation}-slot", max_active)
+    if slot is not None:
+        return slot
+    # Lugar en la cola compartida: tambien es un archivo con flock
+    ticket = _try_lock(directory, f"{operation}-queue", _queue_size())
+    if ticket is None:
+        _reject(operation, "queue_full")
+    with budget.condition:
+        _set_waiting(operation, budget, 1)
+    deadline = _deadline()
+    try:
+        while True:
+            time.sleep(_POLL_SECONDS)
+            slot = _try_lock(directory, f"{operation}-slot", max_active)
+            if slot is not None:
+                return slot
+            if time.monotonic() >= deadline:
+                _reject(operation, "timeout")
+    finally:
+        _release(ticket)
+        with budget.condition:
+            _set_waiting(operation, budget, -1)
+
+
+def _try_lock(directory: Path, prefix: str, count: int) -> IO[bytes] | None:
+    # Primer archivo libre de los count del grupo (el archivo queda abierto con el lock)
+    for index in range(count):
+        handle = open(directory / f"{prefix}-{index}.lock", "a+b")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            continue
+        return handle
+    return None
+
+
+def _release(handle: IO[bytes]) -> None:
+    try:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+    finally:
+        handle.close()
+
+
+def _set_waiting(operation: str, budget: _Budget, delta: int) -> None:
+    # Se llama con budget.condition tomado
+    budget.waiting += delta
+    metrics.set_gauge("trufadocs_admission_queue_depth", budget.waiting, operation=operation)
+
+
+def _reject(operation: str, reason: str) -> None:
+    metrics.inc("trufadocs_admission_rejected_total", operation=operation, reason=reason)
+    raise Overloaded(operation, retry_after())
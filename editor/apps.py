@@ -1,6 +1,21 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class EditorConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "editor"
\ No newline at end of file
+    name = "editor"
+
+    def ready(self) -> None:
+        from django.core.signals import request_finished
+
+        from . import checks, metrics  # noqa: F401 (checks registra los system checks)
+
+        # Con METRICS_MULTIPROC_DIR cada worker publica sus metricas al terminar un request
+        request_finished.connect(metrics.flush_on_request_finished, dispatch_uid="editor-metrics-flush")
+
+        # Con gunicorn --preload, precarga plantilla, regex y modulos pesados en el maestro
+        if getattr(settings, "EDITOR_WARMUP", False):
+            from .warmup import warmup
+
+            warmup()
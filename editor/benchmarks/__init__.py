@@ -0,0 +1,4 @@
+from .corpus import SIZES, LANGS, generate_cv
+from .runner import STAGES, compare_to_baseline, run_benchmarks
+
+__all__ = ["SIZES", "LANGS", "STAGES", "generate_cv", "run_benchmarks", "compare_to_baseline"]
@@ -0,0 +1,400 @@
+"""Generador determinista de CVs sintéticos para benchmarks.
+
+Cada CV se construye a partir de (seed, tamaño, idioma) y se puede obtener como
+estructura (dict), texto plano, DOCX, PDF o QueryDict del formulario del editor.
+"""
+
+from __future__ import annotations
+
+import io
+import random
+import zlib
+from dataclasses import dataclass
+
+# Cantidad de entradas por tamaño de documento
+SIZES: dict[str, dict[str, int]] = {
+    "small": {"experience": 2, "education": 1, "skills": 2, "extras": 1, "extra_entries": 2, "highlights": 2},
+    "medium": {"experience": 5, "education": 2, "skills": 4, "extras": 2, "extra_entries": 4, "highlights": 3},
+    "large": {"experience": 12, "education": 4, "skills": 8, "extras": 5, "extra_entries": 6, "highlights": 5},
+    "xlarge": {"experience": 30, "education": 8, "skills": 12, "extras": 20, "extra_entries": 8, "highlights": 6},
+}
+LANGS = ("es", "en")
+
+_HEADINGS = {
+    "es": {"experience": "EXPERIENCIA", "education": "EDUCACIÓN", "skills": "HABILIDADES", "present": "Actualidad"},
+    "en": {"experience": "PROFESSIONAL EXPERIENCE", "education": "EDUCATION", "skills": "SKILLS", "present": "Present"},
+}
+_MONTHS = {
+    "es": ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"],
+    "en": ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+}
+_FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Elena", "Felipe", "Gabriela", "Hugo", "Isabel", "Javier"]
+_LAST_NAMES = ["Rojas", "Muñoz", "Soto", "Pérez", "González", "Silva", "Morales", "Fuentes", "Castro", "Vega"]
+_COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Labs", "Wayne Tech", "Vandelay", "Cyberdyne"]
+_CITIES = [("Santiago", "Chile"), ("Valparaíso", "Chile"), ("Caracas", "Venezuela"), ("Maracaibo", "Venezuela")]
+_TECH = ["Python", "Django", "SQL", "Docker", "React", "TypeScript", "AWS", "Redis", "Celery", "Git", "Linux"]
+_ROLES = {
+    "es": ["Desarrollador Backend", "Ingeniero de Datos", "Analista QA", "Líder Técnico", "Desarrollador Full Stack"],
+    "en": ["Backend Developer", "Data Engineer", "QA Analyst", "Tech Lead", "Full Stack Developer"],
+}
+_DEGREES = {
+    "es": ["Ingeniería Civil Informática", "Magíster en Ciencia de Datos", "Técnico en Programación"],
+    "en": ["BSc Computer Science", "MSc Data Science", "Software Engineering Diploma"],
+}
+_VERBS = {
+    "es": ["Implementé", "Diseñé", "Optimicé", "Automaticé", "Migré", "Lideré"],
+    "en": ["Implemented", "Designed", "Optimized", "Automated", "Migrated", "Led"],
+}
+_OBJECTS = {
+    "es": ["la API de pagos", "el pipeline de datos", "el monitoreo", "los tests end-to-end", "el despliegue continuo"],
+    "en": ["the payments API", "the data pipeline", "monitoring", "end-to-end tests", "continuous deployment"],
+}
+_EXTRA_TITLES = {
+    "es": ["PROYECTOS", "CERTIFICACIONES", "IDIOMAS", "VOLUNTARIADO", "PUBLICACIONES", "PREMIOS"],
+    "en": ["PROJECTS", "CERTIFICATIONS", "LANGUAGES", "VOLUNTEERING", "PUBLICATIONS", "AWARDS"],
+}
+_SKILL_CATEGORIES = {
+    "es": ["Lenguajes", "Frameworks", "Bases de datos", "Herramientas", "Nube", "Metodologías"],
+    "en": ["Languages", "Frameworks", "Databases", "Tools", "Cloud", "Methodologies"],
+}
+
+
+@dataclass(frozen=True)
+class SyntheticCV:
+    seed: int
+    size: str
+    lang: str
+    structure: dict
+
+
+def generate_cv(seed: int, size: str = "medium", lang: str = "es") -> SyntheticCV:
+    counts = SIZES[size]
+    rng = random.Random(f"{seed}:{size}:{lang}")
+    first = rng.choice(_FIRST_NAMES)
+    last = rng.choice(_LAST_NAMES)
+    city, country = rng.choice(_CITIES)
+    handle = f"{first}{last}".lower().replace("ñ", "n").replace("é", "e")
+
+    def sentence() -> str:
+        return f"{rng.choice(_VERBS[lang])} {rng.choice(_OBJECTS[lang])} con {', '.join(rng.sample(_TECH, 2))}"
+
+    def date_pair(index: int) -> tuple[str, str]:
+        year = 2024 - index * 2
+        start = f"{year - 1}-{rng.randint(1, 12):02d}"
+        end = "" if index == 0 else f"{year}-{rng.randint(1, 12):02d}"
+        return start, end
+
+    experience = []
+    for idx in range(counts["experience"]):
+        start, end = date_pair(idx)
+        exp_city, exp_country = rng.choice(_CITIES)
+        experience.append(
+            {
+                "role": rng.choice(_ROLES[lang]),
+                "company": f"{rng.choice(_COMPANIES)} {idx + 1}",
+                "start": start,
+                "end": end,
+                "city": exp_city,
+                "country": exp_country,
+                "technologies": ", ".join(rng.sample(_TECH, 4)),
+                "highlights": [sentence() for _ in range(counts["highlights"])],
+            }
+        )
+
+    education = []
+    for idx in range(counts["education"]):
+        start, end = date_pair(idx + 1)
+        education.append(
+            {
+                "degree": rng.choice(_DEGREES[lang]),
+                "institution": f"Universidad {rng.choice(_LAST_NAMES)} {idx + 1}",
+                "start": start,
+                "end": end,
+                "city": city,
+                "country": country,
+                "honors": "Magna Cum Laude" if idx == 0 else "",
+            }
+        )
+
+    skills = []
+    for idx in range(counts["skills"]):
+        category = _SKILL_CATEGORIES[lang][idx % len(_SKILL_CATEGORIES[lang])]
+        skills.append({"category": f"{category} {idx + 1}", "items": ", ".join(rng.sample(_TECH, 5))})
+
+    extras = []
+    for idx in range(counts["extras"]):
+        detailed = idx % 2 == 0
+        title = _EXTRA_TITLES[lang][idx % len(_EXTRA_TITLES[lang])]
+        entries = []
+        for entry_idx in range(counts["extra_entries"]):
+            if detailed:
+                start, end = date_pair(entry_idx + 1)
+                entries.append(
+                    {
+                        "subtitle": "",
+                        "title": rng.choice(_ROLES[lang]),
+                        "where": f"{rng.choice(_COMPANIES)} Lab {entry_idx + 1}",
+                        "tech": ", ".join(rng.sample(_TECH, 3)),
+                        "start": start,
+                        "end": end,
+                        "city": city,
+                        "country": country,
+                        "items": [sentence() for _ in range(2)],
+                    }
+                )
+            else:
+                entries.append(
+                    {
+                        "subtitle": f"{title.title()} {entry_idx + 1}",
+                        "title": "",
+                        "where": "",
+                        "tech": "",
+                        "start": "",
+                        "end": "",
+                        "city": "",
+                        "country": "",
+                        "items": rng.sample(_TECH, 2),
+                    }
+                )
+        extras.append(
+            {
+                "section_id": f"extra-{idx}",
+                "title": f"{title} {idx + 1}" if idx >= len(_EXTRA_TITLES[lang]) else title,
+                "mode": "detailed" if detailed else "subtitle_items",
+                "entries": entries,
+            }
+        )
+
+    core_order = ["experience"] + [extra["section_id"] for extra in extras[:1]] + ["education", "skills"]
+    core_order += [extra["section_id"] for extra in extras[1:]]
+    structure = {
+        "meta": {"core_order": ",".join(core_order)},
+        "basics": {
+            "name": f"{first} {last}",
+            "description": " ".join(sentence() + "." for _ in range(2)),
+            "email": f"{handle}@example.com",
+            "phone": f"+56 9 {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}",
+            "linkedin": f"https://www.linkedin.com/in/{handle}",
+            "github": f"https://github.com/{handle}",
+            "city": city,
+            "country": country,
+        },
+        "experience": experience,
+        "education": education,
+        "skills": skills,
+        "extra_sections": extras,
+    }
+    return SyntheticCV(seed=seed, size=size, lang=lang, structure=structure)
+
+
+# --------------------
+# Representaciones
+# --------------------
+
+
+def _format_month(token: str, lang: str) -> str:
+    if not token:
+        return _HEADINGS[lang]["present"]
+    year, month = token.split("-", 1)
+    return f"{_MONTHS[lang][int(month) - 1]} {year}"
+
+
+def _date_range(item: dict, lang: str) -> str:
+    return f"{_format_month(item.get('start') or '', lang)} – {_format_month(item.get('end') or '', lang)}"
+
+
+def cv_layout_lines(cv: SyntheticCV) -> list[tuple[str, float, bool, float]]:
+    # (texto, tamaño de fuente, negrita, sangría) en el orden visual del CV
+    data = cv.structure
+    lang = cv.lang
+    headings = _HEADINGS[lang]
+    basics = data["basics"]
+    lines: list[tuple[str, float, bool, float]] = [
+        (basics["name"], 18, True, 0),
+        (f"{basics['city']}, {basics['country']} · {basics['email']} | {basics['phone']}", 10, False, 0),
+        (f"{basics['linkedin']} | {basics['github']}", 10, False, 0),
+        (basics["description"], 10, False, 0),
+    ]
+
+    def section(title: str) -> None:
+        lines.append((title, 13, True, 0))
+
+    modules: dict[str, list[tuple[str, float, bool, float]]] = {}
+
+    block: list[tuple[str, float, bool, float]] = []
+    for item in data["experience"]:
+        block.append((f"{item['company']} | {item['city']}, {item['country']}", 10, True, 0))
+        block.append((f"{item['role']} | {_date_range(item, lang)}", 10, False, 0))
+        block.append((item["technologies"], 10, False, 0))
+        block.extend((f"• {highlight}", 10, False, 14) for highlight in item["highlights"])
+    modules["experience"] = block
+
+    block = []
+    for item in data["education"]:
+        block.append((f"{item['institution']} | {item['city']}, {item['country']}", 10, True, 0))
+        block.append((f"{item['degree']} | {_date_range(item, lang)}", 10, False, 0))
+        if item["honors"]:
+            block.append((f"{'Honores' if lang == 'es' else 'Honors'}: {item['honors']}", 10, False, 0))
+    modules["education"] = block
+
+    block = []
+    for item in data["skills"]:
+        block.append((f"• {item['category']}", 10, True, 14))
+        block.append((item["items"], 10, False, 0))
+    modules["skills"] = block
+
+    for extra in data["extra_sections"]:
+        block = []
+        for entry in extra["entries"]:
+            if extra["mode"] == "detailed":
+                block.append((f"{entry['where']} | {entry['city']}, {entry['country']}", 10, True, 0))
+                block.append((f"{entry['title']} | {_date_range(entry, lang)}", 10, False, 0))
+                block.append((entry["tech"], 10, False, 0))
+                block.extend((f"• {item}", 10, False, 14) for item in entry["items"])
+            else:
+                block.append((f"• {entry['subtitle']}: {', '.join(entry['items'])}", 10, False, 14))
+        modules[extra["section_id"]] = block
+
+    titles = {"experience": headings["experience"], "education": headings["education"], "skills": headings["skills"]}
+    titles.update({extra["section_id"]: extra["title"] for extra in data["extra_sections"]})
+    for module_id in data["meta"]["core_order"].split(","):
+        section(titles[module_id])
+        lines.extend(modules[module_id])
+    return lines
+
+
+def cv_to_text(cv: SyntheticCV) -> str:
+    return "\n".join(text for text, _, _, _ in cv_layout_lines(cv))
+
+
+def cv_to_docx_bytes(cv: SyntheticCV) -> bytes:
+    from docx import Document as DocxDocument
+
+    doc = DocxDocument()
+    for text, _, bold, _ in cv_layout_lines(cv):
+        paragraph = doc.add_paragraph()
+        run = paragraph.add_run(text)
+        run.bold = bold
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_text(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def cv_to_pdf_bytes(cv: SyntheticCV) -> bytes:
+    # PDF mínimo (Helvetica, WinAnsi) sin dependencias externas
+    page_width, page_height, margin = 595, 842, 50
+    pages: list[bytes] = []
+    ops: list[bytes] = []
+    y = page_height - margin
+    for text, size, bold, indent in cv_layout_lines(cv):
+        leading = size * 1.45
+        if y - leading < margin:
+            pages.append(b"\n".join(ops))
+            ops = []
+            y = page_height - margin
+        y -= leading
+        font = b"/F2" if bold else b"/F1"
+        ops.append(
+            b"BT " + font + b" %d Tf %.2f %.2f Td (" % (size, margin + indent, y) + _pdf_text(text) + b") Tj ET"
+        )
+        if size >= 13:
+            ops.append(b"%.2f %.2f %.2f 0.6 re f" % (margin, y - 3, page_width - 2 * margin))
+    if ops:
+        pages.append(b"\n".join(ops))
+
+    objects: list[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages, se completa al final
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids: list[int] = []
+    for content in pages:
+        stream = zlib.compress(content)
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>" % (page_width, page_height, content_id)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets: list[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_at = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at))
+    return out.getvalue()
+
+
+def cv_to_querydict(cv: SyntheticCV):
+    # Reproduce el POST del editor (campos ocultos por modo no se envían)
+    from django.http import QueryDict
+
+    data = cv.structure
+    qd = QueryDict("", mutable=True)
+    for key, value in data["basics"].items():
+        qd.appendlist(key, value)
+    qd.appendlist("core_order", data["meta"]["core_order"])
+    qd.appendlist(
+        "module_order_map",
+        ",".join(f"{module_id}:{idx}" for idx, module_id in enumerate(data["meta"]["core_order"].split(","), start=1)),
+    )
+    qd.appendlist("ui_lang", cv.lang)
+    qd.appendlist("use_structured", "1")
+
+    for item in data["experience"]:
+        qd.appendlist("exp_role", item["role"])
+        qd.appendlist("exp_company", item["company"])
+        qd.appendlist("exp_start", item["start"])
+        qd.appendlist("exp_end", item["end"] or "Actualidad")
+        qd.appendlist("exp_country", item["country"])
+        qd.appendlist("exp_city", item["city"])
+        qd.appendlist("exp_tech", item["technologies"])
+        qd.appendlist("exp_highlights", "\n".join(item["highlights"]))
+    for item in data["education"]:
+        qd.appendlist("edu_degree", item["degree"])
+        qd.appendlist("edu_institution", item["institution"])
+        qd.appendlist("edu_start", item["start"])
+        qd.appendlist("edu_end", item["end"])
+        qd.appendlist("edu_country", item["country"])
+        qd.appendlist("edu_city", item["city"])
+        qd.appendlist("edu_honors", item["honors"])
+    for item in data["skills"]:
+        qd.appendlist("skill_category", item["category"])
+        qd.appendlist("skill_items", item["items"])
+    for extra in data["extra_sections"]:
+        qd.appendlist("extra_section_id", extra["section_id"])
+        qd.appendlist("extra_title", extra["title"])
+        qd.appendlist("extra_mode", extra["mode"])
+    for extra in data["extra_sections"]:
+        for entry in extra["entries"]:
+            qd.appendlist("extra_entry_section", extra["section_id"])
+            if extra["mode"] == "detailed":
+                qd.appendlist("extra_entry_where", entry["where"])
+                qd.appendlist("extra_entry_title", entry["title"])
+                qd.appendlist("extra_entry_tech", entry["tech"])
+                qd.appendlist("extra_entry_country", entry["country"])
+                qd.appendlist("extra_entry_city", entry["city"])
+                qd.appendlist("extra_entry_start", entry["start"])
+                qd.appendlist("extra_entry_end", entry["end"])
+                qd.appendlist("extra_entry_items_detailed", "\n".join(entry["items"]))
+            else:
+                qd.appendlist("extra_entry_subtitle", entry["subtitle"])
+                qd.appendlist("extra_entry_items_si", "\n".join(entry["items"]))
+    return qd
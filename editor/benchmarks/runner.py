@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import io
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+from typing import Callable
+
+from .corpus import (
+    LANGS,
+    SIZES,
+    cv_to_docx_bytes,
+    cv_to_pdf_bytes,
+    cv_to_querydict,
+    cv_to_text,
+    generate_cv,
+)
+
+# Etapas medidas por separado (nombre -> descripción)
+STAGES = (
+    "parse_resume",
+    "parse_pdf_to_structure",
+    "structure_from_post",
+    "build_text_from_structure",
+    "render_from_template",
+    "render_reordered",
+    "render_cached",
+    "render_editor_page",
+)
+
+# Diferencias menores a esto (ms) no cuentan como regresión: ruido del reloj
+MIN_REGRESSION_DELTA_MS = 2.0
+
+
+def _time_call(
+    func: Callable[[], object], repeat: int, before: Callable[[], object] | None = None
+) -> dict[str, float]:
+    # before corre antes de cada muestra, fuera del tiempo medido
+    samples: list[float] = []
+    func()  # calentamiento (imports, caches)
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def _editor_request(lang: str):
+    from django.test import RequestFactory
+
+    return RequestFactory().get("/", {"ui_lang": lang})
+
+
+# Renders que deben armar las tablas en cada muestra (sin la cache de contenido)
+_UNCACHED_STAGES = ("render_from_template", "render_reordered")
+
+
+def _stage_callables(cv, template_path: Path | None) -> dict[str, Callable[[], object]]:
+    from ..docx_template import render_from_template
+    from ..pdf_parse import parse_pdf_to_structure
+    from ..structure import build_text_from_structure, parse_resume, structure_from_post
+    from ..views import _extract_docx_text, _render_text_editor
+
+    # El texto de parse_resume viene del DOCX, igual que en la subida real
+    docx_text, _ = _extract_docx_text(io.BytesIO(cv_to_docx_bytes(cv)))
+    pdf_bytes = cv_to_pdf_bytes(cv)
+    post_data = cv_to_querydict(cv)
+    structured = structure_from_post(post_data)
+
+    calls: dict[str, Callable[[], object]] = {
+        "parse_resume": lambda: parse_resume(docx_text),
+        "parse_pdf_to_structure": lambda: parse_pdf_to_structure(io.BytesIO(pdf_bytes)),
+        "structure_from_post": lambda: structure_from_post(post_data),
+        "build_text_from_structure": lambda: build_text_from_structure(structured),
+        # editor.html con todas las entradas del CV (respuesta de /upload/)
+        "render_editor_page": lambda: _render_text_editor(_editor_request(cv.lang), structured),
+    }
+    if template_path is not None:
+        calls["render_from_template"] = lambda: render_from_template(
+            structured, template_path, ui_lang=cv.lang
+        )
+        # Todos los modulos en orden inverso (extras primero): mueve cada fila de la tabla
+        reordered = _reversed_module_order(structured)
+        calls["render_reordered"] = lambda: render_from_template(reordered, template_path, ui_lang=cv.lang)
+        # Mismo render con el contenido ya armado (solo fuente, encabezados y guardado)
+        calls["render_cached"] = calls["render_from_template"]
+    return calls
+
+
+def _reversed_module_order(structured: dict) -> dict:
+    extra_ids = [extra.get("section_id") for extra in structured.get("extra_sections") or []]
+    module_ids = ["experience", "education", "skills"] + [sid for sid in extra_ids if sid]
+    meta = dict(structured.get("meta") or {}, core_order=",".join(reversed(module_ids)))
+    return dict(structured, meta=meta)
+
+
+def run_benchmarks(
+    sizes: list[str] | None = None,
+    langs: list[str] | None = None,
+    stages: list[str] | None = None,
+    repeat: int = 5,
+    seed: int = 0,
+    template_path: Path | None = None,
+) -> dict:
+    sizes = sizes or list(SIZES)
+    langs = langs or list(LANGS)
+    stages = stages or list(STAGES)
+    from ..docx_template import clear_content_cache
+
+    cases: dict[str, dict[str, float]] = {}
+    for size in sizes:
+        for lang in langs:
+            cv = generate_cv(seed, size, lang)
+            calls = _stage_callables(cv, template_path)
+            for stage_name in stages:
+                func = calls.get(stage_name)
+                if func is None:
+                    continue
+                before = clear_content_cache if stage_name in _UNCACHED_STAGES else None
+                cases[f"{stage_name}/{size}/{lang}"] = _time_call(func, repeat, before)
+    return {
+        "meta": {
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": cases,
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    # Regresión = mediana actual > mediana base * (1 + threshold) y sobre el ruido mínimo
+    regressions: list[dict] = []
+    base_cases = baseline.get("cases") or {}
+    for case, current in (results.get("cases") or {}).items():
+        previous = base_cases.get(case)
+        if not previous:
+            continue
+        before = float(previous.get("median_ms") or 0)
+        after = float(current.get("median_ms") or 0)
+        if after > before * (1 + threshold) and after - before >= MIN_REGRESSION_DELTA_MS:
+            regressions.append(
+                {
+                    "case": case,
+                    "baseline_ms": before,
+                    "current_ms": after,
+                    "ratio": round(after / before, 3) if before else None,
+                }
+            )
+    return regressions
+
+
+def load_results(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_results(results: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from django.core.checks import Error, Warning, register
+
+
+@register("editor")
+def check_templates(app_configs=None, **kwargs) -> list:
+    # Una plantilla rota falla al desplegar (manage.py check / migrate), no en el primer export
+    from . import template_registry
+    from .docx_template import _load_template, template_slots
+    from .template_artifact import artifact_status
+
+    paths = template_registry.template_paths()
+    if not paths:
+        return [
+            Warning(
+                "No se encontro una plantilla DOCX valida para exportar.",
+                hint="Configura CV_TEMPLATE_PATH o agrega templates/cv_template.docx.",
+                id="editor.W001",
+            )
+        ]
+
+    messages: list = []
+    for name, path in paths.items():
+        try:
+            _, template_bytes, template_key = _load_template(path)
+            template_slots(template_key, template_bytes)
+        except Exception as exc:
+            messages.append(
+                Error(
+                    f"La plantilla '{name}' ({path}) no se puede usar: {str(exc).strip() or exc.__class__.__name__}",
+                    id="editor.E001",
+                )
+            )
+            continue
+        if artifact_status(path, template_key) in {"stale", "invalid"}:
+            messages.append(
+                Warning(
+                    f"El artefacto precompilado de la plantilla '{name}' no corresponde a la version actual.",
+                    hint="Ejecuta: python manage.py compile_template",
+                    id="editor.W002",
+                )
+            )
+    return messages
+
+
+@register("editor", deploy=True)
+def check_admission(app_configs=None, **kwargs) -> list:
+    # Sin directorio compartido los cupos son por proceso: con workers sync no limitan nada
+    # (solo en check --deploy: en desarrollo runserver usa hilos y el cupo local alcanza)
+    from . import admission
+
+    if admission.shared_dir() is not None or not any(admission.limit(op) for op in admission.OPERATIONS):
+        return []
+    return [
+        Warning(
+            "Los cupos de ADMISSION_* son por proceso: con workers de un solo hilo no limitan nada.",
+            hint="Define ADMISSION_DIR (requiere fcntl) o usa workers con varios hilos (gunicorn --threads).",
+            id="editor.W003",
+        )
+    ]
@@ -1,21 +1,38 @@
 from __future__ import annotations
 
+import functools
+import hashlib
 import io
+import json
 import re
+import threading
+from collections import OrderedDict
 from contextvars import ContextVar
 from copy import deepcopy
 from pathlib import Path
-from typing import Any, TypeAlias
+from typing import Any, BinaryIO, TypeAlias
 
 from docx import Document as DocxDocument
 from docx.opc.constants import RELATIONSHIP_TYPE as RT
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+from docx.opc.oxml import serialize_part_xml
+from docx.opc.part import XmlPart
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import nsmap, qn
 from docx.shared import Pt, RGBColor
+from docx.table import _Row
 from docx.text.run import Run
+from lxml import etree
+
+from . import metrics
+from .docx_writer import compress_member, register_template_members, template_members, write_docx
+from .template_artifact import load_artifact
+from .timing import stage
 
 DocxDocumentType: TypeAlias = Any
 ContactPart: TypeAlias = tuple[str, str, str | None, int]
+# Partes XML modificadas (partname -> blob), relaciones externas (rId, tipo, destino)
+# y fila de cada encabezado core (modulo -> indice) para localizarlos sin buscarlos
+ContentLayer: TypeAlias = tuple[dict[str, bytes], tuple[tuple[str, str, str], ...], dict[str, int]]
 
 EXPORT_TEXT = {
     "es": {
@@ -64,8 +81,13 @@ EXPORT_TEXT = {
     },
 }
 
+_DRAWINGML_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
 _EXPORT_UI_LANG: ContextVar[str] = ContextVar("docx_export_ui_lang", default="es")
 
+# Plantillas leidas una vez por proceso: ruta -> ((mtime_ns, size), bytes, sha256)
+_TEMPLATE_BYTES_CACHE: dict[str, tuple[tuple[int, int], bytes, str]] = {}
+
 
 def _normalize_ui_lang(value: str | None) -> str:
     return "en" if str(value or "").strip().lower() == "en" else "es"
@@ -99,111 +121,352 @@ def _entry_items_inline(entry: dict) -> str:
     return ", ".join(items)
 
 
+def _load_template(template_path: Path | str) -> tuple[tuple[int, int], bytes, str]:
+    # Lee la plantilla una sola vez por proceso; se recarga si cambia en disco
+    path = Path(template_path)
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = str(path.resolve())
+    cached = _TEMPLATE_BYTES_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached
+    data = path.read_bytes()
+    cached = (signature, data, hashlib.sha256(data).hexdigest())
+    _load_compiled(path, cached[2])
+    _TEMPLATE_BYTES_CACHE[key] = cached
+    return cached
+
+
+def _load_compiled(path: Path, template_key: str) -> None:
+    # Con el artefacto de compile_template, el mapa de filas y las partes comprimidas
+    # se leen de disco en vez de analizar la plantilla (se ignora si es de otra version)
+    if template_key in _TEMPLATE_SLOTS:
+        return
+    compiled = load_artifact(path, template_key)
+    if compiled is None:
+        return
+    slots, members = compiled
+    with _TEMPLATE_SLOTS_LOCK:
+        if template_key not in _TEMPLATE_SLOTS:
+            _lru_put(_TEMPLATE_SLOTS, template_key, slots, _TEMPLATE_CACHE_SIZE)
+    register_template_members(template_key, members)
+
+
+def load_template_bytes(template_path: Path | str) -> bytes:
+    return _load_template(template_path)[1]
+
+
+def preload_template(template_path: Path | str) -> None:
+    # Deja lista la plantilla (bytes, partes comprimidas y mapa de filas) antes del primer export
+    _, template_bytes, template_key = _load_template(template_path)
+    template_members(template_key, template_bytes)
+    template_slots(template_key, template_bytes)
+
+
+def template_digest(template_path: Path | str) -> str:
+    # Version de la plantilla (sha256 del contenido) para claves de cache
+    return _load_template(template_path)[2]
+
+
 def render_from_template(
     structured: dict,
     template_path: Path,
     font_name: str | None = None,
     ui_lang: str | None = None,
 ) -> bytes:
-    # Carga la plantilla DOCX y reemplaza secciones con la data estructurada
-    lang_token = _EXPORT_UI_LANG.set(_normalize_ui_lang(ui_lang))
+    buffer = io.BytesIO()
+    render_to_file(structured, template_path, buffer, font_name=font_name, ui_lang=ui_lang)
+    return buffer.getvalue()
+
+
+@stage("render_docx")
+def render_to_file(
+    structured: dict,
+    template_path: Path,
+    out: BinaryIO,
+    font_name: str | None = None,
+    ui_lang: str | None = None,
+) -> None:
+    # Como render_from_template, pero escribe el .docx directo en out (ej. un archivo
+    # temporal) sin armar los bytes del documento en memoria.
+    # Carga la plantilla DOCX y reemplaza secciones con la data estructurada.
+    # El contenido (tablas llenas y ordenadas) se guarda por estructura e idioma;
+    # encabezados localizados y fuente se aplican al final, sobre la plantilla restaurada.
+    lang = _normalize_ui_lang(ui_lang)
+    lang_token = _EXPORT_UI_LANG.set(lang)
     try:
-        doc = DocxDocument(str(template_path))
+        _, template_bytes, template_key = _load_template(template_path)
+        doc = DocxDocument(io.BytesIO(template_bytes))
         if not doc.tables:
             raise ValueError("La plantilla no contiene tablas.")
 
-        table = doc.tables[0]
-        basics = structured.get("basics", {})
-        experience = structured.get("experience", []) or []
-        education = structured.get("education", []) or []
-        skills = structured.get("skills", []) or []
-        extras = structured.get("extra_sections", []) or []
-
-        exp_header_idx = _find_row_index(table, "experiencia")
-        edu_header_idx = _find_row_index(table, "educación")
-        skills_header_idx = _find_row_index(table, "habilidades")
-        if exp_header_idx is None or edu_header_idx is None or skills_header_idx is None:
-            raise ValueError("No se encontraron secciones clave en la plantilla.")
-
-        contact_row_idx = _find_row_index_predicate(
-            table,
-            lambda text: "linkedin" in text or "github" in text or "@" in text,
-        )
-        name_row_idx = _find_first_non_empty_before(table, contact_row_idx or exp_header_idx)
-        summary_row_idx = _find_next_non_empty_row(table, (contact_row_idx or 0) + 1, exp_header_idx)
-
-        if name_row_idx is not None:
-            _set_row_text(table.rows[name_row_idx], basics.get("name", "").strip())
-
-        if contact_row_idx is not None:
-            _set_contact_row(table.rows[contact_row_idx], basics)
+        members = template_members(template_key, template_bytes)
+        content_key = _content_key(structured, lang, template_key)
+        layer = _content_layer_get(content_key)
+        if layer is None:
+            with stage("render_content"):
+                heading_trs = _render_content(doc, structured, template_slots(template_key, template_bytes))
+            layer = _snapshot_content(doc, members, heading_trs)
+            _content_layer_put(content_key, layer)
+        else:
+            doc = _restore_content(doc, layer)
 
-        if summary_row_idx is not None:
-            _set_row_text(table.rows[summary_row_idx], basics.get("description", "").strip())
+        # Traduce encabezados de módulos core para export final.
+        _localize_core_headings(doc.tables[0], layer[2])
+        # Aplica fuente global si el usuario la selecciono
+        _apply_font(doc, font_name)
 
-        # Experiencia y educacion se escriben en bloques con filas clonadas
-        _set_row_keep_with_next(table.rows[exp_header_idx])
-        _set_row_keep_with_next(table.rows[edu_header_idx])
-        _apply_section_keep_with_next_gap(table, exp_header_idx)
-        _apply_experience(table, exp_header_idx, edu_header_idx, experience)
+        numbering = _skills_numbering_override(
+            doc,
+            template_key,
+            _skills_numbering_pairs(template_slots(template_key, template_bytes), structured.get("skills") or []),
+        )
+        # Partes sin cambios (fuentes embebidas, estilos, tema) se copian ya comprimidas
+        write_docx(doc, out, members, numbering)
+    finally:
+        _EXPORT_UI_LANG.reset(lang_token)
 
-        edu_header_idx = _find_row_index(table, "educación")
-        skills_header_idx = _find_row_index(table, "habilidades")
-        if edu_header_idx is None or skills_header_idx is None:
-            raise ValueError("No se encontraron secciones clave en la plantilla.")
 
-        _set_row_keep_with_next(table.rows[edu_header_idx])
-        _set_row_keep_with_next(table.rows[skills_header_idx])
-        _apply_section_keep_with_next_gap(table, edu_header_idx)
-        _apply_education(table, edu_header_idx, skills_header_idx, education)
+def _render_content(doc: DocxDocumentType, structured: dict, slots: dict[str, Any]) -> dict[str, Any]:
+    # Todo lo que depende de la estructura (y del idioma de fechas/titulos), no de la fuente.
+    # Las filas salen del mapa de la plantilla; al insertar/quitar filas de un bloque
+    # se desplazan los indices de los bloques siguientes.
+    table = doc.tables[0]
+    basics = structured.get("basics", {})
+    experience = structured.get("experience", []) or []
+    education = structured.get("education", []) or []
+    skills = structured.get("skills", []) or []
+    extras = structured.get("extra_sections", []) or []
+
+    exp_header_idx = slots["experience"]
+    edu_header_idx = slots["education"]
+    skills_header_idx = slots["skills"]
+
+    if slots["name"] is not None:
+        _set_row_text(table.rows[slots["name"]], basics.get("name", "").strip())
+
+    if slots["contact"] is not None:
+        _set_contact_row(table.rows[slots["contact"]], basics)
+
+    if slots["summary"] is not None:
+        _set_row_text(table.rows[slots["summary"]], basics.get("description", "").strip())
+
+    # Experiencia y educacion se escriben en bloques con filas clonadas
+    _set_row_keep_with_next(table.rows[exp_header_idx])
+    _set_row_keep_with_next(table.rows[edu_header_idx])
+    _apply_section_keep_with_next_gap(table, exp_header_idx)
+    row_count = len(table._tbl.tr_lst)
+    _apply_experience(table, exp_header_idx, edu_header_idx, experience, slots["experience_rows"])
+    shift = len(table._tbl.tr_lst) - row_count
+    edu_header_idx += shift
+    skills_header_idx += shift
+
+    _set_row_keep_with_next(table.rows[edu_header_idx])
+    _set_row_keep_with_next(table.rows[skills_header_idx])
+    _apply_section_keep_with_next_gap(table, edu_header_idx)
+    row_count = len(table._tbl.tr_lst)
+    _apply_education(table, edu_header_idx, skills_header_idx, education, slots["education_rows"])
+    skills_header_idx += len(table._tbl.tr_lst) - row_count
+
+    _set_row_keep_with_next(table.rows[skills_header_idx])
+    _apply_section_keep_with_next_gap(table, skills_header_idx)
+    skills_content_idx = None
+    if slots["skills_content_offset"] is not None:
+        skills_content_idx = skills_header_idx + slots["skills_content_offset"]
+        _apply_skills(table, skills_content_idx, skills)
+
+    # Extras se agregan despues de habilidades (ahora soporta modo por entrada)
+    extra_blocks = _apply_extras(table, skills_header_idx, skills_content_idx, extras, slots["experience_rows"])
+
+    # Reordena módulos según core_order enviado por la UI (flechas); los extras van
+    # despues de habilidades, asi que los encabezados core siguen en su lugar
+    tr_list = table._tbl.tr_lst
+    heading_trs = {
+        "experience": tr_list[exp_header_idx],
+        "education": tr_list[edu_header_idx],
+        "skills": tr_list[skills_header_idx],
+    }
+    _apply_module_order(table, structured, extra_blocks, (exp_header_idx, edu_header_idx, skills_header_idx))
+    _collapse_blank_rows(table)
+    # Encabezados core (los <w:tr> no cambian al reordenar ni al colapsar filas)
+    return heading_trs
+
+
+# Mapa de cada plantilla (digest -> slots), calculado una vez al cargarla: filas de nombre,
+# contacto y resumen, encabezados core, fila de habilidades y filas modelo de experiencia
+# y educacion (copias sin tocar, solo se clonan). Si el archivo cambia, cambia el digest:
+# LRU chico para que las versiones viejas de una plantilla editada no queden en memoria.
+_TEMPLATE_CACHE_SIZE = 4
+_TEMPLATE_SLOTS: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_TEMPLATE_SLOTS_LOCK = threading.Lock()
+
+
+def _lru_put(cache: OrderedDict, key: Any, value: Any, size: int) -> None:
+    # Se llama con el lock del cache tomado
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
+
+
+def template_slots(template_key: str, template_bytes: bytes) -> dict[str, Any]:
+    with _TEMPLATE_SLOTS_LOCK:
+        cached = _TEMPLATE_SLOTS.get(template_key)
+        if cached is not None:
+            _TEMPLATE_SLOTS.move_to_end(template_key)
+            return cached
+        doc = DocxDocument(io.BytesIO(template_bytes))
+        if not doc.tables:
+            raise ValueError("La plantilla no contiene tablas.")
+        cached = _compute_slots(doc.tables[0])
+        _lru_put(_TEMPLATE_SLOTS, template_key, cached, _TEMPLATE_CACHE_SIZE)
+    return cached
 
-        skills_header_idx = _find_row_index(table, "habilidades")
-        if skills_header_idx is None:
-            raise ValueError("No se encontro la seccion de habilidades en la plantilla.")
 
-        _set_row_keep_with_next(table.rows[skills_header_idx])
-        _apply_section_keep_with_next_gap(table, skills_header_idx)
-        skills_content_idx = _apply_skills(table, skills_header_idx, skills)
+def _compute_slots(table) -> dict[str, Any]:
+    exp_header_idx = _find_row_index(table, "experiencia")
+    edu_header_idx = _find_row_index(table, "educación")
+    skills_header_idx = _find_row_index(table, "habilidades")
+    if exp_header_idx is None or edu_header_idx is None or skills_header_idx is None:
+        raise ValueError("No se encontraron secciones clave en la plantilla.")
+    if not exp_header_idx < edu_header_idx < skills_header_idx:
+        raise ValueError("La plantilla debe tener experiencia, educacion y habilidades en ese orden.")
 
-        # Extras se agregan despues de habilidades (ahora soporta modo por entrada)
-        extra_blocks = _apply_extras(table, skills_header_idx, skills_content_idx, extras)
+    contact_row_idx = _find_row_index_predicate(
+        table,
+        lambda text: "linkedin" in text or "github" in text or "@" in text,
+    )
+    skills_content_idx = _find_next_non_empty_row(table, skills_header_idx + 1, None)
+    return {
+        "name": _find_first_non_empty_before(table, contact_row_idx or exp_header_idx),
+        "contact": contact_row_idx,
+        "summary": _find_next_non_empty_row(table, (contact_row_idx or 0) + 1, exp_header_idx),
+        "experience": exp_header_idx,
+        "education": edu_header_idx,
+        "skills": skills_header_idx,
+        "skills_content_offset": None if skills_content_idx is None else skills_content_idx - skills_header_idx,
+        "skills_numbering": _skills_numbering(table, skills_content_idx),
+        "skills_numbering_fixed": _skills_numbering_fixed(table, skills_content_idx),
+        "experience_rows": _experience_prototypes(table, exp_header_idx, edu_header_idx),
+        "education_rows": _education_prototypes(table, edu_header_idx, skills_header_idx),
+    }
 
-        # Fuerza tamaño de bullets en habilidades
-        _normalize_skills_bullets(doc, table, skills_content_idx, size_pt=11)
-        # Reordena módulos según core_order enviado por la UI (flechas)
-        _apply_module_order(table, structured, extra_blocks)
-        # Traduce encabezados de módulos core para export final.
-        _localize_core_headings(table)
-        # Aplica fuente global si el usuario la selecciono
-        _apply_font(doc, font_name)
-        _collapse_blank_rows(table)
 
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        return buffer.getvalue()
-    finally:
-        _EXPORT_UI_LANG.reset(lang_token)
+def _section_spacers(table, start: int, end: int) -> tuple[Any, Any]:
+    # Separador entre entradas y separador final del bloque (o cualquier fila vacia sin bordes)
+    spacer_idx = _find_blank_row_without_borders(table, start, end)
+    if spacer_idx is None:
+        spacer_idx = _find_any_blank_row_without_borders(table)
+    section_spacer_idx = _find_trailing_blank_row_without_borders(table, start, end)
+    if section_spacer_idx is None:
+        section_spacer_idx = _find_any_blank_row_without_borders(table)
+    spacer = deepcopy(table.rows[spacer_idx]._tr) if spacer_idx is not None else None
+    section_spacer = deepcopy(table.rows[section_spacer_idx]._tr) if section_spacer_idx is not None else None
+    return spacer, section_spacer
 
 
-def _apply_experience(table, exp_header_idx: int, edu_header_idx: int, experience: list[dict]) -> None:
-    # Inserta bloques de experiencia usando filas template
+def _experience_prototypes(table, exp_header_idx: int, edu_header_idx: int) -> dict[str, Any] | None:
     exp_role_idx = _find_next_non_empty_row(table, exp_header_idx + 1, edu_header_idx)
     exp_high_idx = _find_next_non_empty_row(table, (exp_role_idx or exp_header_idx) + 1, edu_header_idx)
     if exp_role_idx is None or exp_high_idx is None:
-        return
+        return None
+    spacer, section_spacer = _section_spacers(table, exp_high_idx + 1, edu_header_idx)
+    return {
+        "role": deepcopy(table.rows[exp_role_idx]._tr),
+        "highlights": deepcopy(table.rows[exp_high_idx]._tr),
+        "spacer": spacer,
+        "section_spacer": section_spacer,
+    }
 
-    role_template = deepcopy(table.rows[exp_role_idx]._tr)
-    high_template = deepcopy(table.rows[exp_high_idx]._tr)
-    spacer_idx = _find_blank_row_without_borders(table, exp_high_idx + 1, edu_header_idx)
-    if spacer_idx is None:
-        spacer_idx = _find_any_blank_row_without_borders(table)
-    section_spacer_idx = _find_trailing_blank_row_without_borders(table, exp_high_idx + 1, edu_header_idx)
-    if section_spacer_idx is None:
-        section_spacer_idx = _find_any_blank_row_without_borders(table)
-    spacer_template = deepcopy(table.rows[spacer_idx]._tr) if spacer_idx is not None else None
-    section_spacer_template = (
-        deepcopy(table.rows[section_spacer_idx]._tr) if section_spacer_idx is not None else None
+
+def _education_prototypes(table, edu_header_idx: int, skills_header_idx: int) -> dict[str, Any] | None:
+    edu_template_idx = _find_next_non_empty_row(table, edu_header_idx + 1, skills_header_idx)
+    if edu_template_idx is None:
+        return None
+    spacer, section_spacer = _section_spacers(table, edu_template_idx + 1, skills_header_idx)
+    return {"row": deepcopy(table.rows[edu_template_idx]._tr), "spacer": spacer, "section_spacer": section_spacer}
+
+
+# Capa de contenido por (estructura, idioma, plantilla): XML de las partes que el render
+# cambio respecto de la plantilla + hipervinculos agregados. Reexportar con otra fuente
+# o con los encabezados en otro idioma no vuelve a construir las tablas.
+_CONTENT_CACHE_SIZE = 16
+_CONTENT_CACHE: OrderedDict[str, ContentLayer] = OrderedDict()
+_CONTENT_LOCK = threading.Lock()
+
+
+def _content_key(structured: dict, lang: str, template_key: str) -> str:
+    canonical = json.dumps(structured, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{template_key}\0{lang}\0{canonical}".encode("utf-8")).hexdigest()
+
+
+def _content_layer_get(key: str) -> ContentLayer | None:
+    with _CONTENT_LOCK:
+        layer = _CONTENT_CACHE.get(key)
+        if layer is not None:
+            _CONTENT_CACHE.move_to_end(key)
+    metrics.inc("trufadocs_render_content_cache_total", result="hit" if layer is not None else "miss")
+    return layer
+
+
+def _content_layer_put(key: str, layer: ContentLayer) -> None:
+    with _CONTENT_LOCK:
+        _CONTENT_CACHE[key] = layer
+        _CONTENT_CACHE.move_to_end(key)
+        while len(_CONTENT_CACHE) > _CONTENT_CACHE_SIZE:
+            _CONTENT_CACHE.popitem(last=False)
+
+
+def clear_content_cache() -> None:
+    with _CONTENT_LOCK:
+        _CONTENT_CACHE.clear()
+
+
+def _snapshot_content(doc: DocxDocumentType, members: dict, heading_trs: dict[str, Any]) -> ContentLayer:
+    parts: dict[str, bytes] = {}
+    for part in doc.part.package.iter_parts():
+        if not isinstance(part, XmlPart):
+            continue
+        blob = part.blob
+        base = members.get(part.partname.membername)
+        if base is None or base[0] != hashlib.sha256(blob).digest():
+            parts[part.partname] = blob
+    external = tuple(
+        (rel.rId, rel.reltype, rel.target_ref) for rel in doc.part.rels.values() if rel.is_external
     )
+    tr_list = doc.tables[0]._tbl.tr_lst
+    return parts, external, {module_key: tr_list.index(tr) for module_key, tr in heading_trs.items()}
+
+
+def _restore_content(doc: DocxDocumentType, layer: ContentLayer) -> DocxDocumentType:
+    parts, external, _ = layer
+    for part in doc.part.package.iter_parts():
+        blob = parts.get(part.partname)
+        if blob is not None:
+            part._element = parse_xml(blob)
+    rels = doc.part.rels
+    for r_id, reltype, target_ref in external:
+        if r_id not in rels:
+            rels.add_relationship(reltype, target_ref, r_id, is_external=True)
+    # Document envuelve el elemento viejo de document.xml: se vuelve a pedir a la parte
+    return doc.part.document
+
+
+def _apply_experience(
+    table,
+    exp_header_idx: int,
+    edu_header_idx: int,
+    experience: list[dict],
+    prototypes: dict[str, Any] | None,
+) -> None:
+    # Inserta bloques de experiencia clonando las filas modelo de la plantilla
+    if prototypes is None:
+        return
+
+    role_template = prototypes["role"]
+    high_template = prototypes["highlights"]
+    spacer_template = prototypes["spacer"]
+    section_spacer_template = prototypes["section_spacer"]
 
     gap_idx = exp_header_idx + 1
     has_gap = gap_idx < edu_header_idx and _is_blank_row(table.rows[gap_idx])
@@ -244,23 +507,20 @@ def _apply_experience(table, exp_header_idx: int, edu_header_idx: int, experienc
         insert_idx += 1
 
 
-def _apply_education(table, edu_header_idx: int, skills_header_idx: int, education: list[dict]) -> None:
-    # Inserta bloques de educacion usando filas template
-    edu_template_idx = _find_next_non_empty_row(table, edu_header_idx + 1, skills_header_idx)
-    if edu_template_idx is None:
+def _apply_education(
+    table,
+    edu_header_idx: int,
+    skills_header_idx: int,
+    education: list[dict],
+    prototypes: dict[str, Any] | None,
+) -> None:
+    # Inserta bloques de educacion clonando las filas modelo de la plantilla
+    if prototypes is None:
         return
 
-    template_tr = deepcopy(table.rows[edu_template_idx]._tr)
-    spacer_idx = _find_blank_row_without_borders(table, edu_template_idx + 1, skills_header_idx)
-    if spacer_idx is None:
-        spacer_idx = _find_any_blank_row_without_borders(table)
-    section_spacer_idx = _find_trailing_blank_row_without_borders(table, edu_template_idx + 1, skills_header_idx)
-    if section_spacer_idx is None:
-        section_spacer_idx = _find_any_blank_row_without_borders(table)
-    spacer_template = deepcopy(table.rows[spacer_idx]._tr) if spacer_idx is not None else None
-    section_spacer_template = (
-        deepcopy(table.rows[section_spacer_idx]._tr) if section_spacer_idx is not None else None
-    )
+    template_tr = prototypes["row"]
+    spacer_template = prototypes["spacer"]
+    section_spacer_template = prototypes["section_spacer"]
 
     gap_idx = edu_header_idx + 1
     has_gap = gap_idx < skills_header_idx and _is_blank_row(table.rows[gap_idx])
@@ -291,12 +551,8 @@ def _apply_education(table, edu_header_idx: int, skills_header_idx: int, educati
         insert_idx += 1
 
 
-def _apply_skills(table, skills_header_idx: int, skills: list[dict]) -> int | None:
+def _apply_skills(table, skills_content_idx: int, skills: list[dict]) -> None:
     # Rellena la celda de habilidades respetando estilos
-    skills_content_idx = _find_next_non_empty_row(table, skills_header_idx + 1, None)
-    if skills_content_idx is None:
-        return None
-
     cell = _unique_cells(table.rows[skills_content_idx])[0]
     template_paragraphs = list(cell.paragraphs)
     template_paragraph = template_paragraphs[0] if template_paragraphs else None
@@ -306,28 +562,9 @@ def _apply_skills(table, skills_header_idx: int, skills: list[dict]) -> int | No
     filtered = [item for item in skills if (item.get("category") or item.get("items"))]
     if not filtered:
         _add_paragraph(cell, "", style=template_style, paragraph_template=template_paragraph)
-        return skills_content_idx
-
-    category_template = None
-    items_template = None
-    spacer_template = None
-    for para in template_paragraphs:
-        if para.text.strip():
-            if category_template is None:
-                category_template = para
-            elif items_template is None:
-                items_template = para
-        elif spacer_template is None and category_template is not None:
-            spacer_template = para
-        if category_template and items_template and spacer_template:
-            break
-    if category_template is None:
-        category_template = template_paragraph
-    if items_template is None:
-        items_template = category_template
-    if spacer_template is None:
-        spacer_template = items_template
+        return
 
+    category_template, items_template, spacer_template = _skills_paragraph_templates(template_paragraphs)
     for idx, item in enumerate(filtered):
         category = (item.get("category") or "").strip()
         items = (item.get("items") or "").strip()
@@ -366,34 +603,127 @@ def _apply_skills(table, skills_header_idx: int, skills: list[dict]) -> int | No
             )
             spacer_paragraph.paragraph_format.keep_with_next = False
 
-    return skills_content_idx
+
+def _skills_paragraph_templates(paragraphs: list) -> tuple[Any, Any, Any]:
+    # Parrafos modelo de la celda de habilidades: categoria, items y separador
+    category_template = None
+    items_template = None
+    spacer_template = None
+    for para in paragraphs:
+        if para.text.strip():
+            if category_template is None:
+                category_template = para
+            elif items_template is None:
+                items_template = para
+        elif spacer_template is None and category_template is not None:
+            spacer_template = para
+        if category_template and items_template and spacer_template:
+            break
+    if category_template is None:
+        category_template = paragraphs[0] if paragraphs else None
+    if items_template is None:
+        items_template = category_template
+    if spacer_template is None:
+        spacer_template = items_template
+    return category_template, items_template, spacer_template
+
+
+def _paragraph_numbering(paragraph) -> tuple[str, str] | None:
+    # (numId, ilvl) de un parrafo con lista, o None
+    if paragraph is None:
+        return None
+    ppr = paragraph._p.pPr
+    if ppr is None or ppr.numPr is None:
+        return None
+    num_id = ppr.numPr.numId.val if ppr.numPr.numId is not None else None
+    ilvl = ppr.numPr.ilvl.val if ppr.numPr.ilvl is not None else None
+    if num_id is None or ilvl is None:
+        return None
+    return str(num_id), str(ilvl)
 
 
-def _normalize_skills_bullets(
+def _skills_numbering(table, skills_content_idx: int | None) -> dict[str, tuple[str, str] | None]:
+    # Listas que usan los parrafos modelo de habilidades (los que _apply_skills clona)
+    if skills_content_idx is None:
+        return {}
+    cells = _unique_cells(table.rows[skills_content_idx])
+    paragraphs = list(cells[0].paragraphs) if cells else []
+    category, items, spacer = _skills_paragraph_templates(paragraphs)
+    return {
+        "empty": _paragraph_numbering(paragraphs[0] if paragraphs else None),
+        "category": _paragraph_numbering(category),
+        "items": _paragraph_numbering(items),
+        "spacer": _paragraph_numbering(spacer),
+    }
+
+
+def _skills_numbering_fixed(table, skills_content_idx: int | None) -> list[tuple[str, str]]:
+    # Listas de las otras celdas de la fila de habilidades (no se reescriben)
+    if skills_content_idx is None:
+        return []
+    pairs = {
+        pair
+        for cell in _unique_cells(table.rows[skills_content_idx])[1:]
+        for paragraph in cell.paragraphs
+        if (pair := _paragraph_numbering(paragraph)) is not None
+    }
+    return sorted(pairs)
+
+
+def _skills_numbering_pairs(slots: dict[str, Any], skills: list[dict]) -> frozenset[tuple[str, str]]:
+    # Listas que terminan en la celda de habilidades, segun que parrafos modelo clona
+    # _apply_skills para esta estructura (sin leer el documento)
+    if slots["skills_content_offset"] is None:
+        return frozenset()
+    roles = slots["skills_numbering"]
+    pairs = set(slots["skills_numbering_fixed"])
+    filtered = [item for item in skills if (item.get("category") or item.get("items"))]
+    used = []
+    if not filtered:
+        used.append("empty")
+    else:
+        if any((item.get("category") or "").strip() for item in filtered):
+            used.append("category")
+        if any((item.get("items") or "").strip() for item in filtered):
+            used.append("items")
+        if len(filtered) > 1:
+            used.append("spacer")
+    pairs.update(roles[role] for role in used if roles.get(role) is not None)
+    return frozenset(pairs)
+
+
+# numbering.xml con el tamaño de viñetas de habilidades ya ajustado, por plantilla y
+# conjunto de listas usadas: (digest, pares, pt) -> (nombre de miembro, Member)
+_NUMBERING_FIXUPS_SIZE = 32
+_NUMBERING_FIXUPS: OrderedDict[tuple[str, frozenset[tuple[str, str]], int], tuple[str, Any]] = OrderedDict()
+_NUMBERING_FIXUPS_LOCK = threading.Lock()
+
+
+def _skills_numbering_override(
     doc: DocxDocumentType,
-    table,
-    skills_content_idx: int | None,
+    template_key: str,
+    pairs: frozenset[tuple[str, str]],
     *,
     size_pt: int = 11,
-) -> None:
-    # Ajusta tamaño de la lista numerada/bullets en habilidades
-    if skills_content_idx is None:
-        return
-    row = table.rows[skills_content_idx]
-    num_pairs: set[tuple[str, str]] = set()
-    for cell in _unique_cells(row):
-        for paragraph in cell.paragraphs:
-            ppr = paragraph._p.pPr
-            if ppr is None or ppr.numPr is None:
-                continue
-            num_id = ppr.numPr.numId.val if ppr.numPr.numId is not None else None
-            ilvl = ppr.numPr.ilvl.val if ppr.numPr.ilvl is not None else None
-            if num_id is None or ilvl is None:
-                continue
-            num_pairs.add((str(num_id), str(ilvl)))
-
-    for num_id, ilvl in num_pairs:
-        _set_numbering_level_size(doc, num_id, ilvl, size_pt)
+) -> dict[str, Any]:
+    # Fuerza tamaño de bullets en habilidades: la parte ya corregida (y comprimida) se
+    # calcula una vez y el export la copia tal cual en vez de buscar en numbering.xml
+    if not pairs:
+        return {}
+    numbering_part = doc.part.numbering_part
+    key = (template_key, pairs, size_pt)
+    with _NUMBERING_FIXUPS_LOCK:
+        cached = _NUMBERING_FIXUPS.get(key)
+        if cached is not None:
+            _NUMBERING_FIXUPS.move_to_end(key)
+        else:
+            numbering = deepcopy(numbering_part.element)
+            for num_id, ilvl in sorted(pairs):
+                _set_numbering_level_size(numbering, num_id, ilvl, size_pt)
+            member = compress_member(serialize_part_xml(numbering))
+            cached = (numbering_part.partname.membername, member)
+            _lru_put(_NUMBERING_FIXUPS, key, cached, _NUMBERING_FIXUPS_SIZE)
+    return {cached[0]: cached[1]}
 
 
 def _extra_entry_lines(entry: dict, *, mode: str = "detailed") -> list[str]:
@@ -467,6 +797,7 @@ def _apply_extras(
     skills_header_idx: int,
     skills_content_idx: int | None,
     extras: list[dict],
+    experience_rows: dict[str, Any] | None,
 ) -> list[dict[str, Any]]:
     # Crea nuevas secciones extras bajo habilidades.
     #
@@ -485,11 +816,13 @@ def _apply_extras(
         title = raw_title or f"{_export_text()['extra_section_prefix']} {extra_idx}"
         section_mode = (extra.get("mode") or "subtitles").strip() or "subtitles"
         section_mode = _normalize_extra_mode(section_mode, default="subtitles")
-        entries = [entry for entry in (extra.get("entries") or []) if _extra_entry_has_content(entry)]
-        # Normaliza entry.mode (fallback al modo de sección)
-        for entry in entries:
-            entry_mode = (entry.get("mode") or section_mode).strip() or section_mode
-            entry["mode"] = _normalize_extra_mode(entry_mode, default=section_mode)
+        # Normaliza entry.mode (fallback al modo de sección) sobre copias: la estructura
+        # recibida no se modifica (es la clave de la capa de contenido)
+        entries = [
+            dict(entry, mode=_normalize_extra_mode((entry.get("mode") or section_mode).strip(), default=section_mode))
+            for entry in (extra.get("entries") or [])
+            if _extra_entry_has_content(entry)
+        ]
         # Si viene en formato antiguo (sin entries), lo tratamos como lista de items
         if not entries and "items" in extra:
             items = [item for item in (extra.get("items") or []) if item and str(item).strip()]
@@ -517,18 +850,10 @@ def _apply_extras(
     if spacer_idx is not None:
         spacer_template = deepcopy(table.rows[spacer_idx]._tr)
 
-    # Templates estilo "detalle" (2 columnas como experiencia)
-    exp_role_template = None
-    exp_high_template = None
-    exp_header_idx = _find_row_index(table, "experiencia")
-    edu_header_idx = _find_row_index(table, "educación")
-    if exp_header_idx is not None:
-        exp_role_idx = _find_next_non_empty_row(table, exp_header_idx + 1, edu_header_idx)
-        exp_high_idx = _find_next_non_empty_row(table, (exp_role_idx or exp_header_idx) + 1, edu_header_idx)
-        if exp_role_idx is not None:
-            exp_role_template = deepcopy(table.rows[exp_role_idx]._tr)
-        if exp_high_idx is not None:
-            exp_high_template = deepcopy(table.rows[exp_high_idx]._tr)
+    # Templates estilo "detalle" (2 columnas como experiencia): las filas modelo del mapa de
+    # la plantilla, sin buscarlas en la tabla ya llenada
+    exp_role_template = experience_rows["role"] if experience_rows else None
+    exp_high_template = experience_rows["highlights"] if experience_rows else None
 
     insert_idx = skills_content_idx + 1
     extra_blocks: list[dict[str, Any]] = []
@@ -620,7 +945,12 @@ def _apply_extras(
     return extra_blocks
 
 
-def _apply_module_order(table, structured: dict, extra_blocks: list[dict[str, Any]]) -> None:
+def _apply_module_order(
+    table,
+    structured: dict,
+    extra_blocks: list[dict[str, Any]],
+    header_rows: tuple[int, int, int],
+) -> None:
     # Respeta el orden de módulos de la UI (core_order): experience, education, skills, extra-*
     meta = structured.get("meta") or {}
     raw_order = str(meta.get("core_order") or "").strip()
@@ -631,16 +961,10 @@ def _apply_module_order(table, structured: dict, extra_blocks: list[dict[str, An
     if not requested_order:
         return
 
-    exp_header_idx = _find_row_index(table, "experiencia")
-    edu_header_idx = _find_row_index(table, "educación")
-    if edu_header_idx is None:
-        edu_header_idx = _find_row_index(table, "educacion")
-    skills_header_idx = _find_row_index(table, "habilidades")
-    if exp_header_idx is None or edu_header_idx is None or skills_header_idx is None:
-        return
-
     tbl = table._tbl
     tr_list = list(tbl.tr_lst)
+    exp_header_idx, edu_header_idx, skills_header_idx = header_rows
+
     index_by_tr_id = {id(tr): idx for idx, tr in enumerate(tr_list)}
 
     normalized_extra_blocks: list[dict[str, Any]] = []
@@ -655,16 +979,12 @@ def _apply_module_order(table, structured: dict, extra_blocks: list[dict[str, An
         normalized_extra_blocks.append({"section_id": sid, "rows": rows, "start": min(positions)})
 
     normalized_extra_blocks.sort(key=lambda block: block["start"])
-    first_extra_start = normalized_extra_blocks[0]["start"] if normalized_extra_blocks else len(table.rows)
-
-    exp_rows = [table.rows[idx]._tr for idx in range(exp_header_idx, min(edu_header_idx, len(table.rows)))]
-    edu_rows = [table.rows[idx]._tr for idx in range(edu_header_idx, min(skills_header_idx, len(table.rows)))]
-    skills_rows = [table.rows[idx]._tr for idx in range(skills_header_idx, min(first_extra_start, len(table.rows)))]
+    first_extra_start = normalized_extra_blocks[0]["start"] if normalized_extra_blocks else len(tr_list)
 
     module_rows: dict[str, list[Any]] = {
-        "experience": exp_rows,
-        "education": edu_rows,
-        "skills": skills_rows,
+        "experience": tr_list[exp_header_idx:edu_header_idx],
+        "education": tr_list[edu_header_idx:skills_header_idx],
+        "skills": tr_list[skills_header_idx:first_extra_start],
     }
 
     extra_ids: list[str] = []
@@ -699,7 +1019,7 @@ def _apply_module_order(table, structured: dict, extra_blocks: list[dict[str, An
     spacer_template = None
     spacer_idx = _find_any_blank_row_without_borders(table)
     if spacer_idx is not None:
-        spacer_template = deepcopy(table.rows[spacer_idx]._tr)
+        spacer_template = deepcopy(tr_list[spacer_idx])
 
     rows_to_move: list[Any] = []
     rows_to_move_ids: set[int] = set()
@@ -714,38 +1034,40 @@ def _apply_module_order(table, structured: dict, extra_blocks: list[dict[str, An
     if not rows_to_move:
         return
 
-    insertion_positions = [idx for idx, tr in enumerate(tr_list) if id(tr) in rows_to_move_ids]
-    if not insertion_positions:
-        return
-    insert_at = min(insertion_positions)
-
-    for tr in tr_list:
-        if id(tr) in rows_to_move_ids and tr.getparent() is tbl:
-            tbl.remove(tr)
-
-    inserted_rows: set[int] = set()
-    cursor = insert_at
+    # Secuencia final de filas (con separadores clonados) calculada de una vez
+    sequence: list[Any] = []
+    placed_rows: set[int] = set()
     for module_idx, module_id in enumerate(final_modules):
         module_inserted = False
         for tr in module_rows.get(module_id, []):
             tr_id = id(tr)
-            if tr_id in inserted_rows:
+            if tr_id in placed_rows:
                 continue
-            _insert_row_before(table, cursor, tr)
-            cursor += 1
-            inserted_rows.add(tr_id)
+            sequence.append(tr)
+            placed_rows.add(tr_id)
             module_inserted = True
-        if (
-            module_inserted
-            and module_idx < len(final_modules) - 1
-            and spacer_template is not None
-            and cursor > 0
-        ):
-            previous_row = table.rows[cursor - 1]
-            if not _is_blank_row(previous_row):
-                _insert_row_before(table, cursor, deepcopy(spacer_template))
-                _clear_row_height(table.rows[cursor])
-                cursor += 1
+        if module_inserted and module_idx < len(final_modules) - 1 and spacer_template is not None:
+            if not _is_blank_row(_Row(sequence[-1], table)):
+                spacer = deepcopy(spacer_template)
+                _clear_row_height(_Row(spacer, table))
+                sequence.append(spacer)
+
+    _splice_rows(tbl, tr_list, rows_to_move_ids, sequence)
+
+
+def _splice_rows(tbl, tr_list: list[Any], removed_ids: set[int], sequence: list[Any]) -> None:
+    # Quita las filas de removed_ids y pone sequence donde estaba la primera de ellas,
+    # en una sola pasada (sin recalcular la lista de filas por cada insercion)
+    first = next((idx for idx, tr in enumerate(tr_list) if id(tr) in removed_ids), None)
+    if first is None:
+        return
+    anchor = next((tr for tr in tr_list[first:] if id(tr) not in removed_ids), None)
+    for tr in tr_list[first:]:
+        if id(tr) in removed_ids and tr.getparent() is tbl:
+            tbl.remove(tr)
+    position = tbl.index(anchor) if anchor is not None else len(tbl)
+    tbl[position:position] = sequence
+
 
 def _fill_experience_role_row(row, item: dict) -> None:
     cells = _unique_cells(row)
@@ -1186,8 +1508,7 @@ def _clone_paragraph_format(source, target) -> None:
     target_p.append(deepcopy(source_p.pPr))
 
 
-def _set_numbering_level_size(doc: DocxDocumentType, num_id: str, ilvl: str, size_pt: int) -> None:
-    numbering = doc.part.numbering_part.element
+def _set_numbering_level_size(numbering, num_id: str, ilvl: str, size_pt: int) -> None:
     ns = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
 
     abstract_id = None
@@ -1231,31 +1552,67 @@ def _set_numbering_level_size(doc: DocxDocumentType, num_id: str, ilvl: str, siz
 
 
 def _apply_font(doc: DocxDocumentType, font_name: str | None) -> None:
-    # Aplica la misma fuente a todo el documento
+    # Aplica la misma fuente a todo el documento: docDefaults, estilos y tema una vez,
+    # y en el cuerpo solo las rFonts explicitas (el resto de los runs la hereda).
+    # O(estilos + rFonts de la plantilla) en vez de recorrer cada run de cada celda.
+    # numbering.xml no se toca: sus viñetas usan Symbol/Wingdings.
     if not font_name:
         return
-    for paragraph in doc.paragraphs:
-        for run in paragraph.runs:
-            _set_run_font_name(run, font_name)
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for paragraph in cell.paragraphs:
-                    for run in paragraph.runs:
-                        _set_run_font_name(run, font_name)
-
-
-def _set_run_font_name(run, font_name: str) -> None:
-    run.font.name = font_name
-    rpr = run._element.get_or_add_rPr()
-    rfonts = rpr.rFonts
-    if rfonts is None:
-        rfonts = OxmlElement("w:rFonts")
-        rpr.append(rfonts)
-    rfonts.set(qn("w:ascii"), font_name)
-    rfonts.set(qn("w:hAnsi"), font_name)
-    rfonts.set(qn("w:eastAsia"), font_name)
-    rfonts.set(qn("w:cs"), font_name)
+    styles = doc.styles.element
+    _ensure_default_rfonts(styles)
+    for rfonts in styles.iter(qn("w:rFonts")):
+        _set_rfonts(rfonts, font_name)
+    for rfonts in doc.element.body.iter(qn("w:rFonts")):
+        _set_rfonts(rfonts, font_name)
+    _apply_theme_font(doc, font_name)
+
+
+_RFONTS_NAME_ATTRS = tuple(qn(f"w:{name}") for name in ("ascii", "hAnsi", "eastAsia", "cs"))
+# Los atributos de tema tienen prioridad sobre el nombre: se quitan
+_RFONTS_THEME_ATTRS = tuple(qn(f"w:{name}") for name in ("asciiTheme", "hAnsiTheme", "eastAsiaTheme", "cstheme"))
+
+
+def _set_rfonts(rfonts, font_name: str) -> None:
+    for attr in _RFONTS_THEME_ATTRS:
+        rfonts.attrib.pop(attr, None)
+    for attr in _RFONTS_NAME_ATTRS:
+        rfonts.set(attr, font_name)
+
+
+def _ensure_default_rfonts(styles) -> None:
+    # w:docDefaults/w:rPrDefault/w:rPr/w:rFonts (fuente de todo lo que no tiene estilo)
+    doc_defaults = styles.find(qn("w:docDefaults"))
+    if doc_defaults is None:
+        doc_defaults = OxmlElement("w:docDefaults")
+        styles.insert(0, doc_defaults)
+    rpr_default = doc_defaults.find(qn("w:rPrDefault"))
+    if rpr_default is None:
+        rpr_default = OxmlElement("w:rPrDefault")
+        doc_defaults.insert(0, rpr_default)
+    rpr = rpr_default.find(qn("w:rPr"))
+    if rpr is None:
+        rpr = OxmlElement("w:rPr")
+        rpr_default.append(rpr)
+    if rpr.find(qn("w:rFonts")) is None:
+        rpr.insert(0, OxmlElement("w:rFonts"))
+
+
+def _apply_theme_font(doc: DocxDocumentType, font_name: str) -> None:
+    # Fuentes mayor/menor del tema, por si algun estilo de encabezado o pie las referencia
+    try:
+        theme_part = doc.part.part_related_by(RT.THEME)
+    except KeyError:
+        return
+    theme_part._blob = _theme_blob_with_font(theme_part.blob, font_name)
+
+
+@functools.lru_cache(maxsize=16)
+def _theme_blob_with_font(blob: bytes, font_name: str) -> bytes:
+    root = etree.fromstring(blob)
+    for latin in root.iterfind(".//a:fontScheme/*/a:latin", {"a": _DRAWINGML_NS}):
+        latin.set("typeface", font_name)
+        latin.attrib.pop("panose", None)
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
 
 
 def _unique_cells(row) -> list:
@@ -1284,13 +1641,31 @@ def _row_is_heading(text: str) -> bool:
     return False
 
 
+# XPath precompiladas sobre <w:tr>. El texto es el mismo que lee python-docx (runs directos
+# y de hipervinculos de cada parrafo de cada celda); br/cr/tab solo aportan espacios.
+_W_NS = {"w": nsmap["w"]}
+_ROW_TEXT_XPATH = etree.XPath(
+    "w:tc/w:p/w:r/w:t/text() | w:tc/w:p/w:hyperlink/w:r/w:t/text()", namespaces=_W_NS
+)
+_ROW_HYPHEN_XPATH = etree.XPath(
+    "boolean(w:tc/w:p/w:r/w:noBreakHyphen | w:tc/w:p/w:hyperlink/w:r/w:noBreakHyphen)", namespaces=_W_NS
+)
+# Celda que continua una combinacion vertical: su texto esta en la fila de arriba
+_ROW_VMERGE_XPATH = etree.XPath(
+    "boolean(w:tc/w:tcPr/w:vMerge[not(@w:val) or @w:val='continue'])", namespaces=_W_NS
+)
+_ROW_BORDERS_XPATH = etree.XPath("boolean(.//w:tcBorders | .//w:trBorders)", namespaces=_W_NS)
+
+
 def _is_blank_row(row) -> bool:
-    return not _row_text(row).strip()
+    tr = row._tr
+    if _ROW_VMERGE_XPATH(tr):
+        return not _row_text(row).strip()
+    return not _ROW_HYPHEN_XPATH(tr) and not any(text.strip() for text in _ROW_TEXT_XPATH(tr))
 
 
 def _row_has_borders(row) -> bool:
-    xml = row._tr.xml
-    return "w:tcBorders" in xml or "w:trBorders" in xml
+    return _ROW_BORDERS_XPATH(row._tr)
 
 
 def _find_blank_row_without_borders(table, start: int, end: int | None) -> int | None:
@@ -1321,19 +1696,15 @@ def _find_trailing_blank_row_without_borders(table, start: int, end: int | None)
 
 
 def _collapse_blank_rows(table) -> None:
-    idx = 0
-    while idx < len(table.rows) - 1:
-        row = table.rows[idx]
-        next_row = table.rows[idx + 1]
-        if (
-            _is_blank_row(row)
-            and _is_blank_row(next_row)
-            and not _row_has_borders(row)
-            and not _row_has_borders(next_row)
-        ):
-            next_row._tr.getparent().remove(next_row._tr)
+    # Una sola pasada: deja un solo separador (fila vacia sin bordes) entre bloques
+    previous_is_spacer = False
+    for tr in list(table._tbl.tr_lst):
+        row = _Row(tr, table)
+        is_spacer = _is_blank_row(row) and not _row_has_borders(row)
+        if is_spacer and previous_is_spacer:
+            tr.getparent().remove(tr)
             continue
-        idx += 1
+        previous_is_spacer = is_spacer
 
 
 def _find_row_index(table, marker: str) -> int | None:
@@ -1345,31 +1716,17 @@ def _find_row_index(table, marker: str) -> int | None:
     return None
 
 
-def _find_heading_row_index(table, module_key: str) -> int | None:
-    markers_by_module = {
-        "experience": ["experiencia", "professional experience", "experience"],
-        "education": ["educación", "educacion", "education"],
-        "skills": ["habilidades", "skills"],
-    }
-    for marker in markers_by_module.get(module_key, []):
-        idx = _find_row_index(table, marker)
-        if idx is not None:
-            return idx
-    return None
+_CORE_HEADING_KEYS = {
+    "experience": "heading_experience",
+    "education": "heading_education",
+    "skills": "heading_skills",
+}
 
 
-def _localize_core_headings(table) -> None:
+def _localize_core_headings(table, heading_rows: dict[str, int]) -> None:
     labels = _export_text()
-    heading_keys = {
-        "experience": "heading_experience",
-        "education": "heading_education",
-        "skills": "heading_skills",
-    }
-    for module_key, text_key in heading_keys.items():
-        idx = _find_heading_row_index(table, module_key)
-        if idx is None:
-            continue
-        _set_row_text(table.rows[idx], labels[text_key])
+    for module_key, idx in heading_rows.items():
+        _set_row_text(table.rows[idx], labels[_CORE_HEADING_KEYS[module_key]])
 
 
 def _find_row_index_predicate(table, predicate) -> int | None:
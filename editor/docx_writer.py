@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import BinaryIO
+
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.pkgwriter import _ContentTypesItem
+
+# Fecha fija para todas las entradas del zip (1980-01-01 00:00, la minima del formato)
+_DOS_DATE = (1980 - 1980) << 9 | 1 << 5 | 1
+_DOS_TIME = 0
+_COMPRESS_LEVEL = 6
+
+# Miembro ya comprimido: (sha256 del contenido, datos deflate, crc32, tamaño original)
+Member = tuple[bytes, bytes, int, int]
+
+# Partes de cada plantilla tal como las serializa python-docx sin modificar,
+# ya comprimidas: digest de plantilla -> nombre de miembro -> Member (LRU chico: una
+# plantilla editada cambia de digest y la version vieja se descarta)
+_TEMPLATE_MEMBERS_SIZE = 4
+_TEMPLATE_MEMBERS: OrderedDict[str, dict[str, Member]] = OrderedDict()
+_TEMPLATE_MEMBERS_LOCK = threading.Lock()
+
+
+def _deflate(blob: bytes) -> bytes:
+    compressor = zlib.compressobj(_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(blob) + compressor.flush()
+
+
+def compress_member(blob: bytes) -> Member:
+    return hashlib.sha256(blob).digest(), _deflate(blob), zlib.crc32(blob), len(blob)
+
+
+class _ZipWriter:
+    # Zip minimo (deflate, sin zip64) que admite copiar miembros ya comprimidos;
+    # escribe en cualquier archivo binario (BytesIO, archivo temporal...)
+    def __init__(self, out: BinaryIO) -> None:
+        self._out = out
+        self._base = out.tell()
+        self._central: list[bytes] = []
+
+    def write(self, name: str, blob: bytes) -> None:
+        self.write_compressed(name, _deflate(blob), zlib.crc32(blob), len(blob))
+
+    def write_compressed(self, name: str, data: bytes, crc: int, size: int) -> None:
+        encoded = name.encode("utf-8")
+        flags = 0x800 if not name.isascii() else 0
+        offset = self._out.tell() - self._base
+        fields = (20, flags, 8, _DOS_TIME, _DOS_DATE, crc, len(data), size, len(encoded))
+        self._out.write(struct.pack("<IHHHHHIIIHH", 0x04034B50, *fields, 0))
+        self._out.write(encoded)
+        self._out.write(data)
+        self._central.append(
+            struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, 20, *fields, 0, 0, 0, 0, 0, offset) + encoded
+        )
+
+    def finish(self) -> None:
+        start = self._out.tell()
+        for entry in self._central:
+            self._out.write(entry)
+        size = self._out.tell() - start
+        count = len(self._central)
+        self._out.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, size, start - self._base, 0))
+
+
+def _iter_members(doc, skip=()):
+    # Miembros en orden estable: [Content_Types].xml, _rels/.rels y luego las partes
+    # en el recorrido de relaciones de python-docx (estable para una misma plantilla).
+    # Las partes de skip no se serializan (blob None).
+    package = doc.part.package
+    parts = list(package.iter_parts())
+    for part in parts:
+        part.before_marshal()
+    yield CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob
+    yield PACKAGE_URI.rels_uri.membername, package.rels.xml
+    for part in parts:
+        name = part.partname.membername
+        yield name, None if name in skip else part.blob
+        if len(part.rels):
+            yield part.partname.rels_uri.membername, part.rels.xml
+
+
+def template_members(template_key: str, template_bytes: bytes) -> dict[str, Member]:
+    # Comprime una sola vez por proceso las partes de la plantilla sin modificar
+    with _TEMPLATE_MEMBERS_LOCK:
+        cached = _TEMPLATE_MEMBERS.get(template_key)
+        if cached is not None:
+            _TEMPLATE_MEMBERS.move_to_end(template_key)
+            return cached
+        from docx import Document as DocxDocument
+
+        doc = DocxDocument(io.BytesIO(template_bytes))
+        cached = {name: compress_member(blob) for name, blob in _iter_members(doc)}
+        _remember_members(template_key, cached)
+    return cached
+
+
+def register_template_members(template_key: str, members: dict[str, Member]) -> None:
+    # Partes ya comprimidas que vienen de un artefacto precompilado (compile_template)
+    with _TEMPLATE_MEMBERS_LOCK:
+        if template_key not in _TEMPLATE_MEMBERS:
+            _remember_members(template_key, members)
+
+
+def _remember_members(template_key: str, members: dict[str, Member]) -> None:
+    # Se llama con _TEMPLATE_MEMBERS_LOCK tomado
+    _TEMPLATE_MEMBERS[template_key] = members
+    _TEMPLATE_MEMBERS.move_to_end(template_key)
+    while len(_TEMPLATE_MEMBERS) > _TEMPLATE_MEMBERS_SIZE:
+        _TEMPLATE_MEMBERS.popitem(last=False)
+
+
+def save_docx_bytes(
+    doc,
+    base_members: dict[str, Member] | None = None,
+    overrides: dict[str, Member] | None = None,
+) -> bytes:
+    buffer = io.BytesIO()
+    write_docx(doc, buffer, base_members, overrides)
+    return buffer.getvalue()
+
+
+def write_docx(
+    doc,
+    out: BinaryIO,
+    base_members: dict[str, Member] | None = None,
+    overrides: dict[str, Member] | None = None,
+) -> None:
+    # Igual que doc.save(), pero byte a byte determinista: misma entrada -> mismos bytes.
+    # Con base_members, las partes identicas a la plantilla (fuentes, estilos, tema...)
+    # se copian ya comprimidas y solo se comprime lo que cambio. overrides reemplaza
+    # partes enteras por un Member ya calculado, sin serializar la del documento.
+    overrides = overrides or {}
+    writer = _ZipWriter(out)
+    for name, blob in _iter_members(doc, overrides):
+        if blob is None:
+            _, data, crc, size = overrides[name]
+            writer.write_compressed(name, data, crc, size)
+            continue
+        base = base_members.get(name) if base_members else None
+        if base is not None and base[3] == len(blob) and base[0] == hashlib.sha256(blob).digest():
+            writer.write_compressed(name, base[1], base[2], base[3])
+        else:
+            writer.write(name, blob)
+    writer.finish()
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import re
+import secrets
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from django.conf import settings
+from django.core.cache import caches
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # Windows: solo exclusion dentro del proceso
+    fcntl = None
+
+# Borradores del editor: documento JSON + version, identificados por un token.
+# El cliente manda parches (subconjunto de JSON Patch) y las exportaciones
+# referencian el token en vez de reenviar el formulario completo.
+DRAFTS_CACHE_ALIAS = "drafts"
+TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+MAX_DRAFT_BYTES = 2 * 1024 * 1024
+MAX_PATCH_OPS = 500
+PATCH_OPS = {"add", "remove", "replace", "move", "copy", "test"}
+# Leer, comprobar version y guardar va bajo lock: un hilo por proceso y, con
+# DRAFTS_CACHE_DIR, flock sobre un numero fijo de archivos compartidos entre workers
+_LOCK_STRIPES = 64
+_LOCAL_LOCKS = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+
+
+class DraftPatchError(ValueError):
+    pass
+
+
+class DraftConflict(Exception):
+    pass
+
+
+def drafts_enabled() -> bool:
+    return bool(getattr(settings, "DRAFTS_ENABLED", True))
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "DRAFTS_TTL_SECONDS", 24 * 3600))
+
+
+def _cache():
+    return caches[DRAFTS_CACHE_ALIAS]
+
+
+def _cache_key(token: str) -> str:
+    return f"trufadocs:draft:{token}"
+
+
+def _check_size(doc) -> None:
+    size = len(json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    if size > MAX_DRAFT_BYTES:
+        raise DraftPatchError("el borrador supera el tamaño maximo")
+
+
+def create(doc: dict) -> tuple[str, int]:
+    _check_size(doc)
+    token = secrets.token_urlsafe(24)
+    _cache().set(_cache_key(token), {"doc": doc, "version": 1}, _ttl())
+    return token, 1
+
+
+def load(token: str) -> tuple[dict, int] | None:
+    if not token or not TOKEN_RE.match(token):
+        return None
+    stored = _cache().get(_cache_key(token))
+    if not isinstance(stored, dict):
+        return None
+    return stored.get("doc") or {}, int(stored.get("version") or 1)
+
+
+def update(token: str, ops, base_version: int | None = None) -> int | None:
+    # Devuelve la nueva version, o None si el borrador no existe (expiro o es de otro worker)
+    with _locked(token):
+        current = load(token)
+        if current is None:
+            return None
+        doc, version = current
+        if base_version is not None and base_version != version:
+            raise DraftConflict(version)
+        doc = apply_patch(doc, ops)
+        if not isinstance(doc, dict):
+            raise DraftPatchError("el borrador debe ser un objeto")
+        _check_size(doc)
+        version += 1
+        _cache().set(_cache_key(token), {"doc": doc, "version": version}, _ttl())
+        return version
+
+
+@contextmanager
+def _locked(token: str) -> Iterator[None]:
+    stripe = int(hashlib.sha256(token.encode("utf-8")).hexdigest(), 16) % _LOCK_STRIPES
+    with _LOCAL_LOCKS[stripe]:
+        directory = str(getattr(settings, "DRAFTS_CACHE_DIR", "") or "").strip()
+        if not directory or fcntl is None:
+            yield
+            return
+        lock_dir = Path(directory) / "locks"
+        lock_dir.mkdir(parents=True, exist_ok=True)
+        with open(lock_dir / f"draft-{stripe}.lock", "a+b") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def apply_patch(doc, ops):
+    # Atomico: si una operacion falla, el documento original queda intacto
+    if not isinstance(ops, list):
+        raise DraftPatchError("se esperaba una lista de operaciones")
+    if len(ops) > MAX_PATCH_OPS:
+        raise DraftPatchError(f"demasiadas operaciones ({len(ops)} > {MAX_PATCH_OPS})")
+    doc = copy.deepcopy(doc)
+    for index, op in enumerate(ops):
+        if not isinstance(op, dict) or op.get("op") not in PATCH_OPS:
+            raise DraftPatchError(f"operacion {index} invalida")
+        kind = op["op"]
+        path = _parse_pointer(op.get("path"))
+        if kind == "test":
+            if _get(doc, path) != op.get("value"):
+                raise DraftPatchError(f"test fallido en {op.get('path')}")
+            continue
+        if kind in {"move", "copy"}:
+            source = _parse_pointer(op.get("from"))
+            if kind == "move" and path[: len(source)] == source and path != source:
+                raise DraftPatchError("no se puede mover un valor dentro de si mismo")
+            value = _get(doc, source)
+            if kind == "move":
+                doc = _remove(doc, source)
+            else:
+                value = copy.deepcopy(value)
+            doc = _add(doc, path, value)
+            continue
+        if kind == "remove":
+            doc = _remove(doc, path)
+            continue
+        if "value" not in op:
+            raise DraftPatchError(f"operacion {index} sin value")
+        value = copy.deepcopy(op["value"])
+        if kind == "replace" and path:
+            doc = _remove(doc, path)
+        doc = _add(doc, path, value)
+    return doc
+
+
+def _parse_pointer(pointer) -> list[str]:
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise DraftPatchError(f"ruta invalida: {pointer!r}")
+    if not pointer:
+        return []
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, *, for_add: bool = False) -> int:
+    if for_add and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise DraftPatchError(f"indice invalido: {token!r}")
+    index = int(token)
+    limit = len(container) if for_add else len(container) - 1
+    if index > limit:
+        raise DraftPatchError(f"indice fuera de rango: {index}")
+    return index
+
+
+def _get(doc, path: list[str]):
+    node = doc
+    for token in path:
+        if isinstance(node, dict):
+            if token not in node:
+                raise DraftPatchError(f"no existe la ruta /{'/'.join(path)}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token)]
+        else:
+            raise DraftPatchError(f"no existe la ruta /{'/'.join(path)}")
+    return node
+
+
+def _add(doc, path: list[str], value):
+    if not path:
+        return value
+    parent = _get(doc, path[:-1])
+    token = path[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, for_add=True), value)
+    else:
+        raise DraftPatchError(f"no existe la ruta /{'/'.join(path)}")
+    return doc
+
+
+def _remove(doc, path: list[str]):
+    if not path:
+        raise DraftPatchError("no se puede eliminar la raiz")
+    parent = _get(doc, path[:-1])
+    token = path[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise DraftPatchError(f"no existe la ruta /{'/'.join(path)}")
+        del parent[token]
+    elif isinstance(parent, list):
+        del parent[_index(parent, token)]
+    else:
+        raise DraftPatchError(f"no existe la ruta /{'/'.join(path)}")
+    return doc
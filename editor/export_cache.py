@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+
+from . import metrics
+from .pdf_convert import pdf_converter_backend
+
+# LRU en memoria de exportaciones ya renderizadas: (clave, "docx"|"pdf") -> bytes.
+# Se expulsa por tamaño total (EXPORT_CACHE_MAX_MB), no por cantidad; una exportacion
+# mayor a EXPORT_CACHE_MAX_ENTRY_MB no se guarda.
+_CACHE: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+_CACHE_BYTES = 0
+_LOCK = threading.Lock()
+
+
+def _max_bytes() -> int:
+    return int(float(getattr(settings, "EXPORT_CACHE_MAX_MB", 64)) * 1024 * 1024)
+
+
+def _max_entry_bytes() -> int:
+    entry = int(float(getattr(settings, "EXPORT_CACHE_MAX_ENTRY_MB", 4)) * 1024 * 1024)
+    return min(entry, _max_bytes())
+
+
+def export_key(structured: dict, font_name: str | None, ui_lang: str, template_path: Path) -> str:
+    # Hash canonico: mismo contenido -> misma clave sin importar el orden de las llaves
+    from .docx_template import template_digest
+
+    canonical = json.dumps(
+        {
+            "structured": structured,
+            "font": font_name or "",
+            "lang": ui_lang,
+            "template": template_digest(template_path),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def text_export_key(text: str) -> str:
+    # Exportaciones de texto libre (sin plantilla)
+    return hashlib.sha256(f"text\0{text}".encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _renderer_digest() -> str:
+    # Si cambia el codigo que genera el DOCX, cambian los bytes: el ETag debe cambiar tambien
+    from . import docx_template, docx_writer
+
+    digest = hashlib.sha256()
+    for module in (docx_template, docx_writer):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def etag_for(key: str, kind: str) -> str:
+    # DOCX: ETag fuerte (salida determinista). PDF: debil, Word/LibreOffice
+    # incrustan la fecha de creacion aunque el contenido sea el mismo.
+    parts = [key, kind, _renderer_digest()]
+    if kind == "pdf":
+        parts.append(pdf_converter_backend())
+    tag = '"{}"'.format(hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:40])
+    return f"W/{tag}" if kind == "pdf" else tag
+
+
+def get(key: str, kind: str) -> bytes | None:
+    with _LOCK:
+        data = _CACHE.get((key, kind))
+        if data is not None:
+            _CACHE.move_to_end((key, kind))
+    metrics.inc("trufadocs_export_cache_total", kind=kind, result="hit" if data is not None else "miss")
+    return data
+
+
+def put(key: str, kind: str, data: bytes) -> None:
+    global _CACHE_BYTES
+    limit = _max_bytes()
+    if not data or len(data) > _max_entry_bytes():
+        return
+    with _LOCK:
+        previous = _CACHE.pop((key, kind), None)
+        if previous is not None:
+            _CACHE_BYTES -= len(previous)
+        _CACHE[(key, kind)] = data
+        _CACHE_BYTES += len(data)
+        while _CACHE_BYTES > limit:
+            _, evicted = _CACHE.popitem(last=False)
+            _CACHE_BYTES -= len(evicted)
+
+
+def put_file(key: str, kind: str, handle) -> None:
+    # Exportacion ya escrita en un archivo (la que se envia): solo se lee a memoria si
+    # entra en la cache. Deja el archivo al inicio.
+    size = handle.seek(0, os.SEEK_END)
+    handle.seek(0)
+    if 0 < size <= _max_entry_bytes():
+        put(key, kind, handle.read())
+        handle.seek(0)
+
+
+def clear() -> None:
+    global _CACHE_BYTES
+    with _LOCK:
+        _CACHE.clear()
+        _CACHE_BYTES = 0
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.text import slugify
+
+# Plantilla cargada por proceso worker (una sola vez, en el initializer)
+_WORKER_TEMPLATE: Path | None = None
+
+
+def _init_worker(template_path: str) -> None:
+    # En plataformas con "spawn" el worker arranca sin Django configurado
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+    from editor.docx_template import preload_template
+
+    global _WORKER_TEMPLATE
+    _WORKER_TEMPLATE = Path(template_path)
+    preload_template(_WORKER_TEMPLATE)
+
+
+def _render_one(
+    task: tuple[int, dict, str, str, str],
+) -> tuple[int, bytes | None, str | None]:
+    from editor.docx_template import render_from_template
+    from editor.pdf_convert import convert_docx_bytes_to_pdf
+
+    index, structured, output_format, font_name, ui_lang = task
+    if _WORKER_TEMPLATE is None:
+        return index, None, "Worker sin plantilla inicializada."
+    try:
+        docx_bytes = render_from_template(
+            structured,
+            _WORKER_TEMPLATE,
+            font_name=font_name or None,
+            ui_lang=ui_lang,
+        )
+    except Exception as exc:
+        return index, None, str(exc).strip() or "error desconocido."
+    if output_format == "docx":
+        return index, docx_bytes, None
+    pdf_bytes, error = convert_docx_bytes_to_pdf(docx_bytes)
+    return index, pdf_bytes, error
+
+
+def _output_name(index: int, structured: dict, output_format: str) -> str:
+    basics = structured.get("basics") or {}
+    slug = slugify(str(basics.get("name") or ""))[:60] or "documento"
+    return f"{index:05d}-{slug}.{output_format}"
+
+
+class Command(BaseCommand):
+    help = "Renderiza en lote estructuras JSONL a DOCX o PDF usando la plantilla configurada."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("input", help="Archivo JSONL (una estructura por linea) o '-' para stdin.")
+        parser.add_argument("--format", choices=["docx", "pdf"], default="docx")
+        destination = parser.add_mutually_exclusive_group(required=True)
+        destination.add_argument("--output-dir", help="Directorio donde escribir los documentos.")
+        destination.add_argument("--zip", dest="zip_path", help="Archivo .zip de salida.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--font", default="", help="Fuente a aplicar (vacio = fuente de la plantilla).")
+        parser.add_argument("--lang", choices=["es", "en"], default="es")
+        parser.add_argument("--template", default="", help="Ruta de plantilla (por defecto CV_TEMPLATE_PATH).")
+
+    def handle(self, *args, **options) -> None:
+        from editor.views import FONT_CHOICES, _template_path
+
+        template_path = Path(options["template"]) if options["template"] else _template_path()
+        if template_path is None or not template_path.is_file():
+            raise CommandError("No se encontro una plantilla DOCX valida para exportar.")
+
+        font_name = options["font"].strip()
+        if font_name and font_name not in FONT_CHOICES:
+            raise CommandError(f"Fuente no soportada: {font_name}")
+
+        workers = max(1, int(options["workers"]))
+        output_format = options["format"]
+        output_dir = Path(options["output_dir"]) if options["output_dir"] else None
+        zip_file = None
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            zip_file = zipfile.ZipFile(options["zip_path"], "w", compression=zipfile.ZIP_STORED)
+
+        stream = sys.stdin if options["input"] == "-" else open(options["input"], encoding="utf-8")
+        written = 0
+        failed = 0
+        started = time.perf_counter()
+        try:
+            # Ventana acotada de tareas en vuelo para no cargar todo el JSONL en memoria
+            max_in_flight = workers * 4
+            names: dict[int, str] = {}
+            pending = set()
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(str(template_path),),
+            ) as executor:
+                for index, structured in enumerate(self._iter_structures(stream)):
+                    names[index] = _output_name(index, structured, output_format)
+                    task = (index, structured, output_format, font_name, options["lang"])
+                    pending.add(executor.submit(_render_one, task))
+                    if len(pending) >= max_in_flight:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        ok, ko = self._collect(done, names, output_dir, zip_file)
+                        written += ok
+                        failed += ko
+                done, _ = wait(pending)
+                ok, ko = self._collect(done, names, output_dir, zip_file)
+                written += ok
+                failed += ko
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if zip_file is not None:
+                zip_file.close()
+
+        elapsed = time.perf_counter() - started
+        rate = written / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{written} documentos ({failed} con error) en {elapsed:.2f}s: {rate:.2f} docs/s "
+                f"con {workers} workers."
+            )
+        )
+
+    def _iter_structures(self, stream):
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                structured = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise CommandError(f"Linea {line_number}: JSON invalido ({exc}).") from exc
+            if not isinstance(structured, dict):
+                raise CommandError(f"Linea {line_number}: se esperaba un objeto JSON.")
+            yield structured
+
+    def _collect(self, futures, names: dict[int, str], output_dir: Path | None, zip_file) -> tuple[int, int]:
+        written = 0
+        failed = 0
+        for future in futures:
+            index, payload, error = future.result()
+            name = names.pop(index)
+            if error or not payload:
+                failed += 1
+                self.stderr.write(f"{name}: {error or 'salida vacia.'}")
+                continue
+            if zip_file is not None:
+                zip_file.writestr(name, payload)
+            else:
+                (output_dir / name).write_bytes(payload)
+            written += 1
+        return written, failed
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Analiza plantillas DOCX y escribe junto a cada una su artefacto precompilado "
+        "(mapa de filas, filas modelo y partes comprimidas)."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "templates", nargs="*", help="Rutas .docx (por defecto todas las plantillas registradas)."
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="No escribe nada: falla si algun artefacto falta o no corresponde a su plantilla.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        from editor import template_registry
+        from editor.docx_template import template_digest
+        from editor.template_artifact import artifact_status, compile_template
+
+        if options["templates"]:
+            targets = {path: Path(path) for path in options["templates"]}
+        else:
+            targets = template_registry.template_paths()
+        if not targets:
+            raise CommandError("No se encontro una plantilla DOCX valida para compilar.")
+
+        failed: list[str] = []
+        for name, path in targets.items():
+            if not path.is_file():
+                self.stderr.write(f"{name}: no existe {path}")
+                failed.append(name)
+                continue
+            if options["check"]:
+                status = artifact_status(path, template_digest(path))
+                self.stdout.write(f"{name}: {status}")
+                if status != "ok":
+                    failed.append(name)
+                continue
+            try:
+                artifact = compile_template(path)
+            except Exception as exc:
+                self.stderr.write(f"{name}: {str(exc).strip() or exc.__class__.__name__}")
+                failed.append(name)
+                continue
+            self.stdout.write(f"{name}: {artifact} ({artifact.stat().st_size / 1024:.0f} KB)")
+
+        if failed:
+            raise CommandError(f"Plantillas con errores: {', '.join(failed)}")
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import io
+import pstats
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Lista los requests lentos perfilados y las funciones mas costosas entre todos los dumps."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--dir", default="", help="Directorio de dumps (por defecto PROFILING_DIR).")
+        parser.add_argument("--limit", type=int, default=20, help="Cantidad de funciones a mostrar.")
+        parser.add_argument("--sort", choices=["cumulative", "tottime", "ncalls"], default="tottime")
+        parser.add_argument("--view", default="", help="Filtra por vista (text_upload, export_docx, export_pdf).")
+        parser.add_argument("--input", default="", help="Filtra por prefijo del hash de input.")
+
+    def handle(self, *args, **options) -> None:
+        from editor.profiling import load_dumps, profiling_dir
+
+        directory = Path(options["dir"]) if options["dir"] else profiling_dir()
+        if directory is None or not directory.is_dir():
+            raise CommandError("No hay directorio de dumps. Configura PROFILING_DIR o usa --dir.")
+
+        dumps = [
+            (path, meta)
+            for path, meta in load_dumps(directory)
+            if (not options["view"] or meta.get("view") == options["view"])
+            and str(meta.get("input_sha256") or "").startswith(options["input"])
+        ]
+        if not dumps:
+            self.stdout.write("Sin dumps que coincidan.")
+            return
+
+        self.stdout.write(f"{len(dumps)} dump(s), del mas lento al mas rapido:")
+        for path, meta in dumps[: options["limit"]]:
+            self.stdout.write(
+                f"  {float(meta.get('duration_ms') or 0):>9.1f} ms  {meta.get('view', '?'):<12} "
+                f"input={str(meta.get('input_sha256') or '?')[:12]}  {path.name}"
+            )
+
+        # Inputs que aparecen varias veces son los mejores candidatos a reproducir
+        repeated: dict[str, int] = {}
+        for _, meta in dumps:
+            sha = str(meta.get("input_sha256") or "")
+            if sha:
+                repeated[sha] = repeated.get(sha, 0) + 1
+        offenders = sorted(((count, sha) for sha, count in repeated.items() if count > 1), reverse=True)
+        if offenders:
+            self.stdout.write("\nInputs lentos repetidos:")
+            for count, sha in offenders[: options["limit"]]:
+                self.stdout.write(f"  {count:>4}x  {sha[:12]}")
+
+        self.stdout.write(f"\nFunciones mas costosas (orden: {options['sort']}):")
+        buffer = io.StringIO()
+        stats = pstats.Stats(*(str(path) for path, _ in dumps), stream=buffer)
+        stats.strip_dirs().sort_stats(options["sort"]).print_stats(options["limit"])
+        self.stdout.write(buffer.getvalue())
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Mide parseo, lectura de formulario y render DOCX sobre un corpus sintetico de CVs."
+
+    def add_arguments(self, parser) -> None:
+        from editor.benchmarks import LANGS, SIZES, STAGES
+
+        parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+        parser.add_argument("--langs", nargs="+", choices=list(LANGS), default=list(LANGS))
+        parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+        parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por caso (se reporta la mediana).")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="", help="Archivo JSON donde guardar los resultados.")
+        parser.add_argument("--baseline", default="", help="Resultados previos (JSON) para detectar regresiones.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Tolerancia relativa sobre la mediana base (0.2 = 20%%).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        from editor.benchmarks.runner import compare_to_baseline, load_results, run_benchmarks, save_results
+        from editor.views import _template_path
+
+        template_path = _template_path()
+        stages = list(options["stages"])
+        if template_path is None and "render_from_template" in stages:
+            self.stderr.write("Sin plantilla DOCX valida: se omite render_from_template.")
+            stages.remove("render_from_template")
+
+        baseline = None
+        if options["baseline"]:
+            baseline_path = Path(options["baseline"])
+            try:
+                baseline = load_results(baseline_path)
+            except (OSError, json.JSONDecodeError) as exc:
+                raise CommandError(f"No se pudo leer la linea base: {exc}") from exc
+
+        results = run_benchmarks(
+            sizes=options["sizes"],
+            langs=options["langs"],
+            stages=stages,
+            repeat=max(1, int(options["repeat"])),
+            seed=options["seed"],
+            template_path=template_path,
+        )
+
+        width = max((len(case) for case in results["cases"]), default=0)
+        for case, timing in results["cases"].items():
+            self.stdout.write(f"{case.ljust(width)}  {timing['median_ms']:>10.2f} ms  (min {timing['min_ms']:.2f})")
+
+        if options["output"]:
+            save_results(results, Path(options["output"]))
+            self.stdout.write(f"Resultados guardados en {options['output']}")
+
+        if baseline is None:
+            return
+        regressions = compare_to_baseline(results, baseline, options["threshold"])
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("Sin regresiones respecto de la linea base."))
+            return
+        for item in regressions:
+            self.stderr.write(
+                f"Regresion en {item['case']}: {item['baseline_ms']:.2f} ms -> {item['current_ms']:.2f} ms"
+            )
+        raise CommandError(f"{len(regressions)} caso(s) con regresion sobre la linea base.")
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+# Metricas en memoria del proceso; con METRICS_MULTIPROC_DIR cada worker vuelca
+# su snapshot a un archivo y el scrape suma los de los workers vivos (los gauges se
+# informan por worker, con label pid). Los archivos de workers muertos se borran.
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRICS: dict[str, tuple[str, str]] = {
+    "trufadocs_stage_duration_seconds": ("histogram", "Duracion de cada etapa del pipeline."),
+    "trufadocs_pdf_pages_total": ("counter", "Paginas de PDF procesadas."),
+    "trufadocs_pdf_lines_total": ("counter", "Lineas extraidas de PDFs."),
+    "trufadocs_extra_sections_total": ("counter", "Secciones extra detectadas al importar."),
+    "trufadocs_errors_total": ("counter", "Errores mostrados al usuario, por clave de UI_MESSAGES."),
+    "trufadocs_export_cache_total": ("counter", "Consultas a la cache de exportaciones (hit/miss)."),
+    "trufadocs_render_content_cache_total": ("counter", "Renders que reutilizaron el contenido ya armado (hit/miss)."),
+    "trufadocs_singleflight_shared_total": ("counter", "Parseos reutilizados de una subida identica concurrente."),
+    "trufadocs_admission_in_flight": ("gauge", "Trabajos pesados en curso, por clase de operacion."),
+    "trufadocs_admission_queue_depth": ("gauge", "Requests esperando cupo, por clase de operacion."),
+    "trufadocs_admission_wait_seconds": ("histogram", "Espera hasta obtener cupo, por clase de operacion."),
+    "trufadocs_admission_rejected_total": ("counter", "Requests rechazados con 503 (cola llena o espera agotada)."),
+}
+
+_LOCK = threading.Lock()
+# (nombre, labels) -> valor
+_COUNTERS: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+# (nombre, labels) -> [conteo por bucket..., suma, total]
+_HISTOGRAMS: dict[tuple[str, tuple[tuple[str, str], ...]], list[float]] = {}
+# (nombre, labels) -> valor actual; entre workers se suman
+_GAUGES: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+_DIRTY = False
+
+
+def _labels(labels: dict[str, str] | None) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((labels or {}).items()))
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+    global _DIRTY
+    key = (name, _labels(labels))
+    with _LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0.0) + amount
+        _DIRTY = True
+
+
+def set_gauge(name: str, value: float, **labels: str) -> None:
+    global _DIRTY
+    key = (name, _labels(labels))
+    with _LOCK:
+        _GAUGES[key] = float(value)
+        _DIRTY = True
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    global _DIRTY
+    key = (name, _labels(labels))
+    with _LOCK:
+        state = _HISTOGRAMS.get(key)
+        if state is None:
+            state = [0.0] * (len(STAGE_BUCKETS) + 2)
+            _HISTOGRAMS[key] = state
+        for index, bound in enumerate(STAGE_BUCKETS):
+            if value <= bound:
+                state[index] += 1
+        state[-2] += value
+        state[-1] += 1
+        _DIRTY = True
+
+
+def observe_stage(stage_name: str, seconds: float) -> None:
+    observe("trufadocs_stage_duration_seconds", seconds, stage=stage_name)
+
+
+def _snapshot() -> dict:
+    with _LOCK:
+        return {
+            "counters": [[name, list(map(list, labels)), value] for (name, labels), value in _COUNTERS.items()],
+            "gauges": [[name, list(map(list, labels)), value] for (name, labels), value in _GAUGES.items()],
+            "histograms": [
+                [name, list(map(list, labels)), list(state)] for (name, labels), state in _HISTOGRAMS.items()
+            ],
+        }
+
+
+def _multiproc_dir() -> Path | None:
+    raw = str(getattr(settings, "METRICS_MULTIPROC_DIR", "") or "").strip()
+    return Path(raw) if raw else None
+
+
+def flush() -> None:
+    # Escribe el snapshot de este proceso (reemplazo atomico)
+    global _DIRTY
+    directory = _multiproc_dir()
+    if directory is None or not _DIRTY:
+        return
+    _DIRTY = False
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"metrics-{os.getpid()}.json"
+    tmp = target.with_suffix(".tmp")
+    tmp.write_text(json.dumps(_snapshot()), encoding="utf-8")
+    os.replace(tmp, target)
+
+
+def flush_on_request_finished(sender, **kwargs) -> None:
+    try:
+        flush()
+    except OSError:
+        pass
+
+
+def mark_process_dead(pid: int) -> None:
+    # Para el hook child_exit de gunicorn: el snapshot del worker terminado deja de contar
+    directory = _multiproc_dir()
+    if directory is not None:
+        (directory / f"metrics-{pid}.json").unlink(missing_ok=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # En Windows os.kill termina el proceso: no se puede sondear asi
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _collect() -> tuple[dict, dict, dict]:
+    # Snapshot -> pid del worker (None sin METRICS_MULTIPROC_DIR)
+    snapshots: list[tuple[dict, str | None]] = []
+    directory = _multiproc_dir()
+    if directory is None:
+        snapshots.append((_snapshot(), None))
+    else:
+        flush()
+        for path in sorted(directory.glob("metrics-*.json")):
+            pid = path.stem.removeprefix("metrics-")
+            if not pid.isdigit():
+                continue
+            if not _pid_alive(int(pid)):
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                snapshots.append((json.loads(path.read_text(encoding="utf-8")), pid))
+            except (OSError, ValueError):
+                continue
+
+    counters: dict[tuple, float] = {}
+    gauges: dict[tuple, float] = {}
+    histograms: dict[tuple, list[float]] = {}
+    for snapshot, pid in snapshots:
+        for name, labels, value in snapshot.get("counters", []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, value in snapshot.get("gauges", []):
+            pairs = [tuple(pair) for pair in labels] + ([("pid", pid)] if pid else [])
+            gauges[(name, tuple(sorted(pairs)))] = value
+        for name, labels, state in snapshot.get("histograms", []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            merged = histograms.setdefault(key, [0.0] * len(state))
+            for index, value in enumerate(state):
+                merged[index] += value
+    return counters, gauges, histograms
+
+
+def _format_labels(labels: tuple, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    rendered = ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    )
+    return "{" + rendered + "}"
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_text() -> str:
+    # Formato de texto de Prometheus (version 0.0.4)
+    counters, gauges, histograms = _collect()
+    lines: list[str] = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind in ("counter", "gauge"):
+            values = counters if kind == "counter" else gauges
+            for (metric, labels), value in sorted(values.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+            continue
+        for (metric, labels), state in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(STAGE_BUCKETS, state):
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', repr(bound)))} {_format_number(count)}")
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {_format_number(state[-1])}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {repr(float(state[-2]))}")
+            lines.append(f"{name}_count{_format_labels(labels)} {_format_number(state[-1])}")
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    # Solo para pruebas
+    global _DIRTY
+    with _LOCK:
+        _COUNTERS.clear()
+        _GAUGES.clear()
+        _HISTOGRAMS.clear()
+        _DIRTY = False
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import cProfile
+import random
+import time
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from .profiling import PROFILED_VIEWS, profiling_dir, save_dump
+from .timing import server_timing_header, start_recording, stop_recording
+
+
+class ServerTimingMiddleware:
+    # Expone las etapas medidas con editor.timing.stage en el header Server-Timing
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = bool(getattr(settings, "SERVER_TIMING_ENABLED", True))
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+        token = start_recording()
+        try:
+            response = self.get_response(request)
+        finally:
+            timings = stop_recording(token)
+        if timings:
+            response["Server-Timing"] = server_timing_header(timings)
+        return response
+
+
+class SlowRequestProfilerMiddleware:
+    # Perfila con cProfile una fraccion de las subidas/exportaciones y guarda el dump
+    # (PROFILING_DIR) solo si el request supera PROFILING_THRESHOLD_MS
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = float(getattr(settings, "PROFILING_SAMPLE_RATE", 0.0))
+        self.threshold_ms = float(getattr(settings, "PROFILING_THRESHOLD_MS", 2000))
+        self.enabled = self.sample_rate > 0 and profiling_dir() is not None
+
+    def __call__(self, request):
+        if not self.enabled or random.random() >= self.sample_rate:
+            return self.get_response(request)
+        try:
+            view_name = resolve(request.path_info).url_name
+        except Resolver404:
+            view_name = None
+        if view_name not in PROFILED_VIEWS:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Otro profiler activo en este hilo
+            return self.get_response(request)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= self.threshold_ms:
+            try:
+                save_dump(profiler, request, view_name, duration_ms)
+            except OSError:
+                pass
+        return response
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Callable, ContextManager
+
+from django.conf import settings
+
+# Backends soportados para DOCX -> PDF
+PDF_CONVERTER_BACKENDS = ("docx2pdf", "libreoffice")
+
+# Pool de conversiones del proceso: (cantidad de workers, executor). Se crea al primer
+# uso, ya dentro del worker (no antes del fork de gunicorn).
+_POOL: tuple[int, ThreadPoolExecutor] | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def pdf_converter_backend() -> str:
+    backend = str(getattr(settings, "PDF_CONVERTER", "docx2pdf") or "").strip().lower()
+    return backend if backend in PDF_CONVERTER_BACKENDS else "docx2pdf"
+
+
+def convert_docx_bytes_to_pdf(docx_bytes: bytes) -> tuple[bytes | None, str | None]:
+    # Convierte DOCX a PDF con el backend configurado (PDF_CONVERTER)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        input_path = tmp_path / "documento.docx"
+        input_path.write_bytes(docx_bytes)
+        output_path, error = convert_docx_file_to_pdf(input_path)
+        if error or output_path is None:
+            return None, error
+        return output_path.read_bytes(), None
+
+
+def convert_docx_to_pdf_file(write_docx: Callable[[BinaryIO], None], out: BinaryIO) -> str | None:
+    # Version sin bytes en memoria: write_docx escribe el DOCX directo en el archivo de
+    # entrada y el PDF se copia por bloques a out. Devuelve el error, o None si salio bien.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = Path(tmp_dir) / "documento.docx"
+        # Abierto tambien para lectura: quien escribe puede releer el DOCX (ej. para la cache)
+        with input_path.open("w+b") as handle:
+            write_docx(handle)
+        output_path, error = convert_docx_file_to_pdf(input_path)
+        if error or output_path is None:
+            return error
+        with output_path.open("rb") as handle:
+            shutil.copyfileobj(handle, out)
+    return None
+
+
+def converter_workers() -> int:
+    return max(1, int(getattr(settings, "PDF_CONVERTER_WORKERS", 2)))
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _POOL
+    workers = converter_workers()
+    with _POOL_LOCK:
+        if _POOL is None or _POOL[0] != workers:
+            if _POOL is not None:
+                _POOL[1].shutdown(wait=False)
+            _POOL = (workers, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-convert"))
+        return _POOL[1]
+
+
+def convert_many_docx_to_pdf(
+    docx_list: list[bytes], slot: Callable[[], ContextManager[None]] | None = None
+) -> list[tuple[bytes | None, str | None]]:
+    # Varias conversiones en paralelo (PDF_CONVERTER_WORKERS); cada una usa su propio
+    # directorio temporal y perfil de LibreOffice. Resultados en el mismo orden.
+    # slot() rodea cada conversion por separado (p. ej. un cupo de admision por conversion);
+    # si lanza, el error sale de aca y las conversiones pendientes se cancelan.
+    def convert(docx_bytes: bytes) -> tuple[bytes | None, str | None]:
+        if slot is None:
+            return convert_docx_bytes_to_pdf(docx_bytes)
+        with slot():
+            return convert_docx_bytes_to_pdf(docx_bytes)
+
+    if len(docx_list) <= 1:
+        return [convert(docx_bytes) for docx_bytes in docx_list]
+    return list(_pool().map(convert, docx_list))
+
+
+def convert_docx_file_to_pdf(input_path: Path) -> tuple[Path | None, str | None]:
+    # Convierte un DOCX en disco; el PDF queda junto al archivo de entrada
+    if pdf_converter_backend() == "libreoffice":
+        return _convert_with_libreoffice(input_path)
+    return _convert_with_docx2pdf(input_path)
+
+
+def _short_detail(exc: Exception) -> str:
+    detail = str(exc).strip()
+    if len(detail) > 400:
+        detail = detail[:400].rstrip() + "..."
+    return detail
+
+
+def _convert_with_docx2pdf(input_path: Path) -> tuple[Path | None, str | None]:
+    # docx2pdf requiere Microsoft Word instalado
+    try:
+        from docx2pdf import convert as docx2pdf_convert
+    except Exception:
+        return None, "docx2pdf no esta instalado. Ejecuta pip install -r requirements.txt."
+
+    output_path = input_path.with_name(f"{input_path.stem}.pdf")
+
+    pythoncom = None
+    try:
+        import pythoncom  # type: ignore
+    except Exception:
+        pythoncom = None
+
+    co_initialized = False
+    try:
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+            co_initialized = True
+        docx2pdf_convert(str(input_path), str(output_path))
+    except Exception as exc:
+        detail = _short_detail(exc)
+        if detail:
+            return None, f"docx2pdf fallo al convertir: {detail}"
+        return None, "docx2pdf fallo al convertir. Asegura que Microsoft Word este instalado."
+    finally:
+        if pythoncom is not None and co_initialized:
+            try:
+                pythoncom.CoUninitialize()
+            except Exception:
+                pass
+
+    if not output_path.exists():
+        return None, "docx2pdf no genero el PDF esperado. Verifica Microsoft Word."
+    return output_path, None
+
+
+def _libreoffice_binary() -> str | None:
+    configured = str(getattr(settings, "LIBREOFFICE_BINARY", "") or "").strip()
+    if configured:
+        return configured
+    return shutil.which("soffice") or shutil.which("libreoffice")
+
+
+def _convert_with_libreoffice(input_path: Path) -> tuple[Path | None, str | None]:
+    # LibreOffice headless: util en servidores Linux sin Word
+    binary = _libreoffice_binary()
+    if not binary:
+        return None, "LibreOffice no esta instalado. Configura LIBREOFFICE_BINARY o instala soffice."
+
+    out_dir = input_path.parent
+    # Perfil aislado por conversion: soffice no admite dos procesos con el mismo perfil
+    profile_dir = out_dir / "lo-profile"
+    command = [
+        binary,
+        f"-env:UserInstallation={profile_dir.resolve().as_uri()}",
+        "--headless",
+        "--norestore",
+        "--convert-to",
+        "pdf",
+        "--outdir",
+        str(out_dir),
+        str(input_path),
+    ]
+    timeout = int(getattr(settings, "PDF_CONVERTER_TIMEOUT", 120))
+    try:
+        subprocess.run(command, check=True, capture_output=True, timeout=timeout)
+    except Exception as exc:
+        detail = _short_detail(exc)
+        return None, f"LibreOffice fallo al convertir: {detail or 'error desconocido.'}"
+
+    output_path = input_path.with_name(f"{input_path.stem}.pdf")
+    if not output_path.exists():
+        return None, "LibreOffice no genero el PDF esperado."
+    return output_path, None
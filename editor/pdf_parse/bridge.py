@@ -8,7 +8,8 @@ from .constants import HONORS_PREFIX_RE, URL_RE
 from .extract import extract_lines
 from .parsers import parse_education, parse_experience, parse_skills
 
-from .. import structure
+from .. import metrics, structure
+from ..timing import stage
 
 REMOTE_LOCATION_HINTS = {
     "remoto",
@@ -282,7 +283,8 @@ def _parse_extra_section(title: str, raw_lines: list[dict], section_index: int)
 
 def parse_pdf_to_structure(file_obj) -> tuple[dict, str | None]:
     try:
-        lines = extract_lines(file_obj)
+        with stage("extract"):
+            lines = extract_lines(file_obj)
     except Exception as exc:
         detail = str(exc).strip()
         return structure.default_structure(), (
@@ -291,8 +293,10 @@ def parse_pdf_to_structure(file_obj) -> tuple[dict, str | None]:
 
     if not lines:
         return structure.default_structure(), "No se pudo extraer texto del PDF."
+    metrics.inc("trufadocs_pdf_lines_total", len(lines))
 
-    assembled = assemble_sections(lines)
+    with stage("assemble"):
+        assembled = assemble_sections(lines)
     header = assembled["header"]
     header_lines = assembled["header_lines"]
 
@@ -328,33 +332,35 @@ def parse_pdf_to_structure(file_obj) -> tuple[dict, str | None]:
             detected_order.append(module_id)
             seen_core.add(module_id)
 
-    for section in assembled["sections"]:
-        title = section.get("title") or ""
-        normalized_title = _normalize_section_title(title)
-        raw_lines = section.get("raw") or []
-
-        if normalized_title in EXPERIENCE_SECTION_TITLES:
-            data["experience"].extend(_map_experience(parse_experience(raw_lines)))
-            register_core("experience")
-            continue
-        if normalized_title in EDUCATION_SECTION_TITLES:
-            data["education"].extend(_map_education(parse_education(raw_lines)))
-            register_core("education")
-            continue
-        if normalized_title in SKILLS_SECTION_TITLES:
-            data["skills"].extend(_map_skills(parse_skills(raw_lines)))
-            register_core("skills")
-            continue
-
-        extra_lines = [entry for entry in raw_lines if entry.get("text")]
-        if extra_lines:
-            section_extra = _parse_extra_section(title, extra_lines, len(parsed_extras))
-            parsed_extras.append(section_extra)
-            section_id = (section_extra.get("section_id") or "").strip()
-            if section_id:
-                detected_order.append(section_id)
+    with stage("parse"):
+        for section in assembled["sections"]:
+            title = section.get("title") or ""
+            normalized_title = _normalize_section_title(title)
+            raw_lines = section.get("raw") or []
+
+            if normalized_title in EXPERIENCE_SECTION_TITLES:
+                data["experience"].extend(_map_experience(parse_experience(raw_lines)))
+                register_core("experience")
+                continue
+            if normalized_title in EDUCATION_SECTION_TITLES:
+                data["education"].extend(_map_education(parse_education(raw_lines)))
+                register_core("education")
+                continue
+            if normalized_title in SKILLS_SECTION_TITLES:
+                data["skills"].extend(_map_skills(parse_skills(raw_lines)))
+                register_core("skills")
+                continue
+
+            extra_lines = [entry for entry in raw_lines if entry.get("text")]
+            if extra_lines:
+                section_extra = _parse_extra_section(title, extra_lines, len(parsed_extras))
+                parsed_extras.append(section_extra)
+                section_id = (section_extra.get("section_id") or "").strip()
+                if section_id:
+                    detected_order.append(section_id)
 
     if parsed_extras:
+        metrics.inc("trufadocs_extra_sections_total", len(parsed_extras))
         data["extra_sections"] = parsed_extras
     data.setdefault("meta", {})["core_order"] = structure._build_core_order_from_detected(
         detected_order,
@@ -12,6 +12,8 @@ from .constants import (
     URL_RE,
 )
 
+from .. import metrics
+
 
 def clamp01(value: float) -> float:
     return max(0.0, min(1.0, value))
@@ -129,6 +131,7 @@ def extract_lines(file_obj) -> list[Line]:
     lines: list[Line] = []
     file_obj.seek(0)
     with pdfplumber.open(file_obj) as pdf:
+        metrics.inc("trufadocs_pdf_pages_total", len(pdf.pages))
         for page_index, page in enumerate(pdf.pages, start=1):
             words = page.extract_words(
                 use_text_flow=True,
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import cProfile
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from . import drafts
+
+# Vistas que vale la pena perfilar (parseo y exportacion)
+PROFILED_VIEWS = {"text_upload", "export_docx", "export_pdf", "export_batch"}
+
+_FORM_CONTENT_TYPES = {"multipart/form-data", "application/x-www-form-urlencoded"}
+
+
+def profiling_dir() -> Path | None:
+    raw = str(getattr(settings, "PROFILING_DIR", "") or "").strip()
+    return Path(raw) if raw else None
+
+
+def input_digest(request) -> str:
+    # Hash del input (archivos + campos del formulario, o el cuerpo JSON) para reconocer el mismo
+    # CV entre dumps. No se guarda el contenido: los CVs son datos personales.
+    digest = hashlib.sha256()
+    if request.content_type in _FORM_CONTENT_TYPES:
+        fields = {key: request.POST.getlist(key) for key in request.POST if key != "csrfmiddlewaretoken"}
+        digest.update(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        token = request.POST.get("draft_token", "")
+    else:
+        digest.update(request.body)
+        token = _json_draft_token(request.body)
+    for key in sorted(request.FILES):
+        for uploaded in request.FILES.getlist(key):
+            uploaded.seek(0)
+            for chunk in uploaded.chunks():
+                digest.update(chunk)
+    # Con draft_token el CV vive en el borrador: el mismo token puede ser otro CV en cada version
+    current = drafts.load(token.strip()) if token and drafts.drafts_enabled() else None
+    if current is not None:
+        digest.update(json.dumps(current[0], sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _json_draft_token(body: bytes) -> str:
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return ""
+    token = payload.get("draft_token") if isinstance(payload, dict) else None
+    return token if isinstance(token, str) else ""
+
+
+def save_dump(profiler: cProfile.Profile, request, view_name: str, duration_ms: float) -> Path | None:
+    directory = profiling_dir()
+    if directory is None:
+        return None
+    directory.mkdir(parents=True, exist_ok=True)
+    sha = input_digest(request)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    base = directory / f"{stamp}-{view_name}-{int(duration_ms)}ms-{sha[:12]}"
+    profiler.dump_stats(str(base.with_suffix(".prof")))
+    meta = {
+        "view": view_name,
+        "path": request.path,
+        "duration_ms": round(duration_ms, 1),
+        "input_sha256": sha,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    base.with_suffix(".json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    _prune(directory)
+    return base.with_suffix(".prof")
+
+
+def _prune(directory: Path) -> None:
+    # Conserva solo los dumps mas recientes para no llenar el disco
+    keep = max(1, int(getattr(settings, "PROFILING_MAX_DUMPS", 200)))
+    dumps = sorted(directory.glob("*.prof"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for stale in dumps[keep:]:
+        stale.unlink(missing_ok=True)
+        stale.with_suffix(".json").unlink(missing_ok=True)
+
+
+def load_dumps(directory: Path) -> list[tuple[Path, dict]]:
+    # (ruta .prof, metadata) ordenados del mas lento al mas rapido
+    dumps: list[tuple[Path, dict]] = []
+    for prof_path in directory.glob("*.prof"):
+        meta_path = prof_path.with_suffix(".json")
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            meta = {}
+        dumps.append((prof_path, meta))
+    dumps.sort(key=lambda item: float(item[1].get("duration_ms") or 0), reverse=True)
+    return dumps
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable
+
+from django.conf import settings
+
+from . import metrics
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # Windows: solo coalescencia dentro del proceso
+    fcntl = None
+
+# Calculos en curso dentro del proceso: clave -> Future del lider
+_IN_FLIGHT: dict[str, Future] = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+
+_POLL_SECONDS = 0.05
+# Los resultados (datos del CV) solo sirven a quienes ya esperaban: se borran vencido este
+# tiempo. Cada proceso revisa el directorio como mucho una vez por _PRUNE_INTERVAL_SECONDS
+_RESULT_TTL_SECONDS = 60
+_LOCK_TTL_SECONDS = 3600
+_PRUNE_INTERVAL_SECONDS = 30
+_LAST_PRUNE: dict[Path, float] = {}
+_PRUNE_LOCK = threading.Lock()
+
+
+def coalesce(key: str, compute: Callable[[], Any]) -> Any:
+    # Ejecuta compute una sola vez por clave entre llamadas concurrentes.
+    # El resultado debe ser serializable a JSON (se comparte entre workers).
+    with _IN_FLIGHT_LOCK:
+        future = _IN_FLIGHT.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _IN_FLIGHT[key] = future
+    if not leader:
+        metrics.inc("trufadocs_singleflight_shared_total", scope="process")
+        # Copia propia: el lider y los seguidores no comparten objetos mutables
+        return copy.deepcopy(future.result())
+
+    try:
+        result = _compute_across_workers(key, compute)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _IN_FLIGHT_LOCK:
+            _IN_FLIGHT.pop(key, None)
+
+
+def _shared_dir() -> Path | None:
+    raw = str(getattr(settings, "SINGLEFLIGHT_DIR", "") or "").strip()
+    if not raw or fcntl is None:
+        return None
+    return Path(raw)
+
+
+def _compute_across_workers(key: str, compute: Callable[[], Any]) -> Any:
+    directory = _shared_dir()
+    if directory is None:
+        return compute()
+    directory.mkdir(parents=True, exist_ok=True)
+    _maybe_prune(directory)
+    lock_path = directory / f"{key}.lock"
+    result_path = directory / f"{key}.json"
+    timeout = float(getattr(settings, "SINGLEFLIGHT_TIMEOUT", 60))
+
+    waiting_since = time.time()
+    with open(lock_path, "a+b") as lock_file:
+        acquired = _acquire(lock_file, timeout)
+        try:
+            if acquired:
+                # Si otro worker termino mientras esperabamos, reutiliza su resultado
+                shared = _read_result(result_path, waiting_since)
+                if shared is not None:
+                    metrics.inc("trufadocs_singleflight_shared_total", scope="workers")
+                    return shared[0]
+            result = compute()
+            if acquired:
+                _write_result(result_path, result)
+            return result
+        finally:
+            if acquired:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _acquire(lock_file, timeout: float) -> bool:
+    # Espera el lock del lider; si tarda demasiado se calcula sin coordinar
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(_POLL_SECONDS)
+
+
+def _read_result(path: Path, newer_than: float) -> tuple[Any] | None:
+    try:
+        if path.stat().st_mtime < newer_than:
+            return None
+        return (json.loads(path.read_text(encoding="utf-8")),)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_result(path: Path, result: Any) -> None:
+    try:
+        payload = json.dumps(result, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(payload, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _maybe_prune(directory: Path) -> None:
+    # Recorrer el directorio en cada subida es O(archivos): se hace cada tanto
+    now = time.monotonic()
+    with _PRUNE_LOCK:
+        last = _LAST_PRUNE.get(directory)
+        if last is not None and now - last < _PRUNE_INTERVAL_SECONDS:
+            return
+        _LAST_PRUNE[directory] = now
+    _prune(directory)
+
+
+def _prune(directory: Path) -> None:
+    # Limpia resultados y locks viejos; en el peor caso un borrado concurrente
+    # solo provoca un calculo duplicado
+    now = time.time()
+    for path in directory.iterdir():
+        ttl = _LOCK_TTL_SECONDS if path.suffix == ".lock" else _RESULT_TTL_SECONDS
+        try:
+            if path.stat().st_mtime < now - ttl:
+                path.unlink()
+        except OSError:
+            continue
@@ -55,6 +55,7 @@
       section_document: "Documento",
       section_basics: "Datos básicos",
       label_source: "Fuente",
+      label_template: "Plantilla",
       option_template_font: "Fuente de la plantilla",
       label_name: "Nombre",
       label_profile: "Descripción / Perfil",
@@ -131,6 +132,7 @@
       section_document: "DOCUMENT",
       section_basics: "BASIC INFO",
       label_source: "Source",
+      label_template: "Template",
       option_template_font: "Template font",
       label_name: "Name",
       label_profile: "Summary / Profile",
@@ -300,6 +302,7 @@
     setSectionHeadingByFieldName("doc_font", "section_document", scope);
     setSectionHeadingByFieldName("name", "section_basics", scope);
     setFieldLabelByName("doc_font", "label_source", scope);
+    setFieldLabelByName("template", "label_template", scope);
     qsa('select[name="doc_font"]', scope).forEach((select) => {
       const firstOption = select.querySelector('option[value=""]');
       if (firstOption) firstOption.textContent = t("option_template_font");
@@ -588,6 +591,30 @@
     hidden.value = year ? (month ? `${year}-${month}` : year) : "";
   };
 
+  // Las listas de años y países se renderizan una sola vez en <template>
+  // y se copian a cada select al inicializarlo (HTML O(entradas), no O(entradas x opciones)).
+  const fillOptions = (select, sourceId) => {
+    if (!select || select.dataset.optionsInit === "1") return;
+    const source = document.getElementById(sourceId);
+    if (!source || !source.content) return;
+    select.dataset.optionsInit = "1";
+
+    const current = select.value || "";
+    // Conserva solo el placeholder; la opción seleccionada vuelve desde la lista compartida
+    Array.from(select.options).forEach((option) => {
+      if (option.value) option.remove();
+    });
+    select.appendChild(source.content.cloneNode(true));
+    if (current && !Array.from(select.options).some((option) => option.value === current)) {
+      select.appendChild(new Option(current, current));
+    }
+    select.value = current;
+  };
+
+  const initCountrySelects = (rootEl = document) => {
+    qsa("[data-country-select]", rootEl).forEach((select) => fillOptions(select, "tpl-country-options"));
+  };
+
   const initDateField = (block) => {
     if (!block || block.dataset.dateInit === "1") return;
     block.dataset.dateInit = "1";
@@ -596,6 +623,7 @@
     const monthSelect = block.querySelector("[data-month-select]");
     const yearSelect = block.querySelector("[data-year-select]");
     if (!hidden || !monthSelect || !yearSelect) return;
+    fillOptions(yearSelect, "tpl-year-options");
 
     const { year, month, current } = parseDateValue(hidden.value || "");
     yearSelect.value = year || "";
@@ -660,6 +688,7 @@
     rootEl
       .querySelectorAll("[data-date-field]")
       .forEach((block) => initDateField(block));
+    initCountrySelects(rootEl);
     rootEl
       .querySelectorAll(".repeat")
       .forEach((repeat) => initCurrentToggle(repeat));
@@ -962,21 +991,222 @@ addHandlers.forEach(({ button, list, tpl }) => {
   });
 
   const form = document.querySelector("#structured-form");
+  const prepareForm = () => {
+    // Convierte filas de hitos a texto con saltos de linea
+    form.querySelectorAll("[data-highlight-block]").forEach((block) => {
+      const textarea = block.querySelector(".highlight-textarea");
+      if (!textarea) return;
+      const values = Array.from(block.querySelectorAll(".highlight-input"))
+        .map((input) => input.value.trim())
+        .filter(Boolean);
+      textarea.value = values.join("\n");
+    });
+
+    form.querySelectorAll("[data-date-field]").forEach((block) => {
+      syncDateField(block);
+    });
+  };
   if (form) {
-    form.addEventListener("submit", () => {
-      // Convierte filas de hitos a texto con saltos de linea
-      form.querySelectorAll("[data-highlight-block]").forEach((block) => {
-        const textarea = block.querySelector(".highlight-textarea");
-        if (!textarea) return;
-        const values = Array.from(block.querySelectorAll(".highlight-input"))
-          .map((input) => input.value.trim())
-          .filter(Boolean);
-        textarea.value = values.join("\n");
-      });
+    form.addEventListener("submit", prepareForm);
+  }
+
+  // -------------------------------
+  // Borradores: el documento del editor vive en el servidor (token) y se
+  // actualiza con parches JSON; las exportaciones solo envían el token.
+  // -------------------------------
+  const fieldValue = (scope, name) => {
+    const el = scope.querySelector(`[name="${name}"]`);
+    return el && !el.disabled ? el.value || "" : "";
+  };
+  const lineValues = (text) => String(text || "").split("\n").map((line) => line.trim()).filter(Boolean);
 
-      form.querySelectorAll("[data-date-field]").forEach((block) => {
-        syncDateField(block);
+  const collectStructure = () => {
+    prepareForm();
+    const basics = {};
+    ["name", "description", "email", "phone", "linkedin", "github", "city", "country"].forEach((key) => {
+      basics[key] = fieldValue(form, key);
+    });
+    const repeats = (listSelector) => qsa(`${listSelector} > .repeat`, form);
+    const doc = {
+      meta: {
+        core_order: fieldValue(form, "core_order"),
+        module_order_map: fieldValue(form, "module_order_map"),
+      },
+      basics,
+      experience: repeats("#experience-list").map((item) => ({
+        role: fieldValue(item, "exp_role"),
+        company: fieldValue(item, "exp_company"),
+        start: fieldValue(item, "exp_start"),
+        end: fieldValue(item, "exp_end"),
+        city: fieldValue(item, "exp_city"),
+        country: fieldValue(item, "exp_country"),
+        technologies: fieldValue(item, "exp_tech"),
+        highlights: lineValues(fieldValue(item, "exp_highlights")),
+      })),
+      education: repeats("#education-list").map((item) => ({
+        degree: fieldValue(item, "edu_degree"),
+        institution: fieldValue(item, "edu_institution"),
+        start: fieldValue(item, "edu_start"),
+        end: fieldValue(item, "edu_end"),
+        city: fieldValue(item, "edu_city"),
+        country: fieldValue(item, "edu_country"),
+        honors: fieldValue(item, "edu_honors"),
+      })),
+      skills: repeats("#skills-list").map((item) => ({
+        category: fieldValue(item, "skill_category"),
+        items: fieldValue(item, "skill_items"),
+      })),
+      extra_sections: qsa("[data-extra-section]", form).map((section) => {
+        const mode = fieldValue(section, "extra_mode") || "subtitle_items";
+        return {
+          section_id: fieldValue(section, "extra_section_id"),
+          title: fieldValue(section, "extra_title"),
+          mode,
+          entries: qsa("[data-extra-entry]", section).map((entry) => ({
+            subtitle: fieldValue(entry, "extra_entry_subtitle"),
+            title: fieldValue(entry, "extra_entry_title"),
+            where: fieldValue(entry, "extra_entry_where"),
+            tech: fieldValue(entry, "extra_entry_tech"),
+            start: fieldValue(entry, "extra_entry_start"),
+            end: fieldValue(entry, "extra_entry_end"),
+            city: fieldValue(entry, "extra_entry_city"),
+            country: fieldValue(entry, "extra_entry_country"),
+            items: lineValues(
+              fieldValue(entry, mode === "detailed" ? "extra_entry_items_detailed" : "extra_entry_items_si"),
+            ),
+          })),
+        };
+      }),
+    };
+    return doc;
+  };
+
+  const pointerToken = (key) => String(key).replace(/~/g, "~0").replace(/\//g, "~1");
+  const diffJson = (before, after, path = "", ops = []) => {
+    // Parches mínimos para objetos; listas de distinto largo se reemplazan completas
+    if (Array.isArray(before) && Array.isArray(after) && before.length === after.length) {
+      after.forEach((value, idx) => diffJson(before[idx], value, `${path}/${idx}`, ops));
+    } else if (
+      before && after && typeof before === "object" && typeof after === "object" &&
+      !Array.isArray(before) && !Array.isArray(after)
+    ) {
+      Object.keys(before).forEach((key) => {
+        if (!(key in after)) ops.push({ op: "remove", path: `${path}/${pointerToken(key)}` });
+      });
+      Object.keys(after).forEach((key) => {
+        const keyPath = `${path}/${pointerToken(key)}`;
+        if (!(key in before)) ops.push({ op: "add", path: keyPath, value: after[key] });
+        else diffJson(before[key], after[key], keyPath, ops);
       });
+    } else if (JSON.stringify(before) !== JSON.stringify(after)) {
+      ops.push({ op: "replace", path, value: after });
+    }
+    return ops;
+  };
+
+  const draftsUrl = form ? form.dataset.draftsUrl : "";
+  const csrfToken = () => fieldValue(form, "csrfmiddlewaretoken");
+  const draft = { token: "", version: 0, synced: null, pending: null, timer: 0 };
+
+  const sendJson = (method, url, body) =>
+    fetch(`${url}?ui_lang=${getLang()}`, {
+      method,
+      headers: { "Content-Type": "application/json", "X-CSRFToken": csrfToken() },
+      body: JSON.stringify(body),
+      credentials: "same-origin",
+    });
+
+  const syncDraft = async () => {
+    const doc = collectStructure();
+    if (draft.token && draft.synced) {
+      const ops = diffJson(draft.synced, doc);
+      if (!ops.length) return true;
+      const response = await sendJson("PATCH", `${draftsUrl}${draft.token}/`, { version: draft.version, ops });
+      if (response.ok) {
+        draft.version = (await response.json()).version;
+        draft.synced = doc;
+        return true;
+      }
+      // Borrador expirado, de otro worker o desfasado: se recrea completo
+      draft.token = "";
+    }
+    const response = await sendJson("POST", draftsUrl, { structured: doc });
+    if (!response.ok) return false;
+    const created = await response.json();
+    draft.token = created.token;
+    draft.version = created.version;
+    draft.synced = doc;
+    return true;
+  };
+
+  const queueDraftSync = () => {
+    // Un solo envío a la vez: cada sincronización se encadena detrás de la anterior en
+    // una única cadena y toma todos los cambios acumulados mientras tanto
+    const next = (draft.pending || Promise.resolve())
+      .then(() => syncDraft())
+      .catch(() => false);
+    draft.pending = next;
+    next.then(() => {
+      if (draft.pending === next) draft.pending = null;
+    });
+    return next;
+  };
+
+  const scheduleDraftSync = () => {
+    window.clearTimeout(draft.timer);
+    draft.timer = window.setTimeout(queueDraftSync, 800);
+  };
+
+  const downloadResponse = async (response) => {
+    const disposition = response.headers.get("Content-Disposition") || "";
+    const match = disposition.match(/filename="([^"]+)"/);
+    const url = URL.createObjectURL(await response.blob());
+    const link = document.createElement("a");
+    link.href = url;
+    link.download = match ? match[1] : "documento";
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    window.setTimeout(() => URL.revokeObjectURL(url), 1000);
+  };
+
+  const exportFromDraft = async (action) => {
+    window.clearTimeout(draft.timer);
+    if (!(await queueDraftSync()) || !draft.token) return false;
+    const payload = new FormData();
+    ["csrfmiddlewaretoken", "ui_lang", "filename", "doc_font", "template", "use_structured"].forEach((name) => {
+      payload.append(name, fieldValue(form, name));
+    });
+    payload.append("draft_token", draft.token);
+    const response = await fetch(action, { method: "POST", body: payload, credentials: "same-origin" });
+    const type = response.headers.get("Content-Type") || "";
+    // Errores (página del editor con mensaje o borrador perdido): se envía el formulario normal
+    if (!response.ok || type.startsWith("text/html") || type.startsWith("application/json")) return false;
+    await downloadResponse(response);
+    return true;
+  };
+
+  if (form && draftsUrl && window.fetch) {
+    form.addEventListener("input", scheduleDraftSync);
+    form.addEventListener("change", scheduleDraftSync);
+    form.addEventListener("click", (event) => {
+      if (event.target.closest("button:not([type='submit'])")) scheduleDraftSync();
+    });
+    form.addEventListener("submit", (event) => {
+      const submitter = event.submitter;
+      if (!submitter || !submitter.hasAttribute("formaction") || form.dataset.draftFallback === "1") return;
+      event.preventDefault();
+      const action = submitter.formAction;
+      exportFromDraft(action)
+        .catch(() => false)
+        .then((done) => {
+          if (done) return;
+          form.dataset.draftFallback = "1";
+          form.action = action;
+          prepareForm();
+          form.submit();
+          delete form.dataset.draftFallback;
+        });
     });
   }
 
@@ -2,7 +2,7 @@ import re
 from typing import Dict, List, Tuple, Optional, Any
 
 from .structure_constants import DATE_RANGE_RE, EMAIL_RE, PHONE_RE, URL_RE
-from .structure_extras import _empty_extra_entry, _has_extra_entry_content, _parse_extras
+from .structure_extras import _has_extra_entry_content, _parse_extras
 from .structure_helpers import (
     _append_highlight,
     _clean_bullet,
@@ -28,6 +28,13 @@ from .structure_helpers import (
     _parse_location,
     _split_role_company,
 )
+from .structure_decoder import (
+    _apply_editor_module_order,
+    _finalize_extra_entry,
+    _finalize_extra_sections,
+    _parse_editor_items,
+    decode_editor_form,
+)
 from .structure_types import ExtraSectionRaw
 
 # Estructura base usada por la UI y el parser
@@ -415,349 +422,110 @@ def build_text_from_structure(data: Dict) -> str:
 
 
 def structure_from_post(post_data) -> Dict:
+    # QueryDict del formulario, o dict de un cuerpo application/json con los mismos campos
+    data = decode_editor_form(post_data)
+    _ensure_minimums(data)
+    return data
+
+
+def structure_from_json(doc: Any) -> Dict:
+    """Normaliza el documento JSON del editor (borradores) igual que structure_from_post."""
+    doc = doc if isinstance(doc, dict) else {}
     data = default_structure()
-    data["basics"] = {
-        "name": post_data.get("name", "").strip(),
-        "description": post_data.get("description", "").strip(),
-        "email": post_data.get("email", "").strip(),
-        "phone": post_data.get("phone", "").strip(),
-        "linkedin": post_data.get("linkedin", "").strip(),
-        "github": post_data.get("github", "").strip(),
-        "city": post_data.get("city", "").strip(),
-        "country": post_data.get("country", "").strip(),
-    }
 
-    # Orden de módulos (Experience/Education/Skills/Extras) según UI
-    core_order_raw = (post_data.get("core_order", "") or "").strip()
-    module_order_map_raw = (post_data.get("module_order_map", "") or "").strip()
-
-    exp_roles = post_data.getlist("exp_role")
-    exp_companies = post_data.getlist("exp_company")
-    exp_starts = post_data.getlist("exp_start")
-    exp_ends = post_data.getlist("exp_end")
-    exp_cities = post_data.getlist("exp_city")
-    exp_countries = post_data.getlist("exp_country")
-    exp_techs = post_data.getlist("exp_tech")
-    exp_highlights = post_data.getlist("exp_highlights")
+    basics = _json_dict(doc.get("basics"))
+    data["basics"] = {key: _json_text(basics.get(key)) for key in data["basics"]}
+
     experience = []
-    for idx, role in enumerate(exp_roles):
-        highlights_text = exp_highlights[idx] if idx < len(exp_highlights) else ""
-        highlights = [_clean_bullet(line) for line in highlights_text.splitlines() if line.strip()]
+    for item in _json_items(doc.get("experience")):
         experience.append(
             {
-                "role": role.strip(),
-                "company": exp_companies[idx].strip() if idx < len(exp_companies) else "",
-                "start": _normalize_date_token(exp_starts[idx]) if idx < len(exp_starts) else "",
-                "end": _normalize_date_token(exp_ends[idx]) if idx < len(exp_ends) else "",
-                "city": exp_cities[idx].strip() if idx < len(exp_cities) else "",
-                "country": exp_countries[idx].strip() if idx < len(exp_countries) else "",
-                "technologies": exp_techs[idx].strip() if idx < len(exp_techs) else "",
-                "highlights": highlights,
+                "role": _json_text(item.get("role")),
+                "company": _json_text(item.get("company")),
+                "start": _normalize_date_token(_json_text(item.get("start"))),
+                "end": _normalize_date_token(_json_text(item.get("end"))),
+                "city": _json_text(item.get("city")),
+                "country": _json_text(item.get("country")),
+                "technologies": _json_text(item.get("technologies")),
+                "highlights": [
+                    _clean_bullet(line) for line in _json_lines(item.get("highlights")).splitlines() if line.strip()
+                ],
             }
         )
     data["experience"] = experience
 
-    edu_degrees = post_data.getlist("edu_degree")
-    edu_institutions = post_data.getlist("edu_institution")
-    edu_starts = post_data.getlist("edu_start")
-    edu_ends = post_data.getlist("edu_end")
-    edu_cities = post_data.getlist("edu_city")
-    edu_countries = post_data.getlist("edu_country")
-    edu_honors = post_data.getlist("edu_honors")
-    education = []
-    for idx, degree in enumerate(edu_degrees):
-        education.append(
-            {
-                "degree": degree.strip(),
-                "institution": edu_institutions[idx].strip() if idx < len(edu_institutions) else "",
-                "start": _normalize_date_token(edu_starts[idx]) if idx < len(edu_starts) else "",
-                "end": _normalize_date_token(edu_ends[idx]) if idx < len(edu_ends) else "",
-                "city": edu_cities[idx].strip() if idx < len(edu_cities) else "",
-                "country": edu_countries[idx].strip() if idx < len(edu_countries) else "",
-                "honors": edu_honors[idx].strip() if idx < len(edu_honors) else "",
-            }
-        )
-    data["education"] = education
-
-    skill_categories = post_data.getlist("skill_category")
-    skill_items = post_data.getlist("skill_items")
-    skills = []
-    for idx, category in enumerate(skill_categories):
-        items = skill_items[idx].strip() if idx < len(skill_items) else ""
-        skills.append(
-            {
-                "category": category.strip(),
-                "items": items,
-            }
-        )
-    data["skills"] = skills
-
-    extra_section_ids = post_data.getlist("extra_section_id")
-    extra_titles = post_data.getlist("extra_title")
-    extra_modes = post_data.getlist("extra_mode")
+    data["education"] = [
+        {
+            "degree": _json_text(item.get("degree")),
+            "institution": _json_text(item.get("institution")),
+            "start": _normalize_date_token(_json_text(item.get("start"))),
+            "end": _normalize_date_token(_json_text(item.get("end"))),
+            "city": _json_text(item.get("city")),
+            "country": _json_text(item.get("country")),
+            "honors": _json_text(item.get("honors")),
+        }
+        for item in _json_items(doc.get("education"))
+    ]
+    data["skills"] = [
+        {"category": _json_text(item.get("category")), "items": _json_text(item.get("items"))}
+        for item in _json_items(doc.get("skills"))
+    ]
 
     sections = []
-    id_to_index = {}
-    for idx, section_id in enumerate(extra_section_ids):
-        sid = (section_id or "").strip() or f"extra-{idx}"
-        title = extra_titles[idx].strip() if idx < len(extra_titles) else ""
-        mode = extra_modes[idx].strip() if idx < len(extra_modes) else "items"
+    seen_ids = set()
+    for idx, raw_section in enumerate(_json_items(doc.get("extra_sections"))):
+        sid = _json_text(raw_section.get("section_id")) or f"extra-{idx}"
+        if sid in seen_ids:
+            continue
+        seen_ids.add(sid)
+        mode = _json_text(raw_section.get("mode")) or "items"
         if mode not in {"items", "subtitles", "subtitle_items", "detailed"}:
             mode = "items"
-        section = {
-            "section_id": sid,
-            "title": title,
-            "mode": mode,
-            "entries": [],
-        }
+        section = {"section_id": sid, "title": _json_text(raw_section.get("title")), "mode": mode, "entries": []}
+        # Igual que en el formulario: solo cuentan los campos visibles en el modo de la seccion
+        detailed = mode == "detailed"
+        for raw_entry in _json_items(raw_section.get("entries")):
+            entry = {
+                "subtitle": "" if detailed else _json_text(raw_entry.get("subtitle")),
+                "title": _json_text(raw_entry.get("title")) if detailed else "",
+                "where": _json_text(raw_entry.get("where")) if detailed else "",
+                "tech": _json_text(raw_entry.get("tech")) if detailed else "",
+                "start": _normalize_date_token(_json_text(raw_entry.get("start"))) if detailed else "",
+                "end": _normalize_date_token(_json_text(raw_entry.get("end"))) if detailed else "",
+                "city": _json_text(raw_entry.get("city")) if detailed else "",
+                "country": _json_text(raw_entry.get("country")) if detailed else "",
+                "items": _parse_editor_items(_json_lines(raw_entry.get("items"))),
+            }
+            if _finalize_extra_entry(entry, mode):
+                section["entries"].append(entry)
         sections.append(section)
-        id_to_index[sid] = idx
-
-    entry_sections = post_data.getlist("extra_entry_section")
-    entry_subtitles = post_data.getlist("extra_entry_subtitle")
-    entry_titles = post_data.getlist("extra_entry_title")
-    entry_wheres = post_data.getlist("extra_entry_where")
-    entry_techs = post_data.getlist("extra_entry_tech")
-    entry_starts = post_data.getlist("extra_entry_start")
-    entry_ends = post_data.getlist("extra_entry_end")
-    entry_cities = post_data.getlist("extra_entry_city")
-    entry_countries = post_data.getlist("extra_entry_country")
-    entry_items_si = post_data.getlist("extra_entry_items_si")
-    entry_items_detailed = post_data.getlist("extra_entry_items_detailed")
-    legacy_entry_items = post_data.getlist("extra_entry_items")
-    entry_count = len(entry_sections)
-    has_mode_specific_items = bool(entry_items_si or entry_items_detailed)
-    paired_legacy_entry_items = entry_count > 0 and len(legacy_entry_items) == (entry_count * 2)
-    field_cursors = {
-        "subtitle": 0,
-        "title": 0,
-        "where": 0,
-        "tech": 0,
-        "start": 0,
-        "end": 0,
-        "city": 0,
-        "country": 0,
-        "items_si": 0,
-        "items_detailed": 0,
-    }
+    data["extra_sections"] = _finalize_extra_sections(sections)
 
-    def _entry_field_value(
-        values: List[str],
-        idx: int,
-        *,
-        entry_mode: str,
-        field_mode: str,
-        cursor_key: str,
-    ) -> str:
-        # Caso alineado por entrada (una posición por cada entry del formulario).
-        if entry_count > 0 and len(values) == entry_count:
-            return values[idx] if idx < len(values) else ""
-
-        # Caso sparse por modo (inputs ocultos deshabilitados en UI):
-        # consumir solo para entries del modo correspondiente.
-        if entry_mode != field_mode:
-            return ""
+    meta = _json_dict(doc.get("meta"))
+    _apply_editor_module_order(data, _json_text(meta.get("core_order")), _json_text(meta.get("module_order_map")))
+    _ensure_minimums(data)
+    return data
 
-        cursor = field_cursors[cursor_key]
-        value = values[cursor] if cursor < len(values) else ""
-        field_cursors[cursor_key] = cursor + 1
-        return value
-
-    def parse_items(raw_text: str) -> List[str]:
-        """Parsea items ingresados por el editor (un item por línea)."""
-        if raw_text is None:
-            return []
-        raw = str(raw_text).replace("\r\n", "\n").replace("\r", "\n")
-        items: List[str] = []
-        for line in raw.split("\n"):
-            sline = (line or "").strip()
-            if not sline:
-                continue
-            sline = re.sub(r"^[\\s•\\-–—*·]+\\s*", "", sline).strip()
-            if sline:
-                items.append(_clean_bullet(sline))
-        return items
-
-    single_section_sid = ""
-    if len(sections) == 1:
-        single_section_sid = (sections[0].get("section_id") or "").strip()
-    last_valid_sid = single_section_sid
-
-    for idx, section_id in enumerate(entry_sections):
-        sid = (section_id or "").strip()
-        if not sid and last_valid_sid:
-            sid = last_valid_sid
-        if not sid and single_section_sid:
-            sid = single_section_sid
-        if sid not in id_to_index:
-            continue
-        last_valid_sid = sid
-        section_mode = (sections[id_to_index[sid]].get("mode") or "").strip()
-        entry_mode = "detailed" if section_mode == "detailed" else "si"
-        if has_mode_specific_items:
-            if entry_mode == "detailed":
-                raw_items = _entry_field_value(
-                    entry_items_detailed,
-                    idx,
-                    entry_mode=entry_mode,
-                    field_mode="detailed",
-                    cursor_key="items_detailed",
-                )
-            else:
-                raw_items = _entry_field_value(
-                    entry_items_si,
-                    idx,
-                    entry_mode=entry_mode,
-                    field_mode="si",
-                    cursor_key="items_si",
-                )
-        elif paired_legacy_entry_items:
-            raw_primary = legacy_entry_items[idx * 2] if (idx * 2) < len(legacy_entry_items) else ""
-            raw_secondary = legacy_entry_items[(idx * 2) + 1] if ((idx * 2) + 1) < len(legacy_entry_items) else ""
-            if section_mode == "detailed":
-                raw_items = raw_primary or raw_secondary
-            else:
-                raw_items = raw_secondary or raw_primary
-        else:
-            raw_items = legacy_entry_items[idx] if idx < len(legacy_entry_items) else ""
-        entry = {
-            "subtitle": _entry_field_value(
-                entry_subtitles,
-                idx,
-                entry_mode=entry_mode,
-                field_mode="si",
-                cursor_key="subtitle",
-            ).strip(),
-            "title": _entry_field_value(
-                entry_titles,
-                idx,
-                entry_mode=entry_mode,
-                field_mode="detailed",
-                cursor_key="title",
-            ).strip(),
-            "where": _entry_field_value(
-                entry_wheres,
-                idx,
-                entry_mode=entry_mode,
-                field_mode="detailed",
-                cursor_key="where",
-            ).strip(),
-            "tech": _entry_field_value(
-                entry_techs,
-                idx,
-                entry_mode=entry_mode,
-                field_mode="detailed",
-                cursor_key="tech",
-            ).strip(),
-            "start": _normalize_date_token(
-                _entry_field_value(
-                    entry_starts,
-                    idx,
-                    entry_mode=entry_mode,
-                    field_mode="detailed",
-                    cursor_key="start",
-                )
-            ),
-            "end": _normalize_date_token(
-                _entry_field_value(
-                    entry_ends,
-                    idx,
-                    entry_mode=entry_mode,
-                    field_mode="detailed",
-                    cursor_key="end",
-                )
-            ),
-            "city": _entry_field_value(
-                entry_cities,
-                idx,
-                entry_mode=entry_mode,
-                field_mode="detailed",
-                cursor_key="city",
-            ).strip(),
-            "country": _entry_field_value(
-                entry_countries,
-                idx,
-                entry_mode=entry_mode,
-                field_mode="detailed",
-                cursor_key="country",
-            ).strip(),
-            "items": parse_items(raw_items),
-        }
 
-        # Si la sección está en modo Sub+Item y viene sin subtítulo pero con items,
-        # usamos el primer item como subtítulo (y dejamos el resto como items).
-        # Esto evita que una entrada válida se pierda al exportar.
-        if section_mode == "subtitle_items" and (not entry.get("subtitle")) and entry.get("items"):
-            entry["subtitle"] = entry["items"][0]
-            entry["items"] = entry["items"][1:]
-        if _has_extra_entry_content(entry):
-            sections[id_to_index[sid]]["entries"].append(entry)
-
-    extra_sections = []
-    for section in sections:
-        entries = [entry for entry in section["entries"] if _has_extra_entry_content(entry)]
-        if not entries and section["title"]:
-            entries = [_empty_extra_entry()]
-        section["entries"] = entries
-        if section["title"] or entries:
-            extra_sections.append(section)
-
-    data["extra_sections"] = extra_sections
-
-    # Orden final de módulos para exportación:
-    # 1) module_order_map (posición interna por módulo, generado por JS)
-    # 2) core_order (fallback)
-    # 3) módulos faltantes al final
-    available_ids: List[str] = ["experience", "education", "skills"]
-    for section in extra_sections:
-        sid = (section.get("section_id") or "").strip()
-        if sid and sid not in available_ids:
-            available_ids.append(sid)
-
-    core_order_ids: List[str] = []
-    if core_order_raw:
-        for token in [item.strip() for item in core_order_raw.split(",") if item.strip()]:
-            if token == "extras":
-                for section in extra_sections:
-                    sid = (section.get("section_id") or "").strip()
-                    if sid and sid not in core_order_ids:
-                        core_order_ids.append(sid)
-                continue
-            if token in available_ids and token not in core_order_ids:
-                core_order_ids.append(token)
-
-    map_order_ids: List[str] = []
-    if module_order_map_raw:
-        ranked: List[tuple[int, int, str]] = []
-        raw_pairs = [part.strip() for part in module_order_map_raw.split(",") if part.strip()]
-        for raw_idx, pair in enumerate(raw_pairs):
-            if ":" not in pair:
-                continue
-            key, order_raw = pair.split(":", 1)
-            key = key.strip()
-            if key not in available_ids:
-                continue
-            try:
-                order = int(order_raw.strip())
-            except ValueError:
-                continue
-            if order < 1:
-                continue
-            ranked.append((order, raw_idx, key))
-        ranked.sort(key=lambda item: (item[0], item[1]))
-        for _, _, key in ranked:
-            if key not in map_order_ids:
-                map_order_ids.append(key)
-
-    final_order: List[str] = []
-    for key in map_order_ids + core_order_ids + available_ids:
-        if key in available_ids and key not in final_order:
-            final_order.append(key)
-    if final_order:
-        data.setdefault("meta", {})["core_order"] = ",".join(final_order)
+def _json_dict(value: Any) -> Dict:
+    return value if isinstance(value, dict) else {}
 
-    _ensure_minimums(data)
-    return data
+
+def _json_items(value: Any) -> List[Dict]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def _json_text(value: Any) -> str:
+    if value is None or isinstance(value, (dict, list)):
+        return ""
+    return str(value).strip()
+
+
+def _json_lines(value: Any) -> str:
+    # Listas (hitos, items) o texto con saltos de linea, como llega del formulario
+    if isinstance(value, list):
+        return "\n".join(_json_text(line) for line in value)
+    return "" if value is None or isinstance(value, dict) else str(value)
 
 
 # --------------------
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import functools
+import re
+from typing import Any, Callable, Dict, List
+
+from .structure_extras import _empty_extra_entry, _has_extra_entry_content
+from .structure_helpers import _clean_bullet, _normalize_date_token
+
+# Esquema del formulario del editor. Se compila una vez (nombre de campo -> columna)
+# y el decoder arma la estructura en una sola pasada sobre el QueryDict, o sobre un
+# dict con los mismos campos (cuerpo application/json).
+TEXT = "text"
+DATE = "date"
+LINES = "lines"
+
+BASICS_FIELDS = ("name", "description", "email", "phone", "linkedin", "github", "city", "country")
+
+# Modulos repetibles: (clave en la estructura, campo del formulario, tipo).
+# El primer campo define la cantidad de filas.
+MODULE_FIELDS: Dict[str, tuple] = {
+    "experience": (
+        ("role", "exp_role", TEXT),
+        ("company", "exp_company", TEXT),
+        ("start", "exp_start", DATE),
+        ("end", "exp_end", DATE),
+        ("city", "exp_city", TEXT),
+        ("country", "exp_country", TEXT),
+        ("technologies", "exp_tech", TEXT),
+        ("highlights", "exp_highlights", LINES),
+    ),
+    "education": (
+        ("degree", "edu_degree", TEXT),
+        ("institution", "edu_institution", TEXT),
+        ("start", "edu_start", DATE),
+        ("end", "edu_end", DATE),
+        ("city", "edu_city", TEXT),
+        ("country", "edu_country", TEXT),
+        ("honors", "edu_honors", TEXT),
+    ),
+    "skills": (
+        ("category", "skill_category", TEXT),
+        ("items", "skill_items", TEXT),
+    ),
+}
+
+# Entradas de modulos extra: (clave, campo, modo en que el campo es visible, tipo).
+# En la UI los campos del otro modo quedan deshabilitados y no se envian.
+EXTRA_ENTRY_FIELDS = (
+    ("subtitle", "extra_entry_subtitle", "si", TEXT),
+    ("title", "extra_entry_title", "detailed", TEXT),
+    ("where", "extra_entry_where", "detailed", TEXT),
+    ("tech", "extra_entry_tech", "detailed", TEXT),
+    ("start", "extra_entry_start", "detailed", DATE),
+    ("end", "extra_entry_end", "detailed", DATE),
+    ("city", "extra_entry_city", "detailed", TEXT),
+    ("country", "extra_entry_country", "detailed", TEXT),
+)
+EXTRA_SECTION_FIELDS = ("extra_section_id", "extra_title", "extra_mode")
+EXTRA_ITEMS_FIELDS = ("extra_entry_section", "extra_entry_items_si", "extra_entry_items_detailed", "extra_entry_items")
+ORDER_FIELDS = ("core_order", "module_order_map")
+EXTRA_MODES = {"items", "subtitles", "subtitle_items", "detailed"}
+
+_ITEM_PREFIX_RE = re.compile(r"^[\\s•\\-–—*·]+\\s*")
+
+
+def _highlight_lines(text: str) -> List[str]:
+    return [_clean_bullet(line) for line in text.splitlines() if line.strip()]
+
+
+# Conversion y valor por defecto (campo ausente) por tipo
+_DATE = functools.lru_cache(maxsize=2048)(_normalize_date_token)
+_CONVERTERS: Dict[str, Callable[[str], Any]] = {TEXT: str.strip, DATE: _DATE, LINES: _highlight_lines}
+_DEFAULTS: Dict[str, Callable[[], Any]] = {TEXT: str, DATE: str, LINES: list}
+
+
+def _compile_schema():
+    slots: Dict[str, int] = {}
+
+    def slot(name: str) -> int:
+        return slots.setdefault(name, len(slots))
+
+    for name in BASICS_FIELDS + ORDER_FIELDS + EXTRA_SECTION_FIELDS + EXTRA_ITEMS_FIELDS:
+        slot(name)
+    modules = {
+        module: tuple((key, slot(name), _CONVERTERS[kind], _DEFAULTS[kind]) for key, name, kind in fields)
+        for module, fields in MODULE_FIELDS.items()
+    }
+    extra_fields = tuple(
+        (key, slot(name), mode, _CONVERTERS[kind]) for key, name, mode, kind in EXTRA_ENTRY_FIELDS
+    )
+    return slots, modules, extra_fields
+
+
+_SLOTS, _MODULES, _EXTRA_FIELDS = _compile_schema()
+_NO_VALUES: List[str] = []
+
+
+def json_form_values(value: Any) -> List[str]:
+    # Cuerpo JSON: listas o valores sueltos, igual que getlist()
+    if isinstance(value, list):
+        return ["" if item is None else str(item) for item in value]
+    return ["" if value is None else str(value)]
+
+
+def _collect_columns(post_data) -> List[List[str]]:
+    columns = [_NO_VALUES] * len(_SLOTS)
+    if hasattr(post_data, "lists"):
+        for name, values in post_data.lists():
+            index = _SLOTS.get(name)
+            if index is not None:
+                columns[index] = values
+    else:
+        for name, value in (post_data or {}).items():
+            index = _SLOTS.get(name)
+            if index is not None:
+                columns[index] = json_form_values(value)
+    return columns
+
+
+def _last(columns: List[List[str]], name: str) -> str:
+    # Igual que QueryDict.get(): el ultimo valor enviado
+    values = columns[_SLOTS[name]]
+    return values[-1] if values else ""
+
+
+def _decode_rows(columns: List[List[str]], fields: tuple) -> List[Dict]:
+    rows = []
+    bound = [(key, columns[index], convert, default) for key, index, convert, default in fields]
+    for idx in range(len(bound[0][1])):
+        row = {}
+        for key, values, convert, default in bound:
+            row[key] = convert(values[idx]) if idx < len(values) else default()
+        rows.append(row)
+    return rows
+
+
+def decode_editor_form(post_data) -> Dict:
+    """Estructura del editor desde el formulario (QueryDict) o un dict JSON con los mismos campos.
+
+    No aplica los minimos por modulo (los agrega structure_from_post).
+    """
+    columns = _collect_columns(post_data)
+    data: Dict[str, Any] = {
+        "meta": {"core_order": "experience,education,skills"},
+        "basics": {key: _last(columns, key).strip() for key in BASICS_FIELDS},
+    }
+    for module, fields in _MODULES.items():
+        data[module] = _decode_rows(columns, fields)
+    data["extra_sections"] = _decode_extra_sections(columns)
+    _apply_editor_module_order(data, _last(columns, "core_order").strip(), _last(columns, "module_order_map").strip())
+    return data
+
+
+def _decode_extra_sections(columns: List[List[str]]) -> List[Dict]:
+    section_ids = columns[_SLOTS["extra_section_id"]]
+    titles = columns[_SLOTS["extra_title"]]
+    modes = columns[_SLOTS["extra_mode"]]
+
+    sections = []
+    id_to_index = {}
+    for idx, section_id in enumerate(section_ids):
+        sid = (section_id or "").strip() or f"extra-{idx}"
+        mode = modes[idx].strip() if idx < len(modes) else "items"
+        sections.append(
+            {
+                "section_id": sid,
+                "title": titles[idx].strip() if idx < len(titles) else "",
+                "mode": mode if mode in EXTRA_MODES else "items",
+                "entries": [],
+            }
+        )
+        id_to_index[sid] = idx
+
+    entry_sections = columns[_SLOTS["extra_entry_section"]]
+    entry_count = len(entry_sections)
+    if not entry_count:
+        return _finalize_extra_sections(sections)
+
+    items_si = columns[_SLOTS["extra_entry_items_si"]]
+    items_detailed = columns[_SLOTS["extra_entry_items_detailed"]]
+    legacy_items = columns[_SLOTS["extra_entry_items"]]
+    has_mode_specific_items = bool(items_si or items_detailed)
+    paired_legacy_items = len(legacy_items) == entry_count * 2
+
+    # Cada campo llega alineado (un valor por entrada) o disperso (solo las entradas
+    # del modo en que es visible): en ese caso se consume con un cursor propio
+    aligned_fields = []
+    sparse_fields = []
+    for key, index, mode, convert in _EXTRA_FIELDS:
+        values = columns[index]
+        if len(values) == entry_count:
+            aligned_fields.append((key, values, convert))
+        else:
+            sparse_fields.append([key, values, mode, convert, 0])
+    sparse_items = {"si": [items_si, 0], "detailed": [items_detailed, 0]}
+
+    def take_items(idx: int, entry_mode: str) -> str:
+        values, cursor = sparse_items[entry_mode]
+        if len(values) == entry_count:
+            return values[idx]
+        sparse_items[entry_mode][1] = cursor + 1
+        return values[cursor] if cursor < len(values) else ""
+
+    single_section_sid = (sections[0].get("section_id") or "").strip() if len(sections) == 1 else ""
+    last_valid_sid = single_section_sid
+
+    for idx, section_id in enumerate(entry_sections):
+        sid = (section_id or "").strip()
+        if not sid and last_valid_sid:
+            sid = last_valid_sid
+        if not sid and single_section_sid:
+            sid = single_section_sid
+        if sid not in id_to_index:
+            continue
+        last_valid_sid = sid
+        section = sections[id_to_index[sid]]
+        section_mode = (section.get("mode") or "").strip()
+        entry_mode = "detailed" if section_mode == "detailed" else "si"
+        if has_mode_specific_items:
+            raw_items = take_items(idx, entry_mode)
+        elif paired_legacy_items:
+            raw_primary = legacy_items[idx * 2]
+            raw_secondary = legacy_items[(idx * 2) + 1]
+            if section_mode == "detailed":
+                raw_items = raw_primary or raw_secondary
+            else:
+                raw_items = raw_secondary or raw_primary
+        else:
+            raw_items = legacy_items[idx] if idx < len(legacy_items) else ""
+
+        entry = {key: convert(values[idx]) for key, values, convert in aligned_fields}
+        for field in sparse_fields:
+            key, values, field_mode, convert, cursor = field
+            if field_mode != entry_mode or cursor >= len(values):
+                entry[key] = ""
+            else:
+                entry[key] = convert(values[cursor])
+            if field_mode == entry_mode:
+                field[4] = cursor + 1
+        entry["items"] = _parse_editor_items(raw_items)
+        if _finalize_extra_entry(entry, section_mode):
+            section["entries"].append(entry)
+
+    return _finalize_extra_sections(sections)
+
+
+def _parse_editor_items(raw_text: str) -> List[str]:
+    """Parsea items ingresados por el editor (un item por línea)."""
+    if raw_text is None:
+        return []
+    raw = str(raw_text).replace("\r\n", "\n").replace("\r", "\n")
+    items: List[str] = []
+    for line in raw.split("\n"):
+        sline = (line or "").strip()
+        if not sline:
+            continue
+        sline = _ITEM_PREFIX_RE.sub("", sline).strip()
+        if sline:
+            items.append(_clean_bullet(sline))
+    return items
+
+
+def _finalize_extra_entry(entry: Dict, section_mode: str) -> bool:
+    # Si la sección está en modo Sub+Item y viene sin subtítulo pero con items,
+    # usamos el primer item como subtítulo (y dejamos el resto como items).
+    # Esto evita que una entrada válida se pierda al exportar.
+    if section_mode == "subtitle_items" and (not entry.get("subtitle")) and entry.get("items"):
+        entry["subtitle"] = entry["items"][0]
+        entry["items"] = entry["items"][1:]
+    return _has_extra_entry_content(entry)
+
+
+def _finalize_extra_sections(sections: List[Dict]) -> List[Dict]:
+    extra_sections = []
+    for section in sections:
+        entries = [entry for entry in section["entries"] if _has_extra_entry_content(entry)]
+        if not entries and section["title"]:
+            entries = [_empty_extra_entry()]
+        section["entries"] = entries
+        if section["title"] or entries:
+            extra_sections.append(section)
+    return extra_sections
+
+
+def _apply_editor_module_order(data: Dict, core_order_raw: str, module_order_map_raw: str) -> None:
+    extra_sections = data.get("extra_sections") or []
+    # Orden final de módulos para exportación:
+    # 1) module_order_map (posición interna por módulo, generado por JS)
+    # 2) core_order (fallback)
+    # 3) módulos faltantes al final
+    available_ids: List[str] = ["experience", "education", "skills"]
+    for section in extra_sections:
+        sid = (section.get("section_id") or "").strip()
+        if sid and sid not in available_ids:
+            available_ids.append(sid)
+
+    core_order_ids: List[str] = []
+    if core_order_raw:
+        for token in [item.strip() for item in core_order_raw.split(",") if item.strip()]:
+            if token == "extras":
+                for section in extra_sections:
+                    sid = (section.get("section_id") or "").strip()
+                    if sid and sid not in core_order_ids:
+                        core_order_ids.append(sid)
+                continue
+            if token in available_ids and token not in core_order_ids:
+                core_order_ids.append(token)
+
+    map_order_ids: List[str] = []
+    if module_order_map_raw:
+        ranked: List[tuple[int, int, str]] = []
+        raw_pairs = [part.strip() for part in module_order_map_raw.split(",") if part.strip()]
+        for raw_idx, pair in enumerate(raw_pairs):
+            if ":" not in pair:
+                continue
+            key, order_raw = pair.split(":", 1)
+            key = key.strip()
+            if key not in available_ids:
+                continue
+            try:
+                order = int(order_raw.strip())
+            except ValueError:
+                continue
+            if order < 1:
+                continue
+            ranked.append((order, raw_idx, key))
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        for _, _, key in ranked:
+            if key not in map_order_ids:
+                map_order_ids.append(key)
+
+    final_order: List[str] = []
+    for key in map_order_ids + core_order_ids + available_ids:
+        if key in available_ids and key not in final_order:
+            final_order.append(key)
+    if final_order:
+        data.setdefault("meta", {})["core_order"] = ",".join(final_order)
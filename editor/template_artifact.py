@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any
+
+# Artefacto precompilado de una plantilla (manage.py compile_template), guardado junto
+# al .docx: mapa de filas, filas modelo (XML), listas de habilidades y partes ya
+# comprimidas. El render lo usa si coincide el sha256 de la plantilla; si no, la analiza
+# como siempre al cargarla.
+ARTIFACT_SUFFIX = ".compiled"
+ARTIFACT_FORMAT = 2
+_MANIFEST = "manifest.json"
+_ROW_GROUPS = ("experience_rows", "education_rows")
+
+
+def artifact_path(template_path: Path | str) -> Path:
+    path = Path(template_path)
+    return path.with_name(path.name + ARTIFACT_SUFFIX)
+
+
+def compile_template(template_path: Path | str) -> Path:
+    # Analiza la plantilla y escribe el artefacto; ValueError si la plantilla no sirve
+    from .docx_template import _load_template, template_slots
+    from .docx_writer import template_members
+
+    _, template_bytes, template_key = _load_template(template_path)
+    slots = template_slots(template_key, template_bytes)
+    members = template_members(template_key, template_bytes)
+
+    manifest: dict[str, Any] = {
+        "format": ARTIFACT_FORMAT,
+        "template_sha256": template_key,
+        "slots": {},
+        "members": [],
+    }
+    rows: dict[str, bytes] = {}
+    for key, value in slots.items():
+        if key not in _ROW_GROUPS:
+            manifest["slots"][key] = value
+            continue
+        if value is None:
+            manifest["slots"][key] = None
+            continue
+        group: dict[str, str | None] = {}
+        for row_key, tr in value.items():
+            entry = None
+            if tr is not None:
+                entry = f"rows/{key}/{row_key}.xml"
+                rows[entry] = _xml_bytes(tr)
+            group[row_key] = entry
+        manifest["slots"][key] = group
+
+    data: dict[str, bytes] = {}
+    for idx, (name, (sha, deflated, crc, size)) in enumerate(members.items()):
+        entry = f"members/{idx}"
+        manifest["members"].append([name, sha.hex(), crc, size, entry])
+        data[entry] = deflated
+
+    target = artifact_path(template_path)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".compile-", suffix=ARTIFACT_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as handle, zipfile.ZipFile(handle, "w") as archive:
+            _write_entry(archive, _MANIFEST, json.dumps(manifest, indent=1).encode("utf-8"), zipfile.ZIP_DEFLATED)
+            for entry, blob in rows.items():
+                _write_entry(archive, entry, blob, zipfile.ZIP_DEFLATED)
+            # Las partes ya van comprimidas (deflate crudo): se guardan tal cual
+            for entry, blob in data.items():
+                _write_entry(archive, entry, blob, zipfile.ZIP_STORED)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return target
+
+
+def artifact_status(template_path: Path | str, template_key: str) -> str:
+    # "missing", "stale" (de otra version de la plantilla o formato), "invalid" u "ok"
+    path = artifact_path(template_path)
+    if not path.is_file():
+        return "missing"
+    try:
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read(_MANIFEST))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return "invalid"
+    if manifest.get("format") != ARTIFACT_FORMAT or manifest.get("template_sha256") != template_key:
+        return "stale"
+    return "ok"
+
+
+def load_artifact(template_path: Path | str, template_key: str) -> tuple[dict[str, Any], dict] | None:
+    # (slots, members) del artefacto, o None si falta o no corresponde a esta plantilla
+    from docx.oxml import parse_xml
+
+    path = artifact_path(template_path)
+    if not path.is_file():
+        return None
+    try:
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read(_MANIFEST))
+            if manifest.get("format") != ARTIFACT_FORMAT or manifest.get("template_sha256") != template_key:
+                return None
+            slots: dict[str, Any] = {}
+            for key, value in manifest["slots"].items():
+                if key in _ROW_GROUPS and value is not None:
+                    value = {
+                        row_key: parse_xml(archive.read(entry)) if entry else None
+                        for row_key, entry in value.items()
+                    }
+                elif key == "skills_numbering":
+                    value = {role: tuple(pair) if pair else None for role, pair in value.items()}
+                elif key == "skills_numbering_fixed":
+                    value = [tuple(pair) for pair in value]
+                slots[key] = value
+            members = {
+                name: (bytes.fromhex(sha), archive.read(entry), crc, size)
+                for name, sha, crc, size, entry in manifest["members"]
+            }
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    return slots, members
+
+
+def _write_entry(archive: zipfile.ZipFile, name: str, blob: bytes, compress_type: int) -> None:
+    # Fecha fija: la misma plantilla produce el mismo artefacto
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = compress_type
+    archive.writestr(info, blob)
+
+
+def _xml_bytes(element) -> bytes:
+    from lxml import etree
+
+    return etree.tostring(element, encoding="UTF-8")
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+# Plantillas de la casa: la principal (CV_TEMPLATE_PATH o templates/cv_template.docx)
+# y cada .docx de CV_TEMPLATES_DIR, registrado con el nombre del archivo sin extension.
+# El mapa de filas de cada una se calcula al cargarla (docx_template.template_slots)
+# y se recalcula solo si el archivo cambia en disco.
+DEFAULT_TEMPLATE = "default"
+NAME_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Listado por carpeta, se vuelve a leer si cambia el mtime (archivos agregados/quitados)
+_DIR_CACHE: dict[str, tuple[int, dict[str, Path]]] = {}
+_DIR_LOCK = threading.Lock()
+
+
+def _setting_path(name: str) -> Path | None:
+    value = str(getattr(settings, name, "") or "").strip()
+    if not value:
+        return None
+    path = Path(value)
+    if not path.is_absolute():
+        path = Path(settings.BASE_DIR) / path
+    return path
+
+
+def default_template_path() -> Path | None:
+    # Ruta de plantilla definida por .env o default
+    candidate = _setting_path("CV_TEMPLATE_PATH")
+    if candidate is not None and candidate.is_file():
+        return candidate
+
+    candidate = Path(settings.BASE_DIR) / "templates" / "cv_template.docx"
+    if candidate.is_file():
+        return candidate
+    return None
+
+
+def _dir_templates() -> dict[str, Path]:
+    directory = _setting_path("CV_TEMPLATES_DIR")
+    if directory is None:
+        return {}
+    try:
+        mtime = directory.stat().st_mtime_ns
+    except OSError:
+        return {}
+    key = str(directory)
+    cached = _DIR_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with _DIR_LOCK:
+        found = {
+            path.stem: path
+            for path in sorted(directory.glob("*.docx"))
+            # ~$ son archivos de bloqueo de Word
+            if path.is_file() and not path.name.startswith("~$") and NAME_RE.match(path.stem)
+        }
+        _DIR_CACHE[key] = (mtime, found)
+    return found
+
+
+def template_paths() -> dict[str, Path]:
+    paths: dict[str, Path] = {}
+    default = default_template_path()
+    if default is not None:
+        paths[DEFAULT_TEMPLATE] = default
+    for name, path in _dir_templates().items():
+        paths.setdefault(name, path)
+    return paths
+
+
+def template_names() -> list[str]:
+    return list(template_paths())
+
+
+def resolve(name: str | None = None) -> Path | None:
+    # Nombre vacio = plantilla principal; nombre desconocido = None
+    name = (name or "").strip() or DEFAULT_TEMPLATE
+    path = template_paths().get(name)
+    if path is None or not path.is_file():
+        return None
+    return path
+
+
+def preload_all() -> dict[str, str]:
+    # Bytes, partes comprimidas y mapa de filas de cada plantilla; una plantilla
+    # invalida no impide cargar las demas (se devuelve el error por nombre)
+    from .docx_template import preload_template
+
+    errors: dict[str, str] = {}
+    for name, path in template_paths().items():
+        try:
+            preload_template(path)
+        except Exception as exc:
+            errors[name] = str(exc).strip() or exc.__class__.__name__
+    return errors
@@ -0,0 +1,218 @@
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+
+from editor import admission, export_cache, metrics, pdf_convert
+from editor.checks import check_admission
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_pdf_bytes, cv_to_querydict
+
+ONE_SLOT = {operation: 1 for operation in admission.OPERATIONS}
+
+
+def _post_data(**extra) -> dict:
+    data = dict(cv_to_querydict(generate_cv(0, "small", "es")).lists())
+    data.update(extra)
+    return data
+
+
+def _use_admission_dir(test: SimpleTestCase, shared: bool) -> str:
+    # Directorio propio por test (o ninguno: cupos solo del proceso)
+    directory = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+    settings_override = override_settings(ADMISSION_DIR=directory if shared else "")
+    settings_override.enable()
+    test.addCleanup(settings_override.disable)
+    return directory
+
+
+def _admit_in_thread(operation: str, release: threading.Event, outcome: list) -> threading.Thread:
+    def run() -> None:
+        try:
+            with admission.admit(operation):
+                outcome.append("admitted")
+                release.wait(5)
+        except admission.Overloaded as exc:
+            outcome.append(exc)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+@override_settings(ADMISSION_LIMITS=ONE_SLOT, ADMISSION_QUEUE_SIZE=1, ADMISSION_WAIT_SECONDS=5, ADMISSION_RETRY_AFTER=7)
+class AdmissionControllerTests(SimpleTestCase):
+    shared = False
+
+    def setUp(self) -> None:
+        self.directory = _use_admission_dir(self, self.shared)
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def _wait_for_queue(self, operation: str) -> None:
+        budget = admission._BUDGETS[operation]
+        for _ in range(500):
+            with budget.condition:
+                if budget.waiting:
+                    return
+            threading.Event().wait(0.01)
+        self.fail("nadie entro a la cola")
+
+    def _wait_until_admitted(self, holder: list) -> None:
+        for _ in range(500):
+            if holder:
+                return
+            threading.Event().wait(0.01)
+        self.fail("el primer request no obtuvo cupo")
+
+    def test_bounded_queue_rejects_fast_and_waiter_runs_after_release(self) -> None:
+        release = threading.Event()
+        holder, waiter = [], []
+        threads = [_admit_in_thread("convert_pdf", release, holder)]
+        self._wait_until_admitted(holder)
+        threads.append(_admit_in_thread("convert_pdf", release, waiter))
+        self._wait_for_queue("convert_pdf")
+
+        # Cupo ocupado y cola llena: rechazo inmediato, sin esperar
+        with self.assertRaises(admission.Overloaded) as ctx:
+            with admission.admit("convert_pdf"):
+                pass
+        self.assertEqual(ctx.exception.retry_after, 7)
+        # Otra clase tiene su propio cupo
+        with admission.admit("parse_docx"):
+            pass
+
+        body = metrics.render_text()
+        self.assertIn('trufadocs_admission_queue_depth{operation="convert_pdf"} 1', body)
+        self.assertIn('trufadocs_admission_in_flight{operation="convert_pdf"} 1', body)
+        self.assertIn('trufadocs_admission_rejected_total{operation="convert_pdf",reason="queue_full"} 1', body)
+
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual((holder, waiter), (["admitted"], ["admitted"]))
+        body = metrics.render_text()
+        self.assertIn('trufadocs_admission_queue_depth{operation="convert_pdf"} 0', body)
+        self.assertIn('trufadocs_admission_wait_seconds_count{operation="convert_pdf"} 2', body)
+
+    @override_settings(ADMISSION_WAIT_SECONDS=0.05)
+    def test_wait_is_bounded_by_timeout(self) -> None:
+        release = threading.Event()
+        holder: list = []
+        thread = _admit_in_thread("render_docx", release, holder)
+        self._wait_until_admitted(holder)
+        try:
+            with self.assertRaises(admission.Overloaded):
+                with admission.admit("render_docx"):
+                    pass
+        finally:
+            release.set()
+            thread.join(5)
+        self.assertIn(
+            'trufadocs_admission_rejected_total{operation="render_docx",reason="timeout"} 1', metrics.render_text()
+        )
+
+
+@unittest.skipIf(admission.fcntl is None, "fcntl no disponible")
+class SharedAdmissionControllerTests(AdmissionControllerTests):
+    # Mismos casos con los cupos en lock files compartidos entre workers
+    shared = True
+
+    def test_slot_held_by_another_worker_counts(self) -> None:
+        worker = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import fcntl, sys, time\n"
+                "handle = open(sys.argv[1], 'a+b')\n"
+                "fcntl.flock(handle, fcntl.LOCK_EX)\n"
+                "print('ok', flush=True)\n"
+                "time.sleep(30)",
+                f"{self.directory}/parse_pdf-slot-0.lock",
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.addCleanup(worker.wait)
+        self.addCleanup(worker.kill)
+        self.assertEqual(worker.stdout.readline().strip(), "ok")
+        with override_settings(ADMISSION_QUEUE_SIZE=0):
+            with self.assertRaises(admission.Overloaded):
+                with admission.admit("parse_pdf"):
+                    pass
+            # Si el worker muere, el sistema libera su cupo
+            worker.kill()
+            worker.wait()
+            with admission.admit("parse_pdf"):
+                pass
+
+    def test_check_warns_when_budgets_are_per_process(self) -> None:
+        self.assertEqual(check_admission(), [])
+        with override_settings(ADMISSION_DIR=""):
+            self.assertEqual([message.id for message in check_admission()], ["editor.W003"])
+        with override_settings(ADMISSION_DIR="", ADMISSION_LIMITS={}):
+            self.assertEqual(check_admission(), [])
+
+
+@override_settings(ADMISSION_LIMITS=ONE_SLOT, ADMISSION_QUEUE_SIZE=0, ADMISSION_RETRY_AFTER=3)
+class AdmissionViewsTests(SimpleTestCase):
+    def setUp(self) -> None:
+        _use_admission_dir(self, shared=admission.fcntl is not None)
+        export_cache.clear()
+        self.addCleanup(export_cache.clear)
+
+    def test_busy_export_returns_503_with_form_kept(self) -> None:
+        with admission.admit("render_docx"):
+            response = self.client.post("/text/export/docx/", _post_data(filename="mi_cv"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "3")
+        html = response.content.decode("utf-8")
+        self.assertIn("El servidor esta ocupado", html)
+        self.assertIn('value="mi_cv"', html)
+
+        # Con cupo libre la misma exportacion funciona
+        self.assertEqual(self.client.post("/text/export/docx/", _post_data()).status_code, 200)
+
+    def test_busy_upload_and_batch(self) -> None:
+        pdf_bytes = cv_to_pdf_bytes(generate_cv(0, "small", "en"))
+        with admission.admit("parse_pdf"):
+            response = self.client.post("/upload/", {"file": SimpleUploadedFile("cv.pdf", pdf_bytes)})
+        self.assertEqual(response.status_code, 503)
+
+        with admission.admit("render_docx"):
+            variants = json.dumps([{"ui_lang": "es", "doc_font": "Arial", "format": "docx"}])
+            response = self.client.post("/text/export/batch/", _post_data(ui_lang="en", variants=variants))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "3")
+        self.assertEqual(response.json(), {"error": "The server is busy. Please try again in 3 seconds."})
+
+    @override_settings(PDF_CONVERTER_WORKERS=3, ADMISSION_QUEUE_SIZE=3)
+    def test_batch_conversions_each_take_a_slot(self) -> None:
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def fake_convert(docx_bytes: bytes):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.05)
+            with lock:
+                running[0] -= 1
+            return b"%PDF-fake", None
+
+        variants = json.dumps([{"ui_lang": lang, "format": "pdf"} for lang in ("es", "en")] + [
+            {"ui_lang": "es", "doc_font": "Arial", "format": "pdf"}
+        ])
+        with mock.patch.object(pdf_convert, "convert_docx_bytes_to_pdf", side_effect=fake_convert):
+            response = self.client.post("/text/export/batch/", _post_data(variants=variants))
+        self.assertEqual(response.status_code, 200)
+        # Tres hilos en el pool pero un solo cupo de convert_pdf
+        self.assertEqual(peak[0], 1)
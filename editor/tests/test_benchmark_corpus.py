@@ -0,0 +1,58 @@
+import io
+
+from django.test import SimpleTestCase
+
+from editor import docx_template, metrics, template_registry
+from editor.benchmarks import SIZES, compare_to_baseline, generate_cv, run_benchmarks
+from editor.benchmarks.corpus import cv_to_pdf_bytes, cv_to_querydict
+from editor.pdf_parse import parse_pdf_to_structure
+from editor.structure import structure_from_post
+
+
+class BenchmarkCorpusTests(SimpleTestCase):
+    def test_corpus_is_deterministic_and_scales_with_size(self):
+        self.assertEqual(generate_cv(7, "large", "en").structure, generate_cv(7, "large", "en").structure)
+        self.assertNotEqual(generate_cv(7, "large", "en").structure, generate_cv(8, "large", "en").structure)
+
+        small = generate_cv(1, "small", "es").structure
+        xlarge = generate_cv(1, "xlarge", "es").structure
+        self.assertEqual(len(small["experience"]), SIZES["small"]["experience"])
+        self.assertEqual(len(xlarge["experience"]), SIZES["xlarge"]["experience"])
+
+    def test_variants_round_trip_through_parsers(self):
+        cv = generate_cv(3, "medium", "es")
+
+        from_post = structure_from_post(cv_to_querydict(cv))
+        self.assertEqual(from_post["experience"][1], cv.structure["experience"][1])
+        self.assertEqual(len(from_post["experience"]), len(cv.structure["experience"]))
+        self.assertEqual(len(from_post["extra_sections"]), len(cv.structure["extra_sections"]))
+
+        from_pdf, error = parse_pdf_to_structure(io.BytesIO(cv_to_pdf_bytes(cv)))
+        self.assertIsNone(error)
+        self.assertEqual(len(from_pdf["experience"]), len(cv.structure["experience"]))
+        self.assertEqual(from_pdf["basics"]["email"], cv.structure["basics"]["email"])
+
+    def test_compare_to_baseline_ignores_noise(self):
+        baseline = {"cases": {"a": {"median_ms": 10.0}, "b": {"median_ms": 100.0}}}
+        results = {"cases": {"a": {"median_ms": 11.5}, "b": {"median_ms": 150.0}}}
+
+        regressions = compare_to_baseline(results, baseline, threshold=0.1)
+
+        self.assertEqual([item["case"] for item in regressions], ["b"])
+
+    def test_template_renders_are_timed_without_content_cache(self):
+        docx_template.clear_content_cache()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        results = run_benchmarks(
+            sizes=["small"],
+            langs=["es"],
+            stages=["render_from_template", "render_cached"],
+            repeat=2,
+            template_path=template_registry.resolve(),
+        )
+        self.assertEqual(set(results["cases"]), {"render_from_template/small/es", "render_cached/small/es"})
+        # Calentamiento + 2 muestras sin cache; render_cached: calentamiento y muestras reutilizan el contenido
+        body = metrics.render_text()
+        self.assertIn('trufadocs_render_content_cache_total{result="miss"} 3', body)
+        self.assertIn('trufadocs_render_content_cache_total{result="hit"} 3', body)
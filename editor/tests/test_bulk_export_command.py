@@ -0,0 +1,90 @@
+import io
+import json
+import tempfile
+import zipfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from docx import Document as DocxDocument
+
+
+def _structure(name: str) -> dict:
+    return {
+        "basics": {
+            "name": name,
+            "description": "Perfil",
+            "email": "",
+            "phone": "",
+            "linkedin": "",
+            "github": "",
+            "country": "",
+            "city": "",
+        },
+        "experience": [
+            {
+                "role": "Developer",
+                "company": "ACME",
+                "technologies": "",
+                "start": "2020-01",
+                "end": "2021-01",
+                "city": "",
+                "country": "",
+                "highlights": ["Hito"],
+            }
+        ],
+        "education": [],
+        "skills": [{"category": "Herramientas", "items": "Git"}],
+        "extra_sections": [],
+        "meta": {"core_order": "experience,education,skills"},
+    }
+
+
+class BulkExportCommandTests(SimpleTestCase):
+    def test_bulk_export_writes_one_docx_per_line_into_zip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = Path(tmp_dir)
+            input_path = tmp / "input.jsonl"
+            input_path.write_text(
+                "\n".join(json.dumps(_structure(name)) for name in ["Ana Uno", "Beto Dos", "Carla Tres"]),
+                encoding="utf-8",
+            )
+            zip_path = tmp / "out.zip"
+            stdout = io.StringIO()
+
+            call_command(
+                "bulk_export",
+                str(input_path),
+                "--zip",
+                str(zip_path),
+                "--workers",
+                "2",
+                stdout=stdout,
+            )
+
+            with zipfile.ZipFile(zip_path) as zf:
+                names = sorted(zf.namelist())
+                self.assertEqual(names, ["00000-ana-uno.docx", "00001-beto-dos.docx", "00002-carla-tres.docx"])
+                doc = DocxDocument(io.BytesIO(zf.read("00001-beto-dos.docx")))
+            all_text = " ".join(cell.text for row in doc.tables[0].rows for cell in row.cells)
+            self.assertIn("Beto Dos", all_text)
+            self.assertIn("docs/s", stdout.getvalue())
+
+    def test_bulk_export_writes_into_output_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = Path(tmp_dir)
+            input_path = tmp / "input.jsonl"
+            input_path.write_text(json.dumps(_structure("Ana Uno")) + "\n\n", encoding="utf-8")
+            output_dir = tmp / "out"
+
+            call_command(
+                "bulk_export",
+                str(input_path),
+                "--output-dir",
+                str(output_dir),
+                "--workers",
+                "1",
+                stdout=io.StringIO(),
+            )
+
+            self.assertEqual([path.name for path in output_dir.iterdir()], ["00000-ana-uno.docx"])
@@ -0,0 +1,104 @@
+import io
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from docx import Document
+from lxml import etree
+
+from editor import docx_template, docx_writer, template_registry
+from editor.benchmarks import generate_cv
+from editor.checks import check_templates
+from editor.template_artifact import artifact_path, artifact_status, compile_template, load_artifact
+
+
+def _forget(path: Path) -> str:
+    # Olvida todo lo cacheado de la plantilla, como un proceso nuevo
+    _, _, key = docx_template._load_template(path)
+    docx_template._TEMPLATE_BYTES_CACHE.pop(str(path.resolve()), None)
+    docx_template._TEMPLATE_SLOTS.pop(key, None)
+    docx_writer._TEMPLATE_MEMBERS.pop(key, None)
+    docx_template.clear_content_cache()
+    return key
+
+
+def _comparable(slots: dict) -> dict:
+    return {
+        key: {row: etree.tostring(tr) if tr is not None else None for row, tr in value.items()}
+        if key.endswith("_rows") and value is not None
+        else value
+        for key, value in slots.items()
+    }
+
+
+class CompileTemplateTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.addCleanup(docx_template.clear_content_cache)
+        # Copia con una fila menos: digest propio, sin caches compartidas con otros tests
+        self.path = self.tmp / "casa.docx"
+        doc = Document(str(template_registry.resolve()))
+        tr = doc.tables[0].rows[4]._tr
+        tr.getparent().remove(tr)
+        doc.save(str(self.path))
+
+    def test_renders_from_artifact_match_analysed_template(self) -> None:
+        structured = generate_cv(2, "medium", "en").structure
+        call_command("compile_template", str(self.path), stdout=io.StringIO())
+        self.assertEqual(artifact_status(self.path, docx_template.template_digest(self.path)), "ok")
+
+        key = _forget(self.path)
+        from_artifact = docx_template.render_from_template(structured, self.path, font_name="Arial")
+        compiled_slots = docx_template._TEMPLATE_SLOTS[key]
+
+        artifact_path(self.path).unlink()
+        _forget(self.path)
+        analysed = docx_template.render_from_template(structured, self.path, font_name="Arial")
+        self.assertEqual(from_artifact, analysed)
+        self.assertEqual(_comparable(compiled_slots), _comparable(docx_template._TEMPLATE_SLOTS[key]))
+
+    def test_stale_artifact_is_ignored_and_reported(self) -> None:
+        compile_template(self.path)
+        shutil.copy(template_registry.resolve(), self.path)
+        key = _forget(self.path)
+        self.assertIsNone(load_artifact(self.path, key))
+        self.assertEqual(artifact_status(self.path, key), "stale")
+        with self.assertRaises(CommandError):
+            call_command("compile_template", str(self.path), "--check", stdout=io.StringIO())
+        with override_settings(CV_TEMPLATES_DIR=str(self.tmp)):
+            self.assertEqual([message.id for message in check_templates()], ["editor.W002"])
+
+    def test_edited_template_versions_do_not_pile_up(self) -> None:
+        structured = generate_cv(0, "small", "es").structure
+        keys = []
+        for version in range(docx_template._TEMPLATE_CACHE_SIZE + 2):
+            # Cada edicion de la plantilla es un digest nuevo
+            doc = Document(str(self.path))
+            doc.add_paragraph("v" * (version + 1))
+            doc.save(str(self.path))
+            docx_template.render_from_template(structured, self.path)
+            keys.append(docx_template.template_digest(self.path))
+
+        self.assertLessEqual(len(docx_template._TEMPLATE_SLOTS), docx_template._TEMPLATE_CACHE_SIZE)
+        self.assertLessEqual(len(docx_writer._TEMPLATE_MEMBERS), docx_writer._TEMPLATE_MEMBERS_SIZE)
+        self.assertLessEqual(len(docx_template._NUMBERING_FIXUPS), docx_template._NUMBERING_FIXUPS_SIZE)
+        self.assertIn(keys[-1], docx_template._TEMPLATE_SLOTS)
+        self.assertNotIn(keys[0], docx_template._TEMPLATE_SLOTS)
+        self.assertNotIn(keys[0], docx_writer._TEMPLATE_MEMBERS)
+
+    def test_broken_template_fails_at_deploy_time(self) -> None:
+        doc = Document(str(self.path))
+        for row in doc.tables[0].rows:
+            if "HABILIDADES" in row.cells[0].text:
+                row._tr.getparent().remove(row._tr)
+        doc.save(str(self.tmp / "rota.docx"))
+
+        with self.assertRaises(CommandError):
+            call_command("compile_template", str(self.tmp / "rota.docx"), stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertFalse(artifact_path(self.tmp / "rota.docx").exists())
+        with override_settings(CV_TEMPLATES_DIR=str(self.tmp)):
+            self.assertEqual([message.id for message in check_templates()], ["editor.E001"])
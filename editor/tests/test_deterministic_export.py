@@ -0,0 +1,70 @@
+import io
+import zipfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from editor import docx_template, export_cache, pdf_convert
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_querydict
+
+
+def _post_data(**extra) -> dict:
+    data = dict(cv_to_querydict(generate_cv(0, "small", "es")).lists())
+    data.update(extra)
+    return data
+
+
+class DeterministicExportTests(SimpleTestCase):
+    def setUp(self) -> None:
+        export_cache.clear()
+        self.addCleanup(export_cache.clear)
+
+    def test_same_input_renders_identical_bytes_with_fixed_zip_metadata(self) -> None:
+        first = self.client.post("/text/export/docx/", _post_data()).getvalue()
+        export_cache.clear()
+        second = self.client.post("/text/export/docx/", _post_data()).getvalue()
+
+        self.assertEqual(first, second)
+        infos = zipfile.ZipFile(io.BytesIO(first)).infolist()
+        self.assertEqual(infos[0].filename, "[Content_Types].xml")
+        self.assertEqual({info.date_time for info in infos}, {(1980, 1, 1, 0, 0, 0)})
+
+    def test_matching_if_none_match_returns_304_without_rendering(self) -> None:
+        response = self.client.post("/text/export/docx/", _post_data())
+        etag = response["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+
+        with mock.patch.object(docx_template, "render_to_file", wraps=docx_template.render_to_file) as render:
+            cached = self.client.post("/text/export/docx/", _post_data(), HTTP_IF_NONE_MATCH=etag)
+            changed = self.client.post(
+                "/text/export/docx/",
+                _post_data(doc_font="Arial"),
+                HTTP_IF_NONE_MATCH=etag,
+            )
+
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], etag)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        render.assert_called_once()
+
+    def test_wildcard_if_none_match_does_not_skip_post_exports(self) -> None:
+        response = self.client.post("/text/export/docx/", _post_data(), HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.getvalue().startswith(b"PK"))
+
+    def test_pdf_export_uses_weak_etag(self) -> None:
+        def fake_convert(input_path):
+            output_path = input_path.with_name("documento.pdf")
+            output_path.write_bytes(b"%PDF-fake")
+            return output_path, None
+
+        with mock.patch.object(pdf_convert, "convert_docx_file_to_pdf", side_effect=fake_convert) as convert:
+            response = self.client.post("/text/export/pdf/", {"text": "Hola"})
+            again = self.client.post("/text/export/pdf/", {"text": "Hola"}, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertEqual(again.status_code, 304)
+        convert.assert_called_once()
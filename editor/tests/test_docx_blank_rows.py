@@ -0,0 +1,43 @@
+from django.test import SimpleTestCase
+from docx import Document as DocxDocument
+from docx.oxml import OxmlElement
+
+from editor.docx_template import _collapse_blank_rows, _is_blank_row, _row_has_borders
+
+
+def _table(texts: list[str]):
+    doc = DocxDocument()
+    table = doc.add_table(rows=len(texts), cols=2)
+    for row, text in zip(table.rows, texts):
+        row.cells[0].text = text
+    return table
+
+
+def _add_borders(row) -> None:
+    tc_pr = row.cells[1]._tc.get_or_add_tcPr()
+    tc_pr.append(OxmlElement("w:tcBorders"))
+
+
+class BlankRowTests(SimpleTestCase):
+    def test_blank_and_border_detection(self) -> None:
+        table = _table(["", "  \t", "Hola", ""])
+        table.rows[0].cells[0].paragraphs[0].add_run().add_break()
+        table.rows[3].cells[0].paragraphs[0].add_run()._r.append(OxmlElement("w:noBreakHyphen"))
+        _add_borders(table.rows[1])
+
+        self.assertEqual([_is_blank_row(row) for row in table.rows], [True, True, False, False])
+        self.assertEqual([_row_has_borders(row) for row in table.rows], [False, True, False, False])
+
+    def test_vertical_merge_reads_text_from_row_above(self) -> None:
+        table = _table(["Arriba", ""])
+        table.cell(0, 0).merge(table.cell(1, 0))
+        self.assertTrue(table.rows[1]._tr.tc_lst[0].vMerge)
+        self.assertFalse(_is_blank_row(table.rows[1]))
+
+    def test_collapse_keeps_one_spacer_between_blocks(self) -> None:
+        table = _table(["A", "", "", "", "B", "", "", "C", ""])
+        _add_borders(table.rows[5])
+        _collapse_blank_rows(table)
+        texts = [row.cells[0].text for row in table.rows]
+        # La fila vacia con bordes no cuenta como separador
+        self.assertEqual(texts, ["A", "", "B", "", "", "C", ""])
@@ -0,0 +1,51 @@
+import io
+import zipfile
+
+from django.test import SimpleTestCase
+from lxml import etree
+
+from editor.benchmarks import generate_cv
+from editor.docx_template import render_from_template
+from editor.views import _template_path
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+NS = {"w": W_NS, "a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+
+
+def _parts(font_name: str | None) -> dict[str, etree._Element]:
+    structured = generate_cv(0, "medium", "es").structure
+    data = render_from_template(structured, _template_path(), font_name=font_name)
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = ("word/document.xml", "word/styles.xml", "word/numbering.xml", "word/theme/theme1.xml")
+        return {name: etree.fromstring(archive.read(name)) for name in names if name in archive.namelist()}
+
+
+def _fonts(root) -> set[str]:
+    return {value for value in root.xpath("//w:rFonts/@w:ascii | //w:rFonts/@w:hAnsi", namespaces=NS)}
+
+
+class DocxFontTests(SimpleTestCase):
+    def test_font_is_applied_to_styles_defaults_theme_and_explicit_runs(self) -> None:
+        parts = _parts("Arial Narrow")
+        self.assertEqual(_fonts(parts["word/document.xml"]), {"Arial Narrow"})
+        self.assertEqual(_fonts(parts["word/styles.xml"]), {"Arial Narrow"})
+        defaults = parts["word/styles.xml"].xpath("w:docDefaults/w:rPrDefault/w:rPr/w:rFonts", namespaces=NS)
+        self.assertEqual(defaults[0].get(f"{{{W_NS}}}ascii"), "Arial Narrow")
+        self.assertFalse(parts["word/styles.xml"].xpath("//w:rFonts/@w:asciiTheme", namespaces=NS))
+
+        theme = parts["word/theme/theme1.xml"]
+        typefaces = theme.xpath("//a:fontScheme/*/a:latin/@typeface", namespaces=NS)
+        self.assertEqual(set(typefaces), {"Arial Narrow"})
+
+    def test_numbering_fonts_are_kept(self) -> None:
+        plain = _parts(None)
+        styled = _parts("Arial Narrow")
+        self.assertEqual(
+            etree.tostring(plain["word/numbering.xml"]), etree.tostring(styled["word/numbering.xml"])
+        )
+        self.assertNotIn("Arial Narrow", _fonts(styled["word/numbering.xml"]))
+
+    def test_without_font_template_fonts_are_untouched(self) -> None:
+        fonts = _fonts(_parts(None)["word/document.xml"])
+        self.assertNotIn("Arial Narrow", fonts)
+        self.assertGreater(len(fonts), 1)
@@ -0,0 +1,54 @@
+import io
+
+from django.test import SimpleTestCase
+from docx import Document
+
+from editor import docx_template
+from editor.benchmarks import generate_cv
+from editor.docx_template import render_from_template
+from editor.views import _template_path
+
+
+def _used_pairs(data: bytes) -> set[tuple[str, str]]:
+    # Listas de la fila de habilidades del documento final (como el ajuste por export de antes)
+    table = Document(io.BytesIO(data)).tables[0]
+    idx = next(idx for idx, row in enumerate(table.rows) if row.cells[0].text.strip() in {"HABILIDADES", "SKILLS"})
+    cells = docx_template._unique_cells(table.rows[idx + 2])
+    return {pair for cell in cells for p in cell.paragraphs if (pair := docx_template._paragraph_numbering(p))}
+
+
+class SkillsNumberingTests(SimpleTestCase):
+    def setUp(self) -> None:
+        docx_template.clear_content_cache()
+        self.addCleanup(docx_template.clear_content_cache)
+
+    def test_pairs_from_slots_match_rendered_paragraphs(self) -> None:
+        path = _template_path()
+        _, template_bytes, template_key = docx_template._load_template(path)
+        slots = docx_template.template_slots(template_key, template_bytes)
+        base = generate_cv(0, "medium", "es").structure
+        variants = [
+            [],
+            [{"category": "Lenguajes", "items": ""}],
+            [{"category": "", "items": "Python · Go"}],
+            [{"category": "  ", "items": ""}, {"category": "A", "items": "b"}],
+            base["skills"],
+        ]
+        for skills in variants:
+            data = render_from_template(dict(base, skills=skills), path)
+            self.assertEqual(docx_template._skills_numbering_pairs(slots, skills), _used_pairs(data))
+
+    def test_numbering_fixup_is_computed_once(self) -> None:
+        path = _template_path()
+        docx_template._NUMBERING_FIXUPS.clear()
+        first = render_from_template(generate_cv(0, "small", "es").structure, path)
+        render_from_template(generate_cv(1, "large", "en").structure, path, font_name="Arial")
+        self.assertEqual(len(docx_template._NUMBERING_FIXUPS), 1)
+
+        numbering = Document(io.BytesIO(first)).part.numbering_part.element
+        num_id, ilvl = next(iter(_used_pairs(first)))
+        sizes = numbering.xpath(
+            f'w:abstractNum[@w:abstractNumId=//w:num[@w:numId="{num_id}"]/w:abstractNumId/@w:val]'
+            f'/w:lvl[@w:ilvl="{ilvl}"]/w:rPr/w:sz/@w:val'
+        )
+        self.assertEqual(sizes, ["22"])
@@ -5,6 +5,8 @@ from pathlib import Path
 from django.test import SimpleTestCase
 from docx import Document as DocxDocument
 
+from editor.benchmarks import generate_cv
+from editor.benchmarks.runner import _reversed_module_order
 from editor.docx_template import render_from_template
 
 
@@ -94,3 +96,24 @@ class ModuleOrderSpacingTests(SimpleTestCase):
         assert experience_idx is not None and projects_idx is not None
         self.assertGreater(projects_idx, experience_idx)
         self.assertLess(projects_idx, education_idx)
+
+    def test_reversed_order_with_many_extras_moves_every_module(self) -> None:
+        template_path = Path(__file__).resolve().parents[2] / "templates" / "cv_template.docx"
+        structured = generate_cv(0, "xlarge", "es").structure
+        table = DocxDocument(io.BytesIO(render_from_template(structured, template_path))).tables[0]
+        reordered = DocxDocument(
+            io.BytesIO(render_from_template(_reversed_module_order(structured), template_path))
+        ).tables[0]
+
+        headings = [_normalize(extra["title"]) for extra in reversed(structured["extra_sections"])]
+        headings += ["HABILIDADES", "EDUCACION", "EXPERIENCIA"]
+        row_texts = [_normalize(row.cells[0].text) for row in reordered.rows]
+        positions = [row_texts.index(heading) if heading in row_texts else None for heading in headings]
+        self.assertNotIn(None, positions)
+        self.assertEqual(positions, sorted(positions))
+        # Mismas filas con contenido, solo cambia el orden
+        self.assertEqual(
+            sorted(filter(None, map(_row_text, table.rows))), sorted(filter(None, map(_row_text, reordered.rows)))
+        )
+        for idx in positions[1:]:
+            self.assertEqual(_row_text(reordered.rows[idx - 1]), "")
@@ -0,0 +1,42 @@
+import io
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+from docx import Document as DocxDocument
+
+from editor import docx_writer
+from editor.benchmarks import generate_cv
+from editor.docx_template import preload_template, render_from_template
+
+TEMPLATE_PATH = Path(__file__).resolve().parents[2] / "templates" / "cv_template.docx"
+
+
+class DocxWriterTests(SimpleTestCase):
+    def test_only_modified_parts_are_recompressed(self) -> None:
+        preload_template(TEMPLATE_PATH)
+        structured = generate_cv(0, "small", "es").structure
+        # Deja lista la numeracion corregida de habilidades (se comprime una sola vez)
+        render_from_template(generate_cv(1, "small", "es").structure, TEMPLATE_PATH)
+
+        with mock.patch.object(docx_writer, "_deflate", wraps=docx_writer._deflate) as deflate:
+            rendered = render_from_template(structured, TEMPLATE_PATH, font_name="Arial")
+
+        archive = zipfile.ZipFile(io.BytesIO(rendered))
+        self.assertIsNone(archive.testzip())
+        # document.xml y sus rels, y estilos y tema por la fuente
+        self.assertLessEqual(deflate.call_count, 4)
+        self.assertGreater(len(archive.namelist()), 20)
+        self.assertIn("word/fonts/font1.odttf", archive.namelist())
+        self.assertTrue(DocxDocument(io.BytesIO(rendered)).tables)
+
+    def test_writer_without_base_members_round_trips(self) -> None:
+        doc = DocxDocument()
+        doc.add_paragraph("Hola ñandú")
+
+        first = docx_writer.save_docx_bytes(doc)
+        second = docx_writer.save_docx_bytes(doc)
+
+        self.assertEqual(first, second)
+        self.assertEqual(DocxDocument(io.BytesIO(first)).paragraphs[0].text, "Hola ñandú")
@@ -0,0 +1,136 @@
+import json
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from editor import drafts, export_cache
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_querydict
+from editor.structure import structure_from_json, structure_from_post
+
+
+class ApplyPatchTests(SimpleTestCase):
+    def test_supported_operations(self) -> None:
+        doc = {"basics": {"name": "Ana"}, "skills": [{"category": "A"}], "a/b": 1}
+        patched = drafts.apply_patch(
+            doc,
+            [
+                {"op": "test", "path": "/basics/name", "value": "Ana"},
+                {"op": "replace", "path": "/basics/name", "value": "Bruno"},
+                {"op": "add", "path": "/skills/-", "value": {"category": "B"}},
+                {"op": "move", "from": "/skills/1", "path": "/skills/0"},
+                {"op": "copy", "from": "/basics/name", "path": "/basics/alias"},
+                {"op": "remove", "path": "/a~1b"},
+            ],
+        )
+        self.assertEqual(
+            patched,
+            {"basics": {"name": "Bruno", "alias": "Bruno"}, "skills": [{"category": "B"}, {"category": "A"}]},
+        )
+        # El original no se modifica
+        self.assertEqual(doc["basics"]["name"], "Ana")
+
+    def test_invalid_operations_raise(self) -> None:
+        doc = {"skills": []}
+        for ops in (
+            [{"op": "replace", "path": "/missing", "value": 1}],
+            [{"op": "remove", "path": "/skills/0"}],
+            [{"op": "add", "path": "skills", "value": 1}],
+            [{"op": "test", "path": "/skills", "value": [1]}],
+            [{"op": "eval", "path": "/skills"}],
+            {"op": "add"},
+        ):
+            with self.assertRaises(drafts.DraftPatchError):
+                drafts.apply_patch(doc, ops)
+
+
+class DraftEndpointTests(SimpleTestCase):
+    def setUp(self) -> None:
+        export_cache.clear()
+        self.addCleanup(export_cache.clear)
+        self.post_data = cv_to_querydict(generate_cv(0, "small", "es"))
+        self.structured = structure_from_post(self.post_data)
+
+    def _create(self) -> dict:
+        response = self.client.post(
+            "/drafts/", json.dumps({"structured": self.structured}), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def _patch(self, token: str, body):
+        return self.client.patch(f"/drafts/{token}/", json.dumps(body), content_type="application/json")
+
+    def test_patch_updates_version_and_document(self) -> None:
+        created = self._create()
+        response = self._patch(
+            created["token"],
+            {"version": 1, "ops": [{"op": "replace", "path": "/basics/name", "value": "Nueva Persona"}]},
+        )
+        self.assertEqual(response.json()["version"], 2)
+
+        stored = self.client.get(f"/drafts/{created['token']}/").json()
+        self.assertEqual(stored["structured"]["basics"]["name"], "Nueva Persona")
+
+        stale = self._patch(created["token"], {"version": 1, "ops": []})
+        self.assertEqual(stale.status_code, 409)
+        invalid = self._patch(created["token"], [{"op": "remove", "path": "/nope"}])
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(self._patch("x" * 32, []).status_code, 404)
+
+    def test_export_with_draft_token_matches_full_form(self) -> None:
+        created = self._create()
+        from_form = self.client.post("/text/export/docx/", dict(self.post_data.lists()))
+        export_cache.clear()
+        from_draft = self.client.post(
+            "/text/export/docx/", {"use_structured": "1", "filename": "cv", "draft_token": created["token"]}
+        )
+
+        self.assertEqual(from_draft.status_code, 200)
+        self.assertEqual(from_draft["ETag"], from_form["ETag"])
+        self.assertEqual(from_draft.getvalue(), from_form.getvalue())
+
+    def test_concurrent_patches_on_same_version_conflict(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_cache = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": tmp_dir}
+            caches = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}, "drafts": file_cache}
+            with override_settings(CACHES=caches, DRAFTS_CACHE_DIR=tmp_dir):
+                token, version = drafts.create({"basics": {"name": "Ana"}})
+                apply_patch = drafts.apply_patch
+
+                def slow_patch(doc, ops):
+                    # Ensancha la ventana entre leer y guardar
+                    time.sleep(0.1)
+                    return apply_patch(doc, ops)
+
+                outcomes = []
+
+                def patch(name: str) -> None:
+                    ops = [{"op": "replace", "path": "/basics/name", "value": name}]
+                    try:
+                        outcomes.append(drafts.update(token, ops, base_version=version))
+                    except drafts.DraftConflict:
+                        outcomes.append("conflict")
+
+                with mock.patch.object(drafts, "apply_patch", side_effect=slow_patch):
+                    threads = [threading.Thread(target=patch, args=(name,)) for name in ("Bea", "Carla")]
+                    for thread in threads:
+                        thread.start()
+                    for thread in threads:
+                        thread.join(5)
+                self.assertEqual(sorted(outcomes, key=str), [2, "conflict"])
+                self.assertEqual(drafts.load(token)[1], 2)
+
+    def test_export_with_unknown_draft_returns_404(self) -> None:
+        response = self.client.post("/text/export/docx/", {"use_structured": "1", "draft_token": "y" * 32})
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("error", response.json())
+
+    def test_structure_from_json_matches_structure_from_post(self) -> None:
+        for size in ("small", "xlarge"):
+            for lang in ("es", "en"):
+                structured = structure_from_post(cv_to_querydict(generate_cv(5, size, lang)))
+                self.assertEqual(structure_from_json(json.loads(json.dumps(structured))), structured)
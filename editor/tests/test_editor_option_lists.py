@@ -0,0 +1,29 @@
+from django.test import RequestFactory, SimpleTestCase
+
+from editor.benchmarks import generate_cv
+from editor.views import CURRENT_YEAR, _render_text_editor
+
+
+def _render(structured) -> str:
+    return _render_text_editor(RequestFactory().get("/"), structured).content.decode("utf-8")
+
+
+class EditorOptionListsTests(SimpleTestCase):
+    def test_year_and_country_lists_are_rendered_once(self) -> None:
+        html = _render(generate_cv(0, "xlarge", "es").structure)
+        self.assertEqual(html.count(f'<option value="{CURRENT_YEAR}">'), 1)
+        self.assertEqual(html.count('<option value="Venezuela">'), 1)
+        self.assertGreater(html.count("data-year-select"), 60)
+        self.assertIn('id="tpl-year-options"', html)
+        self.assertIn('id="tpl-country-options"', html)
+
+    def test_selected_countries_are_rendered_server_side(self) -> None:
+        structured = generate_cv(0, "small", "es").structure
+        structured["basics"]["country"] = "Perú"
+        structured["experience"][0]["country"] = "Atlántida"
+        html = _render(structured)
+        self.assertIn('<option value="Perú" selected>Perú</option>', html)
+        self.assertIn('<option value="Atlántida" selected>Atlántida</option>', html)
+        # Los paises fuera de la lista base siguen llegando a la lista compartida
+        self.assertIn('<option value="Atlántida">Atlántida</option>', html)
+
@@ -0,0 +1,79 @@
+import io
+import json
+import threading
+import zipfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from editor import docx_template, export_cache, pdf_convert
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_querydict
+
+
+def _form(**extra) -> dict:
+    data = dict(cv_to_querydict(generate_cv(3, "small", "es")).lists())
+    data.update(extra)
+    return data
+
+
+class ExportBatchTests(SimpleTestCase):
+    def setUp(self) -> None:
+        export_cache.clear()
+        docx_template.clear_content_cache()
+        self.addCleanup(export_cache.clear)
+        self.addCleanup(docx_template.clear_content_cache)
+
+    def _post(self, variants, **extra):
+        body = _form(variants=json.dumps(variants), filename="Mi CV", **extra)
+        return self.client.post("/text/export/batch/", body)
+
+    def test_docx_variants_share_content_per_language(self) -> None:
+        variants = [
+            {"ui_lang": "es", "doc_font": "", "format": "docx"},
+            {"ui_lang": "es", "doc_font": "Arial", "format": "docx"},
+            ["en", "Arial", "docx"],
+            ["en", "Georgia", "docx"],
+            ["en", "Georgia", "docx"],
+        ]
+        with mock.patch.object(docx_template, "_render_content", wraps=docx_template._render_content) as content:
+            response = self._post(variants)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertEqual(content.call_count, 2)
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        self.assertEqual(
+            archive.namelist(), ["mi-cv-es.docx", "mi-cv-es-arial.docx", "mi-cv-en-arial.docx", "mi-cv-en-georgia.docx"]
+        )
+
+        export_cache.clear()
+        single = self.client.post("/text/export/docx/", _form(ui_lang="en", doc_font="Georgia"))
+        self.assertEqual(archive.read("mi-cv-en-georgia.docx"), single.getvalue())
+
+    @override_settings(PDF_CONVERTER_WORKERS=2)
+    def test_pdf_variants_are_converted_concurrently(self) -> None:
+        barrier = threading.Barrier(2, timeout=10)
+
+        def fake_convert(docx_bytes: bytes):
+            barrier.wait()
+            return b"%PDF-" + docx_bytes[-8:], None
+
+        with mock.patch.object(pdf_convert, "convert_docx_bytes_to_pdf", side_effect=fake_convert):
+            response = self._post([["es", "", "pdf"], ["en", "", "pdf"], ["en", "", "docx"]])
+
+        self.assertEqual(response.status_code, 200)
+        names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+        self.assertEqual(names, ["mi-cv-es.pdf", "mi-cv-en.pdf", "mi-cv-en.docx"])
+
+    def test_invalid_variants_return_400(self) -> None:
+        for variants in ([], [["fr", "", "docx"]], [["es", "Comic Sans", "docx"]], [["es", "", "odt"]], "docx"):
+            response = self._post(variants)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("error", response.json())
+
+    def test_pdf_failure_returns_error(self) -> None:
+        with mock.patch.object(pdf_convert, "convert_docx_bytes_to_pdf", return_value=(None, "fallo")):
+            response = self._post([["es", "", "pdf"]])
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("error", response.json())
@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from editor import docx_template, export_cache, pdf_convert
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_querydict
+
+
+def _post_data(**extra) -> dict:
+    data = dict(cv_to_querydict(generate_cv(0, "small", "es")).lists())
+    data.update(extra)
+    return data
+
+
+class ExportCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        export_cache.clear()
+        self.addCleanup(export_cache.clear)
+
+    def test_repeated_docx_export_and_following_pdf_reuse_rendered_docx(self) -> None:
+        received: list[bytes] = []
+
+        def fake_convert(input_path):
+            received.append(input_path.read_bytes())
+            output_path = input_path.with_name("documento.pdf")
+            output_path.write_bytes(b"%PDF-fake")
+            return output_path, None
+
+        render = mock.patch.object(docx_template, "render_to_file", wraps=docx_template.render_to_file)
+        convert = mock.patch.object(pdf_convert, "convert_docx_file_to_pdf", side_effect=fake_convert)
+        with render as render, convert:
+            first = b"".join(self.client.post("/text/export/docx/", _post_data()).streaming_content)
+            second = self.client.post("/text/export/docx/", _post_data())
+            pdf = b"".join(self.client.post("/text/export/pdf/", _post_data()).streaming_content)
+            pdf_again = self.client.post("/text/export/pdf/", _post_data())
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first, second.content)
+        self.assertEqual(received, [first])
+        self.assertEqual(pdf, b"%PDF-fake")
+        self.assertEqual(pdf_again.content, b"%PDF-fake")
+
+    def test_font_and_language_are_part_of_the_key(self) -> None:
+        render = mock.patch.object(docx_template, "render_to_file", wraps=docx_template.render_to_file)
+        with render as render:
+            self.client.post("/text/export/docx/", _post_data())
+            self.client.post("/text/export/docx/", _post_data(doc_font="Arial"))
+            self.client.post("/text/export/docx/", _post_data(ui_lang="en"))
+
+        self.assertEqual(render.call_count, 3)
+
+    @override_settings(EXPORT_CACHE_MAX_MB=0.001)
+    def test_eviction_is_by_total_size(self) -> None:
+        export_cache.put("a", "docx", b"x" * 600)
+        export_cache.put("b", "docx", b"y" * 600)
+
+        self.assertIsNone(export_cache.get("a", "docx"))
+        self.assertEqual(export_cache.get("b", "docx"), b"y" * 600)
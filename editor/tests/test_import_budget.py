@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+# Presupuesto para "import editor.views" en un proceso nuevo (arranque en frio)
+IMPORT_BUDGET_MS = 120
+# Dependencias que solo deben cargarse al subir o exportar un archivo
+HEAVY_MODULES = ("docx", "lxml", "pdfplumber", "pdfminer", "editor.pdf_parse", "editor.docx_template")
+
+_SCRIPT = """
+import json, sys, time
+import django
+django.setup()
+# Django base que cualquier request necesita; se mide solo el grafo propio de la app
+import django.http, django.shortcuts, django.urls, django.views.decorators.http
+started = time.perf_counter()
+import editor.views
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({"elapsed_ms": elapsed_ms, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+class ImportBudgetTests(SimpleTestCase):
+    def test_views_import_is_lazy_and_within_budget(self) -> None:
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="trufadocs.settings")
+        # Mejor de 3 para no fallar por ruido del sistema
+        results = []
+        for _ in range(3):
+            completed = subprocess.run(
+                [sys.executable, "-c", _SCRIPT],
+                cwd=Path(__file__).resolve().parents[2],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+        self.assertEqual(results[0]["loaded"], [])
+        best = min(result["elapsed_ms"] for result in results)
+        self.assertLess(best, IMPORT_BUDGET_MS, f"import editor.views tardo {best:.1f} ms")
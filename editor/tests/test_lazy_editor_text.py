@@ -0,0 +1,32 @@
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase
+
+from editor import views
+from editor.benchmarks import generate_cv
+from editor.structure import build_text_from_structure
+
+
+class LazyEditorTextTests(SimpleTestCase):
+    def setUp(self) -> None:
+        views._structure_text_for.cache_clear()
+
+    def test_editor_render_does_not_serialize_text(self) -> None:
+        with mock.patch.object(views, "build_text_from_structure") as build:
+            response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        build.assert_not_called()
+
+    def test_text_is_computed_on_use_and_memoized_by_content(self) -> None:
+        structured = generate_cv(0, "medium", "es").structure
+        request = RequestFactory().get("/")
+        with mock.patch.object(views, "render", side_effect=lambda request, name, context: context):
+            first = views._render_text_editor(request, structured)["text"]
+            second = views._render_text_editor(request, generate_cv(0, "medium", "es").structure)["text"]
+
+        with mock.patch.object(views, "build_text_from_structure", wraps=build_text_from_structure) as build:
+            rendered = Template("{{ text }}|{{ text }}").render(Context({"text": first}, autoescape=False))
+            self.assertEqual(second(), first())
+        self.assertEqual(rendered, "|".join([build_text_from_structure(structured)] * 2))
+        build.assert_called_once()
@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+
+from editor import metrics
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_pdf_bytes
+
+
+class MetricsEndpointTests(SimpleTestCase):
+    def setUp(self) -> None:
+        metrics.reset()
+
+    def test_pdf_upload_feeds_stage_histograms_and_counters(self) -> None:
+        pdf_bytes = cv_to_pdf_bytes(generate_cv(0, "small", "es"))
+        self.client.post("/upload/", {"file": SimpleUploadedFile("cv.pdf", pdf_bytes)})
+        self.client.post("/upload/", {})
+
+        response = self.client.get("/metrics/")
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode("utf-8")
+        self.assertIn('trufadocs_stage_duration_seconds_count{stage="extract"} 1', body)
+        self.assertIn('trufadocs_stage_duration_seconds_bucket{stage="parse",le="+Inf"} 1', body)
+        self.assertIn("trufadocs_pdf_pages_total 1", body)
+        self.assertIn('trufadocs_errors_total{key="upload_select_file"} 1', body)
+
+    def test_multiprocess_mode_sums_worker_snapshots(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, override_settings(METRICS_MULTIPROC_DIR=tmp_dir):
+            other_worker = {
+                "counters": [["trufadocs_pdf_lines_total", [], 40.0]],
+                "histograms": [],
+            }
+            Path(tmp_dir, f"metrics-{os.getppid()}.json").write_text(json.dumps(other_worker), encoding="utf-8")
+            metrics.inc("trufadocs_pdf_lines_total", 2)
+
+            body = metrics.render_text()
+
+        self.assertIn("trufadocs_pdf_lines_total 42", body)
+
+    def test_multiprocess_mode_drops_dead_workers_and_reports_gauges_per_pid(self) -> None:
+        # Un proceso que ya termino hace de worker muerto
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        dead_pid = finished.pid
+        with tempfile.TemporaryDirectory() as tmp_dir, override_settings(METRICS_MULTIPROC_DIR=tmp_dir):
+            dead_worker = {
+                "counters": [["trufadocs_pdf_lines_total", [], 40.0]],
+                "gauges": [["trufadocs_admission_in_flight", [["operation", "convert_pdf"]], 3.0]],
+                "histograms": [],
+            }
+            dead_file = Path(tmp_dir, f"metrics-{dead_pid}.json")
+            dead_file.write_text(json.dumps(dead_worker), encoding="utf-8")
+            metrics.inc("trufadocs_pdf_lines_total", 2)
+            metrics.set_gauge("trufadocs_admission_in_flight", 1, operation="convert_pdf")
+
+            body = metrics.render_text()
+
+            self.assertFalse(dead_file.exists())
+        self.assertIn("trufadocs_pdf_lines_total 2", body)
+        self.assertIn(f'trufadocs_admission_in_flight{{operation="convert_pdf",pid="{os.getpid()}"}} 1', body)
+        self.assertNotIn("} 3", body)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_endpoint_can_be_disabled(self) -> None:
+        self.assertEqual(self.client.get("/metrics/").status_code, 404)
@@ -0,0 +1,57 @@
+import copy
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from editor import docx_template
+from editor.benchmarks import generate_cv
+
+TEMPLATE_PATH = Path(__file__).resolve().parents[2] / "templates" / "cv_template.docx"
+
+
+class RenderContentCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        docx_template.clear_content_cache()
+        self.addCleanup(docx_template.clear_content_cache)
+        self.structured = generate_cv(1, "medium", "es").structure
+
+    def _render(self, **kwargs) -> bytes:
+        return docx_template.render_from_template(self.structured, TEMPLATE_PATH, **kwargs)
+
+    def test_font_only_export_reuses_content(self) -> None:
+        with mock.patch.object(docx_template, "_render_content", wraps=docx_template._render_content) as content:
+            self._render(ui_lang="es")
+            with_font = self._render(font_name="Georgia", ui_lang="es")
+            self._render(font_name="Arial", ui_lang="es")
+        self.assertEqual(content.call_count, 1)
+
+        docx_template.clear_content_cache()
+        self.assertEqual(with_font, self._render(font_name="Georgia", ui_lang="es"))
+
+    def test_language_and_structure_changes_render_again(self) -> None:
+        with mock.patch.object(docx_template, "_render_content", wraps=docx_template._render_content) as content:
+            self._render(ui_lang="es")
+            english = self._render(ui_lang="en")
+            changed = copy.deepcopy(self.structured)
+            changed["basics"]["name"] = "Otra Persona"
+            docx_template.render_from_template(changed, TEMPLATE_PATH, ui_lang="es")
+        self.assertEqual(content.call_count, 3)
+
+        docx_template.clear_content_cache()
+        self.assertEqual(english, self._render(ui_lang="en"))
+
+    def test_render_does_not_modify_structure(self) -> None:
+        original = copy.deepcopy(self.structured)
+        self._render(font_name="Arial")
+        self.assertEqual(self.structured, original)
+
+    def test_detailed_extras_use_cached_row_prototypes(self) -> None:
+        modes = {extra["mode"] for extra in self.structured["extra_sections"]}
+        self.assertIn("detailed", modes)
+        self._render()
+        docx_template.clear_content_cache()
+        # Con el mapa de la plantilla ya calculado, el render no busca filas modelo en la tabla
+        with mock.patch.object(docx_template, "_find_next_non_empty_row") as find_row:
+            self._render()
+        find_row.assert_not_called()
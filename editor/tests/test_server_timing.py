@@ -0,0 +1,39 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_pdf_bytes
+from editor.timing import stage, start_recording, stop_recording
+
+
+class ServerTimingTests(SimpleTestCase):
+    def test_pdf_upload_reports_pipeline_stages(self) -> None:
+        pdf_bytes = cv_to_pdf_bytes(generate_cv(0, "small", "es"))
+        uploaded = SimpleUploadedFile("cv.pdf", pdf_bytes, content_type="application/pdf")
+
+        response = self.client.post("/upload/", {"file": uploaded})
+
+        self.assertEqual(response.status_code, 200)
+        names = [item.split(";", 1)[0] for item in response["Server-Timing"].split(", ")]
+        self.assertEqual(names, ["upload_read", "extract", "assemble", "parse", "template_render"])
+
+    def test_stage_accumulates_and_is_noop_without_recording(self) -> None:
+        with stage("parse"):
+            pass
+
+        token = start_recording()
+        with stage("parse"):
+            pass
+        with stage("parse"):
+            pass
+        timings = stop_recording(token)
+
+        self.assertEqual(list(timings), ["parse"])
+        self.assertGreaterEqual(timings["parse"], 0.0)
+
+
+@override_settings(SERVER_TIMING_ENABLED=False)
+class ServerTimingDisabledTests(SimpleTestCase):
+    def test_header_is_omitted_when_disabled(self) -> None:
+        response = self.client.post("/upload/", {})
+        self.assertFalse(response.has_header("Server-Timing"))
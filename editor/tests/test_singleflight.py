@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from editor import singleflight
+
+
+class SingleFlightTests(SimpleTestCase):
+    def test_concurrent_calls_in_process_share_one_computation(self) -> None:
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return {"experience": [{"role": "Dev"}]}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(singleflight.coalesce("cv-a", compute)))
+        leader.start()
+        started.wait(2)
+        followers = [
+            threading.Thread(target=lambda: results.append(singleflight.coalesce("cv-a", compute)))
+            for _ in range(3)
+        ]
+        for thread in followers:
+            thread.start()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(len({id(result) for result in results}), 4)
+
+    def test_failures_are_not_shared_with_later_calls(self) -> None:
+        with self.assertRaises(RuntimeError):
+            singleflight.coalesce("cv-b", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        self.assertEqual(singleflight.coalesce("cv-b", lambda: [1, None]), [1, None])
+
+    @unittest.skipIf(singleflight.fcntl is None, "fcntl no disponible")
+    def test_waiting_worker_reuses_result_written_by_leader(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, override_settings(SINGLEFLIGHT_DIR=tmp_dir):
+            lock_path = Path(tmp_dir, "pdf-abc.lock")
+            results = []
+            with open(lock_path, "a+b") as other_worker:
+                # Otro worker es lider: tiene el lock mientras parsea
+                singleflight.fcntl.flock(other_worker, singleflight.fcntl.LOCK_EX)
+                follower = threading.Thread(
+                    target=lambda: results.append(
+                        singleflight.coalesce("pdf-abc", lambda: self.fail("no deberia recalcular"))
+                    )
+                )
+                follower.start()
+                time.sleep(0.2)
+                Path(tmp_dir, "pdf-abc.json").write_text(json.dumps([{"name": "Ana"}, None]))
+                singleflight.fcntl.flock(other_worker, singleflight.fcntl.LOCK_UN)
+            follower.join(5)
+
+        self.assertEqual(results, [[{"name": "Ana"}, None]])
+
+    @unittest.skipIf(singleflight.fcntl is None, "fcntl no disponible")
+    def test_expired_results_are_pruned_at_most_once_per_interval(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, override_settings(SINGLEFLIGHT_DIR=tmp_dir):
+            singleflight._LAST_PRUNE.pop(Path(tmp_dir), None)
+            with mock.patch.object(singleflight, "_prune", wraps=singleflight._prune) as prune:
+                for name in ("pdf-1", "pdf-2", "pdf-3"):
+                    singleflight.coalesce(name, lambda: [None, None])
+            self.assertEqual(prune.call_count, 1)
+
+            # Pasado el intervalo, la siguiente subida borra los resultados vencidos (de cualquier proceso)
+            stale = Path(tmp_dir, "pdf-1.json")
+            old = time.time() - singleflight._RESULT_TTL_SECONDS - 1
+            os.utime(stale, (old, old))
+            with mock.patch.object(singleflight, "_PRUNE_INTERVAL_SECONDS", 0):
+                singleflight.coalesce("pdf-otro", lambda: [None, None])
+            self.assertFalse(stale.exists())
+            self.assertTrue(Path(tmp_dir, "pdf-2.json").exists())
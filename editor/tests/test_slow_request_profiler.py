@@ -0,0 +1,63 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from editor import drafts
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_pdf_bytes
+from editor.profiling import PROFILED_VIEWS, input_digest
+
+
+class SlowRequestProfilerTests(SimpleTestCase):
+    def test_slow_uploads_are_dumped_with_input_hash_and_reported(self) -> None:
+        pdf_bytes = cv_to_pdf_bytes(generate_cv(0, "small", "es"))
+        with tempfile.TemporaryDirectory() as tmp_dir, override_settings(
+            PROFILING_DIR=tmp_dir,
+            PROFILING_SAMPLE_RATE=1.0,
+            PROFILING_THRESHOLD_MS=0,
+        ):
+            for _ in range(2):
+                self.client.post("/upload/", {"file": SimpleUploadedFile("cv.pdf", pdf_bytes)})
+            self.client.get("/")
+
+            dumps = sorted(Path(tmp_dir).glob("*.prof"))
+            metas = [json.loads(path.with_suffix(".json").read_text()) for path in dumps]
+            out = io.StringIO()
+            call_command("profile_report", dir=tmp_dir, limit=60, sort="cumulative", stdout=out)
+
+        self.assertEqual(len(dumps), 2)
+        self.assertEqual({meta["view"] for meta in metas}, {"text_upload"})
+        self.assertEqual(metas[0]["input_sha256"], metas[1]["input_sha256"])
+        report = out.getvalue()
+        self.assertIn("2 dump(s)", report)
+        self.assertIn(f"2x  {metas[0]['input_sha256'][:12]}", report)
+        self.assertIn("parse_pdf_to_structure", report)
+
+    def test_profiler_is_off_without_directory(self) -> None:
+        with override_settings(PROFILING_DIR="", PROFILING_SAMPLE_RATE=1.0, PROFILING_THRESHOLD_MS=0):
+            response = self.client.post("/upload/", {})
+        self.assertEqual(response.status_code, 200)
+
+    def test_input_digest_covers_json_bodies_and_drafts(self) -> None:
+        self.assertIn("export_batch", PROFILED_VIEWS)
+        factory = RequestFactory()
+
+        def json_digest(payload: dict) -> str:
+            return input_digest(factory.post("/text/export/docx/", json.dumps(payload), content_type="application/json"))
+
+        self.assertEqual(json_digest({"filename": "a"}), json_digest({"filename": "a"}))
+        self.assertNotEqual(json_digest({"filename": "a"}), json_digest({"filename": "b"}))
+
+        # Mismo token, otra version del borrador: otro input
+        token, version = drafts.create({"basics": {"name": "Ana"}})
+        form_request = factory.post("/text/export/docx/", {"use_structured": "1", "draft_token": token})
+        before = (input_digest(form_request), json_digest({"draft_token": token}))
+        drafts.update(token, [{"op": "replace", "path": "/basics/name", "value": "Eva"}], base_version=version)
+        after = (input_digest(form_request), json_digest({"draft_token": token}))
+        self.assertNotEqual(before[0], after[0])
+        self.assertNotEqual(before[1], after[1])
@@ -0,0 +1,88 @@
+from pathlib import Path
+from unittest import mock
+
+from django.http import FileResponse
+from django.test import SimpleTestCase, override_settings
+
+from editor import export_cache, pdf_convert
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_querydict
+
+
+def _post_data(**extra) -> dict:
+    data = dict(cv_to_querydict(generate_cv(0, "medium", "es")).lists())
+    data.update(extra)
+    return data
+
+
+def _fake_convert(received: list):
+    # Conversor falso: guarda el DOCX recibido y deja un "PDF" junto al archivo de entrada
+    def convert(input_path: Path):
+        received.append(input_path.read_bytes())
+        output_path = input_path.with_name("documento.pdf")
+        output_path.write_bytes(b"%PDF-fake" * 1000)
+        return output_path, None
+
+    return convert
+
+
+class StreamingExportTests(SimpleTestCase):
+    def setUp(self) -> None:
+        export_cache.clear()
+        self.addCleanup(export_cache.clear)
+
+    def _streamed(self, path: str, data: dict) -> tuple[FileResponse, bytes]:
+        with override_settings(EXPORT_SPOOL_MAX_MB=0.01):
+            response = self.client.post(path, data)
+        self.assertIsInstance(response, FileResponse)
+        return response, b"".join(response.streaming_content)
+
+    def test_docx_miss_is_streamed_and_fills_the_cache(self) -> None:
+        response, content = self._streamed("/text/export/docx/", _post_data())
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        cached = self.client.post("/text/export/docx/", _post_data())
+        self.assertNotIsInstance(cached, FileResponse)
+        self.assertEqual(cached.content, content)
+        self.assertEqual(cached["ETag"], response["ETag"])
+        self.assertEqual(cached["Content-Disposition"], response["Content-Disposition"])
+
+    def test_large_exports_are_streamed_but_not_cached(self) -> None:
+        with override_settings(EXPORT_CACHE_MAX_ENTRY_MB=0.001):
+            first, content = self._streamed("/text/export/docx/", _post_data())
+            again, again_content = self._streamed("/text/export/docx/", _post_data())
+        self.assertEqual(again_content, content)
+        self.assertFalse(export_cache._CACHE)
+
+    def test_text_docx_is_streamed(self) -> None:
+        response, content = self._streamed("/text/export/docx/", {"text": "Hola\nmundo", "filename": "notas"})
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="notas.docx"')
+        self.assertTrue(content.startswith(b"PK"))
+
+    def test_pdf_is_streamed_from_converter_output(self) -> None:
+        _, docx = self._streamed("/text/export/docx/", _post_data(doc_font="Arial"))
+        received: list[bytes] = []
+        with mock.patch.object(pdf_convert, "convert_docx_file_to_pdf", side_effect=_fake_convert(received)):
+            response, content = self._streamed("/text/export/pdf/", _post_data(doc_font="Arial", filename="cv"))
+
+        self.assertEqual(received, [docx])
+        self.assertEqual(content, b"%PDF-fake" * 1000)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="cv.pdf"')
+
+    def test_pdf_miss_caches_both_docx_and_pdf(self) -> None:
+        received: list[bytes] = []
+        with mock.patch.object(pdf_convert, "convert_docx_file_to_pdf", side_effect=_fake_convert(received)):
+            self._streamed("/text/export/pdf/", _post_data())
+            pdf_again = self.client.post("/text/export/pdf/", _post_data())
+            docx = self.client.post("/text/export/docx/", _post_data())
+        self.assertEqual(len(received), 1)
+        self.assertEqual(pdf_again.content, b"%PDF-fake" * 1000)
+        self.assertNotIsInstance(docx, FileResponse)
+        self.assertEqual(docx.content, received[0])
+
+    def test_streamed_pdf_errors_render_the_editor(self) -> None:
+        failed = mock.patch.object(pdf_convert, "convert_docx_file_to_pdf", return_value=(None, "fallo"))
+        with failed:
+            response = self.client.post("/text/export/pdf/", _post_data())
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("fallo", response.content.decode("utf-8"))
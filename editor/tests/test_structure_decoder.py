@@ -0,0 +1,47 @@
+import json
+
+from django.test import SimpleTestCase
+
+from editor import export_cache
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_querydict
+from editor.structure import structure_from_post
+from editor.structure_decoder import MODULE_FIELDS, decode_editor_form
+
+from .test_structure_from_post import _base_querydict
+
+
+class StructureDecoderTests(SimpleTestCase):
+    def test_json_mapping_decodes_like_querydict(self) -> None:
+        for size in ("small", "xlarge"):
+            for lang in ("es", "en"):
+                form = cv_to_querydict(generate_cv(2, size, lang))
+                as_json = json.loads(json.dumps(dict(form.lists())))
+                self.assertEqual(structure_from_post(as_json), structure_from_post(form))
+
+    def test_scalar_json_values_behave_like_single_field(self) -> None:
+        structured = structure_from_post({"name": "  Ana  ", "exp_role": "Dev", "exp_start": "3/2019", "extra": 1})
+        self.assertEqual(structured["basics"]["name"], "Ana")
+        self.assertEqual(structured["experience"][0]["role"], "Dev")
+        self.assertEqual(structured["experience"][0]["start"], "2019-03")
+
+    def test_missing_columns_use_field_defaults(self) -> None:
+        qd = _base_querydict()
+        qd.setlist("exp_role", ["A", "B"])
+        qd.setlist("exp_highlights", ["• uno\n\n- dos"])
+        experience = decode_editor_form(qd)["experience"]
+        self.assertEqual([row["role"] for row in experience], ["A", "B"])
+        self.assertEqual(experience[0]["highlights"], ["uno", "dos"])
+        self.assertEqual(experience[1]["highlights"], [])
+        self.assertEqual(set(experience[1]), {key for key, _, _ in MODULE_FIELDS["experience"]})
+
+    def test_export_accepts_json_body(self) -> None:
+        export_cache.clear()
+        self.addCleanup(export_cache.clear)
+        form = cv_to_querydict(generate_cv(0, "small", "es"))
+        from_form = self.client.post("/text/export/docx/", dict(form.lists()))
+        from_json = self.client.post(
+            "/text/export/docx/", json.dumps(dict(form.lists())), content_type="application/json"
+        )
+        self.assertEqual(from_json.status_code, 200)
+        self.assertEqual(from_json["ETag"], from_form["ETag"])
@@ -0,0 +1,78 @@
+import io
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+from docx import Document
+
+from editor import export_cache, template_registry
+from editor.benchmarks import generate_cv
+from editor.benchmarks.corpus import cv_to_querydict
+from editor.docx_template import _load_template, render_from_template, template_slots
+
+
+def _slots(path: Path) -> dict:
+    _, data, key = _load_template(path)
+    return template_slots(key, data)
+
+
+def _save_without_row(source: Path, target: Path, row_idx: int) -> None:
+    doc = Document(str(source))
+    tr = doc.tables[0].rows[row_idx]._tr
+    tr.getparent().remove(tr)
+    doc.save(str(target))
+
+
+class TemplateRegistryTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.default_path = template_registry.resolve()
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def test_default_template_slots(self) -> None:
+        slots = _slots(self.default_path)
+        self.assertEqual((slots["name"], slots["contact"], slots["summary"]), (0, 1, 3))
+        self.assertEqual((slots["experience"], slots["education"], slots["skills"]), (5, 10, 13))
+        self.assertEqual(slots["skills_content_offset"], 2)
+        self.assertEqual(set(slots["experience_rows"]), {"role", "highlights", "spacer", "section_spacer"})
+        self.assertIsNotNone(slots["education_rows"]["row"])
+
+    def test_directory_templates_are_registered_by_name(self) -> None:
+        shutil.copy(self.default_path, self.tmp / "moderna.docx")
+        (self.tmp / "~$moderna.docx").write_bytes(b"lock")
+        with override_settings(CV_TEMPLATES_DIR=str(self.tmp)):
+            self.assertEqual(template_registry.template_names(), ["default", "moderna"])
+            self.assertEqual(template_registry.resolve("moderna"), self.tmp / "moderna.docx")
+            self.assertIsNone(template_registry.resolve("otra"))
+            self.assertEqual(template_registry.preload_all(), {})
+
+            export_cache.clear()
+            self.addCleanup(export_cache.clear)
+            form = dict(cv_to_querydict(generate_cv(0, "small", "es")).lists())
+            response = self.client.post("/text/export/docx/", {**form, "template": "moderna"})
+            self.assertEqual(response.status_code, 200)
+            # Un nombre desconocido usa la plantilla principal
+            response = self.client.post("/text/export/docx/", {**form, "template": "otra"})
+            self.assertEqual(response.status_code, 200)
+
+    def test_changed_template_is_reloaded(self) -> None:
+        path = self.tmp / "casa.docx"
+        shutil.copy(self.default_path, path)
+        self.assertEqual(_slots(path)["experience"], 5)
+
+        # Sin la fila vacia antes de EXPERIENCIA los encabezados suben una fila
+        _save_without_row(self.default_path, path, 4)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(_slots(path)["experience"], 4)
+
+        data = render_from_template(generate_cv(1, "medium", "es").structure, path)
+        self.assertIn("EXPERIENCIA", Document(io.BytesIO(data)).tables[0].rows[4].cells[0].text)
+
+    def test_template_without_core_heading_is_rejected(self) -> None:
+        path = self.tmp / "incompleta.docx"
+        _save_without_row(self.default_path, path, 13)
+        with self.assertRaises(ValueError):
+            render_from_template(generate_cv(0, "small", "es").structure, path)
@@ -0,0 +1,22 @@
+import sys
+
+from django.test import SimpleTestCase
+
+from editor import docx_writer, metrics, warmup
+
+
+class WarmupTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.addCleanup(setattr, warmup, "_WARMED", None)
+        warmup._WARMED = None
+
+    def test_warmup_preloads_modules_template_and_page_once(self) -> None:
+        timings = warmup.warmup(freeze=False)
+
+        self.assertEqual(list(timings), ["modules", "template", "editor_page"])
+        for name in ("docx", "editor.pdf_parse", "editor.docx_template"):
+            self.assertIn(name, sys.modules)
+        self.assertTrue(docx_writer._TEMPLATE_MEMBERS)
+        self.assertIs(warmup.warmup(freeze=False), timings)
+        # Lo medido en el maestro no se hereda en cada worker
+        self.assertNotIn("trufadocs_stage_duration_seconds_count", metrics.render_text())
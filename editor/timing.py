@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from . import metrics
+
+# Duraciones por etapa (ms) del request en curso; None = sin medicion activa
+_STAGE_TIMINGS: ContextVar[dict[str, float] | None] = ContextVar("_STAGE_TIMINGS", default=None)
+
+
+def start_recording():
+    return _STAGE_TIMINGS.set({})
+
+
+def stop_recording(token) -> dict[str, float]:
+    timings = _STAGE_TIMINGS.get() or {}
+    _STAGE_TIMINGS.reset(token)
+    return timings
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    # Mide una etapa: alimenta el histograma de metricas y, si hay request
+    # en curso, el header Server-Timing (acumula si la etapa se repite)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe_stage(name, elapsed)
+        timings = _STAGE_TIMINGS.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed * 1000
+
+
+def server_timing_header(timings: dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={duration:.1f}" for name, duration in timings.items())
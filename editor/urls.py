@@ -11,4 +11,10 @@ urlpatterns = [
     # Exportaciones
     path("text/export/docx/", views.export_docx, name="export_docx"),
     path("text/export/pdf/", views.export_pdf, name="export_pdf"),
+    path("text/export/batch/", views.export_batch, name="export_batch"),
+    # Borradores JSON (parches incrementales del editor)
+    path("drafts/", views.draft_create, name="draft_create"),
+    path("drafts/<str:token>/", views.draft_detail, name="draft_detail"),
+    # Metricas para el balanceador / Prometheus
+    path("metrics/", views.metrics_endpoint, name="metrics"),
 ]
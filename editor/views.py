@@ -1,7 +1,11 @@
+import functools
+import hashlib
 import io
+import json
 import os
-from pathlib import Path
 import tempfile
+from pathlib import Path
+from typing import BinaryIO
 import unicodedata
 import zipfile
 from datetime import date
@@ -9,22 +13,32 @@ from xml.etree import ElementTree
 
 
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, QueryDict
 from django.shortcuts import redirect, render
+from django.utils.http import parse_etags
 from django.utils.text import slugify
 from django.views.decorators.http import require_http_methods
-from docx import Document as DocxDocument
-from .pdf_parse import parse_pdf_to_structure
 from .structure import (
     build_text_from_structure,
     default_structure,
     parse_resume,
+    structure_from_json,
     structure_from_post,
 )
-from .docx_template import render_from_template
+from .structure_decoder import json_form_values
+# python-docx/lxml, el parser PDF y el render de plantilla se importan al usarse:
+# el arranque del worker (y la pagina inicial) no los necesitan
+from . import admission, drafts, export_cache, metrics, template_registry
+from .pdf_convert import convert_docx_to_pdf_file, convert_many_docx_to_pdf
+from .singleflight import coalesce
+from .timing import stage
 
 # Tipos de archivo permitidos para upload
 ALLOWED_EXTENSIONS = {".docx", ".pdf"}
+# Exportacion de varias variantes (idioma, fuente, formato) en un solo request
+EXPORT_FORMATS = ("docx", "pdf")
+MAX_EXPORT_VARIANTS = 12
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 # Fuentes disponibles en la UI para exportar
 FONT_CHOICES = [
     "STIX Two Text",
@@ -67,6 +81,15 @@ UI_MESSAGES = {
         "docx2pdf_convert_failed_detail": "docx2pdf fallo al convertir: {detail}",
         "docx2pdf_convert_failed_word": "docx2pdf fallo al convertir. Asegura que Microsoft Word este instalado.",
         "docx2pdf_output_missing": "docx2pdf no genero el PDF esperado. Verifica Microsoft Word.",
+        "libreoffice_not_installed": "LibreOffice no esta instalado. Configura LIBREOFFICE_BINARY o instala soffice.",
+        "libreoffice_convert_failed_detail": "LibreOffice fallo al convertir: {detail}",
+        "libreoffice_output_missing": "LibreOffice no genero el PDF esperado.",
+        "draft_not_found": "El borrador no existe o expiro. Vuelve a exportar desde el formulario.",
+        "draft_invalid_json": "El cuerpo de la solicitud no es JSON valido.",
+        "draft_patch_failed": "No se pudo aplicar el cambio al borrador: {detail}",
+        "draft_version_conflict": "El borrador cambio desde otra pestaña (version {version}).",
+        "export_batch_invalid_variants": "Variantes de exportacion invalidas: {detail}",
+        "server_busy": "El servidor esta ocupado. Intenta de nuevo en {seconds} segundos.",
     },
     "en": {
         "upload_select_file": "Please select a .docx or .pdf file.",
@@ -88,14 +111,27 @@ UI_MESSAGES = {
         "docx2pdf_convert_failed_detail": "docx2pdf failed to convert: {detail}",
         "docx2pdf_convert_failed_word": "docx2pdf failed to convert. Make sure Microsoft Word is installed.",
         "docx2pdf_output_missing": "docx2pdf did not generate the expected PDF. Check Microsoft Word.",
+        "libreoffice_not_installed": "LibreOffice is not installed. Set LIBREOFFICE_BINARY or install soffice.",
+        "libreoffice_convert_failed_detail": "LibreOffice failed to convert: {detail}",
+        "libreoffice_output_missing": "LibreOffice did not generate the expected PDF.",
+        "draft_not_found": "The draft does not exist or has expired. Export again from the form.",
+        "draft_invalid_json": "The request body is not valid JSON.",
+        "draft_patch_failed": "Could not apply the change to the draft: {detail}",
+        "draft_version_conflict": "The draft was changed from another tab (version {version}).",
+        "export_batch_invalid_variants": "Invalid export variants: {detail}",
+        "server_busy": "The server is busy. Please try again in {seconds} seconds.",
     },
 }
 
 
+# Error interno cuando el archivo no tiene texto (se traduce con upload_extract_text_failed)
+UPLOAD_EMPTY_TEXT_ERROR = UI_MESSAGES["es"]["upload_extract_text_failed"]
+
+
 def _ui_lang(request) -> str:
     raw = ""
     if getattr(request, "method", "") == "POST":
-        raw = request.POST.get("ui_lang", "")
+        raw = _form_data(request).get("ui_lang", "")
     if not raw:
         raw = request.GET.get("ui_lang", "")
     return "en" if str(raw).strip().lower() == "en" else "es"
@@ -112,6 +148,12 @@ def _msg(request, key: str, **kwargs) -> str:
         return template
 
 
+def _error_msg(request, key: str, **kwargs) -> str:
+    # Mensaje de error para la UI; se cuenta por clave en /metrics/
+    metrics.inc("trufadocs_errors_total", key=key)
+    return _msg(request, key, **kwargs)
+
+
 def _translate_backend_error(request, message: str | None) -> str | None:
     if not message:
         return message
@@ -123,25 +165,30 @@ def _translate_backend_error(request, message: str | None) -> str | None:
         "El archivo DOCX esta vacio.": "docx_empty",
         "No se encontro texto legible dentro del DOCX.": "docx_no_text",
         "No se pudo extraer texto del PDF.": "pdf_no_text",
+        UPLOAD_EMPTY_TEXT_ERROR: "upload_extract_text_failed",
         "docx2pdf no esta instalado. Ejecuta pip install -r requirements.txt.": "docx2pdf_not_installed",
         "docx2pdf fallo al convertir. Asegura que Microsoft Word este instalado.": "docx2pdf_convert_failed_word",
         "docx2pdf no genero el PDF esperado. Verifica Microsoft Word.": "docx2pdf_output_missing",
+        "LibreOffice no esta instalado. Configura LIBREOFFICE_BINARY o instala soffice.": "libreoffice_not_installed",
+        "LibreOffice no genero el PDF esperado.": "libreoffice_output_missing",
     }
     mapped_key = exact_map.get(text)
     if mapped_key:
-        return _msg(request, mapped_key)
+        return _error_msg(request, mapped_key)
 
     prefix_map = [
         ("No se pudo leer el DOCX: ", "docx_read_failed"),
         ("No se pudo leer el DOCX (XML): ", "docx_read_xml_failed"),
         ("No se pudo leer el PDF: ", "pdf_read_failed"),
         ("docx2pdf fallo al convertir: ", "docx2pdf_convert_failed_detail"),
+        ("LibreOffice fallo al convertir: ", "libreoffice_convert_failed_detail"),
     ]
     for prefix, key in prefix_map:
         if text.startswith(prefix):
             detail = text[len(prefix) :].strip() or _msg(request, "unknown_error")
-            return _msg(request, key, detail=detail)
+            return _error_msg(request, key, detail=detail)
 
+    metrics.inc("trufadocs_errors_total", key="unmapped")
     return text
 
 def _extract_structured_countries(structured: dict | None) -> list[str]:
@@ -200,27 +247,27 @@ def text_upload(request):
 
     uploaded = request.FILES.get("file")
     if not uploaded:
-        return _text_error(request, _msg(request, "upload_select_file"))
+        return _text_error(request, _error_msg(request, "upload_select_file"))
 
     max_mb = _max_upload_mb()
     if uploaded.size > max_mb * 1024 * 1024:
-        return _text_error(request, _msg(request, "upload_file_too_large", max_mb=max_mb))
+        return _text_error(request, _error_msg(request, "upload_file_too_large", max_mb=max_mb))
 
     if not _is_allowed_extension(uploaded.name):
-        return _text_error(request, _msg(request, "upload_unsupported_format"))
+        return _text_error(request, _error_msg(request, "upload_unsupported_format"))
 
+    with stage("upload_read"):
+        raw = uploaded.read()
+
+    # Subidas identicas concurrentes (mismo contenido) comparten un solo parseo
     ext = _extension(uploaded.name)
-    if ext == ".docx":
-        text, error = _extract_docx_text(uploaded)
-        if error:
-            return _text_error(request, _translate_backend_error(request, error) or error)
-        if not text.strip():
-            return _text_error(request, _msg(request, "upload_extract_text_failed"))
-        structured = parse_resume(text)
-    else:
-        structured, error = parse_pdf_to_structure(uploaded)
-        if error:
-            return _text_error(request, _translate_backend_error(request, error) or error)
+    digest = hashlib.sha256(raw).hexdigest()
+    try:
+        structured, error = coalesce(f"{ext.lstrip('.')}-{digest}", lambda: _parse_upload(ext, raw))
+    except admission.Overloaded as exc:
+        return _overloaded(request, exc, default_structure(), "documento")
+    if error:
+        return _text_error(request, _translate_backend_error(request, error) or error)
 
     filename = _safe_filename(uploaded.name)
     return _render_text_editor(request, structured, filename=filename)
@@ -228,27 +275,34 @@ def text_upload(request):
 
 @require_http_methods(["POST"])
 def export_docx(request):
-    raw_text = request.POST.get("text", "")
-    use_structured = request.POST.get("use_structured") == "1"
+    raw_text = _form_data(request).get("text", "")
+    use_structured = _form_data(request).get("use_structured") == "1"
     if use_structured:
         # Exporta usando la estructura (plantilla DOCX)
-        structured = structure_from_post(request.POST)
-        template_path = _template_path()
-        font_choice = _selected_font(request)
+        structured = _posted_structure(request)
+        if structured is None:
+            return _draft_not_found(request)
+        template_path = _template_path(_selected_template(request))
         if not template_path:
             return _render_text_editor(
                 request,
                 structured,
-                filename=_safe_filename(request.POST.get("filename", "documento")),
-                error=_msg(request, "export_template_not_found"),
+                filename=_safe_filename(_form_data(request).get("filename", "documento")),
+                error=_error_msg(request, "export_template_not_found"),
             )
+        cache_key = _export_cache_key(request, structured, template_path)
+        etag = export_cache.etag_for(cache_key, "docx")
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
         try:
-            rendered = render_from_template(
-                structured,
-                template_path,
-                font_name=font_choice,
-                ui_lang=_ui_lang(request),
-            )
+            rendered = export_cache.get(cache_key, "docx")
+            if rendered is None:
+                # Se envia el archivo recien escrito; la cache lo guarda solo si es chico
+                rendered = _render_structured_docx_file(request, structured, template_path)
+                export_cache.put_file(cache_key, "docx", rendered)
+        except admission.Overloaded as exc:
+            filename = _safe_filename(_form_data(request).get("filename", "documento"))
+            return _overloaded(request, exc, structured, filename)
         except Exception as exc:
             detail = str(exc).strip()
             if len(detail) > 400:
@@ -256,91 +310,410 @@ def export_docx(request):
             return _render_text_editor(
                 request,
                 structured,
-                filename=_safe_filename(request.POST.get("filename", "documento")),
-                error=_msg(
+                filename=_safe_filename(_form_data(request).get("filename", "documento")),
+                error=_error_msg(
                     request,
                     "export_docx_template_failed",
                     detail=detail or _msg(request, "unknown_error"),
                 ),
             )
-        filename = _safe_filename(request.POST.get("filename", "documento"))
-        response = HttpResponse(
-            rendered,
-            content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        )
-        response["Content-Disposition"] = f'attachment; filename="{filename}.docx"'
-        return response
+        filename = _safe_filename(_form_data(request).get("filename", "documento"))
+        return _download_response(rendered, f"{filename}.docx", DOCX_CONTENT_TYPE, etag)
     else:
         # Exporta el texto libre (columna derecha)
         text = raw_text
-    filename = _safe_filename(request.POST.get("filename", "documento"))
-
-    docx_bytes = _build_docx_bytes(text)
+    filename = _safe_filename(_form_data(request).get("filename", "documento"))
+    etag = export_cache.etag_for(export_cache.text_export_key(text), "docx")
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
 
-    response = HttpResponse(
-        docx_bytes,
-        content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-    )
-    response["Content-Disposition"] = f'attachment; filename="{filename}.docx"'
-    return response
+    docx_data = _spooled_file()
+    _write_text_docx(text, docx_data)
+    return _download_response(docx_data, f"{filename}.docx", DOCX_CONTENT_TYPE, etag)
 
 
 @require_http_methods(["POST"])
 def export_pdf(request):
-    raw_text = request.POST.get("text", "")
-    use_structured = request.POST.get("use_structured") == "1"
-    filename = _safe_filename(request.POST.get("filename", "documento"))
+    raw_text = _form_data(request).get("text", "")
+    use_structured = _form_data(request).get("use_structured") == "1"
+    filename = _safe_filename(_form_data(request).get("filename", "documento"))
 
     if use_structured:
         # PDF desde estructura -> DOCX -> PDF
-        structured = structure_from_post(request.POST)
-        template_path = _template_path()
-        font_choice = _selected_font(request)
+        structured = _posted_structure(request)
+        if structured is None:
+            return _draft_not_found(request)
+        template_path = _template_path(_selected_template(request))
         if not template_path:
             return _render_text_editor(
                 request,
                 structured,
                 filename=filename,
-                error=_msg(request, "export_template_not_found"),
+                error=_error_msg(request, "export_template_not_found"),
             )
+        cache_key = _export_cache_key(request, structured, template_path)
+        etag = export_cache.etag_for(cache_key, "pdf")
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        cached_pdf = export_cache.get(cache_key, "pdf")
+        if cached_pdf:
+            return _pdf_response(cached_pdf, filename, etag)
+        # Reutiliza el DOCX si se acaba de exportar con la misma estructura
+        cached_docx = export_cache.get(cache_key, "docx")
+        if cached_docx is not None:
+            return _stream_pdf(request, structured, filename, etag, lambda out: out.write(cached_docx), cache_key)
+
+        def write_docx(out: BinaryIO) -> None:
+            _render_structured_docx_to(request, structured, template_path, out)
+            export_cache.put_file(cache_key, "docx", out)
+
+        return _stream_pdf(request, structured, filename, etag, write_docx, cache_key)
+
+    # PDF desde texto libre
+    etag = export_cache.etag_for(export_cache.text_export_key(raw_text), "pdf")
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return _stream_pdf(
+        request, default_structure(), filename, etag, lambda out: _write_text_docx(raw_text, out)
+    )
+
+
+@require_http_methods(["POST"])
+def export_batch(request):
+    # Misma estructura en varias variantes: {"variants": [{"ui_lang", "doc_font", "format"}, ...]}.
+    # Cada idioma arma el contenido una vez (la fuente se aplica al final) y los PDF se
+    # convierten en paralelo; la respuesta es un zip con un archivo por variante.
+    variants, detail = _export_variants(request)
+    if variants is None:
+        return _json_error(request, 400, "export_batch_invalid_variants", detail=detail)
+    structured = _posted_structure(request)
+    if structured is None:
+        return _draft_not_found(request)
+    template_path = _template_path(_selected_template(request))
+    if not template_path:
+        return _json_error(request, 500, "export_template_not_found")
+
+    from .docx_template import render_from_template
+
+    filename = _safe_filename(_form_data(request).get("filename", "documento"))
+    files: dict[tuple[str, str, str], bytes] = {}
+    to_convert: list[tuple[tuple[str, str, str], str, bytes]] = []
+    for lang, font_name, output_format in variants:
+        cache_key = export_cache.export_key(structured, font_name, lang, template_path)
+        cached = export_cache.get(cache_key, output_format)
+        if cached is not None:
+            files[(lang, font_name, output_format)] = cached
+            continue
+        docx_bytes = export_cache.get(cache_key, "docx")
+        if docx_bytes is None:
+            try:
+                with admission.admit("render_docx"):
+                    docx_bytes = render_from_template(structured, template_path, font_name=font_name, ui_lang=lang)
+            except admission.Overloaded as exc:
+                return _overloaded_json(request, exc)
+            except Exception as exc:
+                detail = str(exc).strip()[:400] or _msg(request, "unknown_error")
+                return _json_error(request, 500, "export_docx_template_failed", detail=detail)
+            export_cache.put(cache_key, "docx", docx_bytes)
+        if output_format == "docx":
+            files[(lang, font_name, output_format)] = docx_bytes
+        else:
+            to_convert.append(((lang, font_name, output_format), cache_key, docx_bytes))
+
+    if to_convert:
+        # Cada conversion del lote toma su propio cupo de convert_pdf: el pool puede tener mas
+        # hilos que el cupo, y un lote no debe convertir mas en paralelo que el limite
         try:
-            rendered_docx = render_from_template(
-                structured,
-                template_path,
-                font_name=font_choice,
-                ui_lang=_ui_lang(request),
-            )
-        except Exception:
-            rendered_docx = None
-        if not rendered_docx:
-            return _render_text_editor(
-                request,
-                structured,
-                filename=filename,
-                error=_msg(request, "export_docx_template_failed_generic"),
-            )
-        docx_bytes = rendered_docx
+            with stage("convert_pdf"):
+                results = convert_many_docx_to_pdf(
+                    [docx_bytes for _, _, docx_bytes in to_convert], slot=lambda: admission.admit("convert_pdf")
+                )
+        except admission.Overloaded as exc:
+            return _overloaded_json(request, exc)
+        for (variant, cache_key, _), (pdf_bytes, error) in zip(to_convert, results):
+            if not pdf_bytes:
+                message = _translate_backend_error(request, error) or _error_msg(request, "export_pdf_failed")
+                return JsonResponse({"error": message}, status=500)
+            export_cache.put(cache_key, "pdf", pdf_bytes)
+            files[variant] = pdf_bytes
+
+    response = HttpResponse(_variants_zip(filename, variants, files), content_type="application/zip")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.zip"'
+    return response
+
+
+@require_http_methods(["POST"])
+def draft_create(request):
+    # Crea un borrador con el documento completo del editor: {"structured": {...}}
+    if not drafts.drafts_enabled():
+        raise Http404
+    body = _json_body(request)
+    structured = body.get("structured") if isinstance(body, dict) else None
+    if not isinstance(structured, dict):
+        return _json_error(request, 400, "draft_invalid_json")
+    try:
+        token, version = drafts.create(structured)
+    except drafts.DraftPatchError as exc:
+        return _json_error(request, 400, "draft_patch_failed", detail=str(exc))
+    return JsonResponse({"token": token, "version": version}, status=201)
+
+
+@require_http_methods(["GET", "PATCH"])
+def draft_detail(request, token: str):
+    # GET devuelve el documento; PATCH aplica {"version": n, "ops": [...]} (JSON Patch)
+    if not drafts.drafts_enabled():
+        raise Http404
+    if request.method == "GET":
+        current = drafts.load(token)
+        if current is None:
+            return _json_error(request, 404, "draft_not_found")
+        doc, version = current
+        return JsonResponse({"token": token, "version": version, "structured": doc})
+
+    body = _json_body(request)
+    if isinstance(body, list):
+        body = {"ops": body}
+    if not isinstance(body, dict):
+        return _json_error(request, 400, "draft_invalid_json")
+    base_version = body.get("version")
+    if base_version is not None and not isinstance(base_version, int):
+        return _json_error(request, 400, "draft_invalid_json")
+    try:
+        version = drafts.update(token, body.get("ops"), base_version=base_version)
+    except drafts.DraftConflict as exc:
+        return _json_error(request, 409, "draft_version_conflict", version=exc.args[0])
+    except drafts.DraftPatchError as exc:
+        return _json_error(request, 400, "draft_patch_failed", detail=str(exc))
+    if version is None:
+        return _json_error(request, 404, "draft_not_found")
+    return JsonResponse({"token": token, "version": version})
+
+
+@require_http_methods(["GET"])
+def metrics_endpoint(request):
+    # Scrape en formato texto de Prometheus (suma todos los workers si hay METRICS_MULTIPROC_DIR)
+    if not getattr(settings, "METRICS_ENABLED", True):
+        raise Http404
+    return HttpResponse(metrics.render_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# --------------------
+# Helpers
+# --------------------
+
+
+def _posted_structure(request) -> dict | None:
+    # Con draft_token la estructura sale del borrador y el formulario no se reenvia;
+    # None si el borrador ya no existe
+    token = _form_data(request).get("draft_token", "").strip()
+    if not token or not drafts.drafts_enabled():
+        return structure_from_post(_form_data(request))
+    current = drafts.load(token)
+    if current is None:
+        return None
+    return structure_from_json(current[0])
+
+
+def _form_data(request):
+    # Formulario del editor, o cuerpo application/json con los mismos campos
+    # (valores sueltos o listas, como getlist)
+    if request.content_type != "application/json":
+        return request.POST
+    cached = getattr(request, "_editor_form_json", None)
+    if cached is None:
+        body = _json_body(request)
+        cached = QueryDict(mutable=True)
+        if isinstance(body, dict):
+            for name, value in body.items():
+                cached.setlist(name, json_form_values(value))
+        request._editor_form_json = cached
+    return cached
+
+
+def _draft_not_found(request) -> JsonResponse:
+    # El cliente reintenta enviando el formulario completo
+    return _json_error(request, 404, "draft_not_found")
+
+
+def _json_body(request):
+    try:
+        return json.loads(request.body.decode("utf-8") or "null")
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+def _json_error(request, status: int, key: str, **kwargs) -> JsonResponse:
+    return JsonResponse({"error": _error_msg(request, key, **kwargs)}, status=status)
+
+
+def _export_variants(request) -> tuple[list[tuple[str, str, str]] | None, str]:
+    # Acepta objetos {"ui_lang", "doc_font", "format"} o listas [ui_lang, doc_font, format],
+    # en un cuerpo JSON o en el campo de formulario "variants" (texto JSON)
+    if request.content_type == "application/json":
+        body = _json_body(request)
+        raw = body.get("variants") if isinstance(body, dict) else None
     else:
-        # PDF desde texto libre
-        structured = default_structure()
-        docx_bytes = _build_docx_bytes(raw_text)
-
-    pdf_bytes, error = _convert_docx_bytes_to_pdf(docx_bytes)
-    if pdf_bytes:
-        response = HttpResponse(pdf_bytes, content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{filename}.pdf"'
-        return response
+        try:
+            raw = json.loads(request.POST.get("variants", "") or "null")
+        except ValueError:
+            raw = None
+    if not isinstance(raw, list) or not raw:
+        return None, "se esperaba una lista de variantes"
+    if len(raw) > MAX_EXPORT_VARIANTS:
+        return None, f"maximo {MAX_EXPORT_VARIANTS} variantes"
+
+    variants: list[tuple[str, str, str]] = []
+    for item in raw:
+        if isinstance(item, dict):
+            item = [item.get("ui_lang"), item.get("doc_font"), item.get("format")]
+        if not isinstance(item, list) or len(item) != 3:
+            return None, f"variante invalida: {item!r}"
+        lang, font_name, output_format = (str(value or "").strip() for value in item)
+        if lang not in UI_MESSAGES:
+            return None, f"idioma no soportado: {lang!r}"
+        if font_name and font_name not in FONT_CHOICES:
+            return None, f"fuente no soportada: {font_name!r}"
+        if output_format.lower() not in EXPORT_FORMATS:
+            return None, f"formato no soportado: {output_format!r}"
+        variant = (lang, font_name, output_format.lower())
+        if variant not in variants:
+            variants.append(variant)
+    return variants, ""
+
+
+def _variants_zip(filename: str, variants: list[tuple[str, str, str]], files: dict) -> bytes:
+    # Zip sin compresion (DOCX y PDF ya vienen comprimidos) y con fecha fija
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for lang, font_name, output_format in variants:
+            font_suffix = f"-{slugify(font_name)}" if font_name else ""
+            info = zipfile.ZipInfo(f"{filename}-{lang}{font_suffix}.{output_format}", date_time=(1980, 1, 1, 0, 0, 0))
+            archive.writestr(info, files[(lang, font_name, output_format)])
+    return buffer.getvalue()
+
+
+def _export_cache_key(request, structured: dict, template_path: Path) -> str:
+    return export_cache.export_key(structured, _selected_font(request), _ui_lang(request), template_path)
+
+
+def _render_structured_docx_to(request, structured: dict, template_path: Path, out: BinaryIO) -> None:
+    from .docx_template import render_to_file
+
+    render_to_file(
+        structured,
+        template_path,
+        out,
+        font_name=_selected_font(request),
+        ui_lang=_ui_lang(request),
+    )
+
+
+def _render_structured_docx_file(request, structured: dict, template_path: Path) -> BinaryIO:
+    # El DOCX va directo a un archivo temporal que se envia tal cual, sin copias del
+    # documento en memoria
+    out = _spooled_file()
+    try:
+        with admission.admit("render_docx"):
+            _render_structured_docx_to(request, structured, template_path, out)
+    except BaseException:
+        out.close()
+        raise
+    return out
+
+
+def _spooled_file() -> BinaryIO:
+    # En memoria hasta EXPORT_SPOOL_MAX_MB; los documentos mas grandes pasan a disco
+    max_mb = float(getattr(settings, "EXPORT_SPOOL_MAX_MB", 2))
+    return tempfile.SpooledTemporaryFile(max_size=int(max_mb * 1024 * 1024))
+
+
+def _stream_pdf(
+    request, structured: dict, filename: str, etag: str, write_docx, cache_key: str | None = None
+) -> HttpResponse:
+    # PDF sin pasar por bytes: DOCX escrito en el archivo de entrada del conversor y
+    # PDF copiado por bloques a un archivo temporal que se envia con FileResponse (y se
+    # guarda en la cache si es chico)
+    pdf_file = _spooled_file()
+    try:
+        # El DOCX se escribe dentro del cupo de convert_pdf (no toma otro de render_docx)
+        with admission.admit("convert_pdf"), stage("convert_pdf"):
+            error = convert_docx_to_pdf_file(write_docx, pdf_file)
+    except admission.Overloaded as exc:
+        pdf_file.close()
+        return _overloaded(request, exc, structured, filename)
+    except Exception:
+        pdf_file.close()
+        return _render_text_editor(
+            request,
+            structured,
+            filename=filename,
+            error=_error_msg(request, "export_docx_template_failed_generic"),
+        )
+    if error is None:
+        if cache_key:
+            export_cache.put_file(cache_key, "pdf", pdf_file)
+        return _download_response(pdf_file, f"{filename}.pdf", "application/pdf", etag)
+    pdf_file.close()
     return _render_text_editor(
         request,
         structured,
         filename=filename,
-        error=_translate_backend_error(request, error) or _msg(request, "export_pdf_failed"),
+        error=_translate_backend_error(request, error) or _error_msg(request, "export_pdf_failed"),
     )
 
 
-# --------------------
-# Helpers
-# --------------------
+def _overloaded(request, exc: admission.Overloaded, structured: dict, filename: str) -> HttpResponse:
+    # Sin cupo para el trabajo pesado: 503 inmediato con el formulario intacto y Retry-After
+    response = _render_text_editor(
+        request,
+        structured,
+        filename=filename,
+        error=_error_msg(request, "server_busy", seconds=exc.retry_after),
+    )
+    response.status_code = 503
+    response["Retry-After"] = str(exc.retry_after)
+    return response
+
+
+def _overloaded_json(request, exc: admission.Overloaded) -> JsonResponse:
+    response = _json_error(request, 503, "server_busy", seconds=exc.retry_after)
+    response["Retry-After"] = str(exc.retry_after)
+    return response
+
+
+def _download_response(data: bytes | BinaryIO, download_name: str, content_type: str, etag: str) -> HttpResponse:
+    # Bytes (cache de exportaciones) o archivo temporal (se envia por bloques y se cierra al terminar)
+    if isinstance(data, bytes):
+        response = HttpResponse(data, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{download_name}"'
+    else:
+        data.seek(0)
+        response = FileResponse(data, as_attachment=True, filename=download_name, content_type=content_type)
+    response["ETag"] = etag
+    return response
+
+
+def _pdf_response(pdf_bytes: bytes, filename: str, etag: str) -> HttpResponse:
+    return _download_response(pdf_bytes, f"{filename}.pdf", "application/pdf", etag)
+
+
+def _etag_matches(request, etag: str) -> bool:
+    # If-None-Match con comparacion debil (ignora el prefijo W/). "*" solo vale en GET/HEAD:
+    # en un POST significa "si no existe" (RFC 9110 13.1.2) y no habla de estos bytes
+    header = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if not header:
+        return False
+    candidates = [value.removeprefix("W/") for value in parse_etags(header)]
+    if "*" in candidates and request.method in ("GET", "HEAD"):
+        return True
+    return etag.removeprefix("W/") in candidates
+
+
+def _not_modified(etag: str) -> HttpResponse:
+    # El cliente ya tiene estos bytes: no se renderiza ni se envia nada
+    response = HttpResponse(status=304)
+    response["ETag"] = etag
+    return response
 
 
 def _render_text_editor(request, structured, filename="documento", error: str | None = None):
@@ -348,21 +721,56 @@ def _render_text_editor(request, structured, filename="documento", error: str |
     font_choice = _selected_font(request)
     extra_countries = _extract_structured_countries(structured)
     country_choices = _merge_country_choices(COUNTRY_CHOICES, extra_countries)
-    return render(
-        request,
-        "editor/editor.html",
-        {
-            "text": build_text_from_structure(structured),
-            "filename": filename,
-            "structured": structured,
-            "error": error,
-            "ui_lang": _ui_lang(request),
-            "font_choices": FONT_CHOICES,
-            "selected_font": font_choice,
-            "country_choices": country_choices,
-            "year_choices": YEAR_CHOICES,
-        },
-    )
+    with stage("template_render"):
+        return render(
+            request,
+            "editor/editor.html",
+            {
+                # Solo se serializa si la plantilla usa {{ text }} (editor.html no lo muestra)
+                "text": functools.partial(_structure_text, structured),
+                "filename": filename,
+                "structured": structured,
+                "error": error,
+                "ui_lang": _ui_lang(request),
+                "font_choices": FONT_CHOICES,
+                "selected_font": font_choice,
+                "template_choices": template_registry.template_names(),
+                "selected_template": _selected_template(request),
+                "country_choices": country_choices,
+                "year_choices": YEAR_CHOICES,
+                "drafts_enabled": drafts.drafts_enabled(),
+            },
+        )
+
+
+def _structure_text(structured: dict) -> str:
+    canonical = json.dumps(structured, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return _structure_text_for(canonical)
+
+
+@functools.lru_cache(maxsize=32)
+def _structure_text_for(canonical: str) -> str:
+    # Memoizado por contenido: la misma estructura no se vuelve a serializar
+    return build_text_from_structure(json.loads(canonical))
+
+
+def _parse_upload(ext: str, raw: bytes) -> tuple[dict | None, str | None]:
+    # Resultado serializable a JSON: se comparte entre workers (singleflight)
+    payload = io.BytesIO(raw)
+    if ext == ".docx":
+        with admission.admit("parse_docx"):
+            with stage("extract"):
+                text, error = _extract_docx_text(payload)
+            if error:
+                return None, error
+            if not text.strip():
+                return None, UPLOAD_EMPTY_TEXT_ERROR
+            with stage("parse"):
+                return parse_resume(text), None
+    from .pdf_parse import parse_pdf_to_structure
+
+    with admission.admit("parse_pdf"):
+        return parse_pdf_to_structure(payload)
 
 
 def _text_error(request, message: str):
@@ -389,16 +797,22 @@ def _safe_filename(name: str) -> str:
     return safe[:80] or "documento"
 
 
-def _build_docx_bytes(text: str) -> bytes:
+def _text_docx(text: str):
     # DOCX basico para exportaciones sin plantilla
-    buffer = io.BytesIO()
+    from docx import Document as DocxDocument
+
     doc = DocxDocument()
     for line in text.splitlines():
         doc.add_paragraph(line)
     if not text.strip():
         doc.add_paragraph("")
-    doc.save(buffer)
-    return buffer.getvalue()
+    return doc
+
+
+def _write_text_docx(text: str, out: BinaryIO) -> None:
+    from .docx_writer import write_docx
+
+    write_docx(_text_docx(text), out)
 
 
 def _extract_docx_text(file_obj) -> tuple[str, str | None]:
@@ -407,6 +821,8 @@ def _extract_docx_text(file_obj) -> tuple[str, str | None]:
     if not raw:
         return "", "El archivo DOCX esta vacio."
 
+    from docx import Document as DocxDocument
+
     lines: list[str] = []
     try:
         doc = DocxDocument(io.BytesIO(raw))
@@ -472,27 +888,26 @@ def _extract_docx_text(file_obj) -> tuple[str, str | None]:
     return "", "No se encontro texto legible dentro del DOCX."
 
 
-def _template_path() -> Path | None:
-    # Ruta de plantilla definida por .env o default
-    env_path = getattr(settings, "CV_TEMPLATE_PATH", "").strip()
-    if env_path:
-        candidate = Path(env_path)
-        if not candidate.is_absolute():
-            candidate = Path(settings.BASE_DIR) / candidate
-        if candidate.is_file():
-            return candidate
+def _template_path(name: str | None = None) -> Path | None:
+    # Plantilla registrada por nombre (vacio = la principal)
+    return template_registry.resolve(name)
 
-    candidate = Path(settings.BASE_DIR) / "templates" / "cv_template.docx"
-    if candidate.is_file():
-        return candidate
-    return None
+
+def _selected_template(request) -> str:
+    # Solo valida plantillas registradas; si no, la principal
+    if request.method != "POST":
+        return ""
+    choice = _form_data(request).get("template", "").strip()
+    if choice and choice in template_registry.template_paths():
+        return choice
+    return ""
 
 
 def _selected_font(request) -> str:
     # Solo valida fuentes permitidas
     if request.method != "POST":
         return ""
-    choice = request.POST.get("doc_font", "").strip()
+    choice = _form_data(request).get("doc_font", "").strip()
     if not choice:
         return ""
     if choice in FONT_CHOICES:
@@ -503,52 +918,3 @@ def _selected_font(request) -> str:
 def _normalize_key(text: str) -> str:
     normalized = unicodedata.normalize("NFKD", text)
     return "".join(char for char in normalized if not unicodedata.combining(char)).lower().strip()
-
-
-def _convert_docx_bytes_to_pdf(docx_bytes: bytes) -> tuple[bytes | None, str | None]:
-    # Convierte DOCX a PDF usando docx2pdf (requiere Word instalado)
-    try:
-        from docx2pdf import convert as docx2pdf_convert
-    except Exception:
-        return None, "docx2pdf no esta instalado. Ejecuta pip install -r requirements.txt."
-
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        input_path = tmp_path / "documento.docx"
-        input_path.write_bytes(docx_bytes)
-        output_path = tmp_path / "documento.pdf"
-
-        pythoncom = None
-        try:
-            import pythoncom  # type: ignore
-        except Exception:
-            pythoncom = None
-
-        co_initialized = False
-        try:
-            if pythoncom is not None:
-                pythoncom.CoInitialize()
-                co_initialized = True
-            docx2pdf_convert(str(input_path), str(output_path))
-        except Exception as exc:
-            detail = str(exc).strip()
-            if detail:
-                if len(detail) > 400:
-                    detail = detail[:400].rstrip() + "..."
-                return None, f"docx2pdf fallo al convertir: {detail}"
-            return None, "docx2pdf fallo al convertir. Asegura que Microsoft Word este instalado."
-        finally:
-            if pythoncom is not None and co_initialized:
-                try:
-                    pythoncom.CoUninitialize()
-                except Exception:
-                    pass
-
-        if not output_path.exists():
-            alt_path = input_path.with_suffix(".pdf")
-            if alt_path.exists():
-                output_path = alt_path
-            else:
-                return None, "docx2pdf no genero el PDF esperado. Verifica Microsoft Word."
-
-        return output_path.read_bytes(), None
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import gc
+import importlib
+import os
+import threading
+import time
+
+# Modulos pesados que views.py importa recien al primer upload/export
+HEAVY_MODULES = (
+    "lxml.etree",
+    "docx",
+    "pdfplumber",
+    "editor.structure_constants",
+    "editor.pdf_parse",
+    "editor.pdf_parse.constants",
+    "editor.docx_template",
+    "editor.docx_writer",
+)
+
+_WARMED: dict[str, float] | None = None
+_WARMUP_LOCK = threading.Lock()
+
+
+def warmup(freeze: bool = True) -> dict[str, float]:
+    """Precarga en el proceso maestro lo que cada worker reconstruiria por su cuenta.
+
+    Pensado para gunicorn con ``preload_app`` (EDITOR_WARMUP=true) o para llamarse
+    desde un hook ``on_starting``/``pre_fork``. Es idempotente y devuelve la duracion
+    (ms) de cada paso.
+    """
+    global _WARMED
+    with _WARMUP_LOCK:
+        if _WARMED is not None:
+            return _WARMED
+
+        import django
+        from django.apps import apps
+
+        # Desde AppConfig.ready los modelos ya estan listos; desde un hook de gunicorn no
+        if not apps.models_ready:
+            os.environ.setdefault("DJANGO_SETTINGS_MODULE", "trufadocs.settings")
+            django.setup()
+
+        timings: dict[str, float] = {}
+
+        def step(name: str, func) -> None:
+            started = time.perf_counter()
+            try:
+                func()
+            except Exception:
+                # Un paso fallido (ej. pdfplumber ausente) no debe impedir el arranque
+                pass
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+        # Imports pesados y regex compiladas a nivel de modulo
+        step("modules", _import_heavy_modules)
+        step("template", _preload_docx_template)
+        step("editor_page", _render_editor_page)
+
+        # Las etapas medidas aqui (template_render...) no deben heredarlas todos los workers
+        from . import metrics
+
+        metrics.reset()
+
+        if freeze:
+            # Objetos ya creados pasan a la generacion permanente: el GC de cada worker
+            # no los recorre y las paginas compartidas copy-on-write no se ensucian
+            gc.collect()
+            gc.freeze()
+        _WARMED = timings
+        return timings
+
+
+def _import_heavy_modules() -> None:
+    for name in HEAVY_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+
+
+def _preload_docx_template() -> None:
+    from .template_registry import preload_all
+
+    preload_all()
+
+
+def _render_editor_page() -> None:
+    # Compila editor.html (loader con cache) y construye las listas de opciones
+    from django.test import RequestFactory
+
+    from .views import index
+
+    index(RequestFactory().get("/"))
@@ -40,6 +40,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "editor.middleware.ServerTimingMiddleware",
+    "editor.middleware.SlowRequestProfilerMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -88,6 +90,72 @@ MEDIA_ROOT = BASE_DIR / "media"
 # Limites y rutas configurables por entorno
 MAX_UPLOAD_MB = int(os.environ.get("MAX_UPLOAD_MB", "25"))
 CV_TEMPLATE_PATH = os.environ.get("CV_TEMPLATE_PATH", "")
+# Carpeta con plantillas adicionales (.docx), elegibles por nombre en el editor
+CV_TEMPLATES_DIR = os.environ.get("CV_TEMPLATES_DIR", "")
+
+# Conversion DOCX -> PDF: "docx2pdf" (requiere Word) o "libreoffice" (soffice headless)
+PDF_CONVERTER = os.environ.get("PDF_CONVERTER", "docx2pdf").strip().lower()
+LIBREOFFICE_BINARY = os.environ.get("LIBREOFFICE_BINARY", "")
+PDF_CONVERTER_TIMEOUT = int(os.environ.get("PDF_CONVERTER_TIMEOUT", "120"))
+# Conversiones simultaneas por proceso (exportacion de varias variantes en un request)
+PDF_CONVERTER_WORKERS = int(os.environ.get("PDF_CONVERTER_WORKERS", "2"))
+
+# Header Server-Timing con la duracion de cada etapa (extract, parse, render_docx...)
+SERVER_TIMING_ENABLED = _get_env_bool("SERVER_TIMING_ENABLED", True)
+
+# Endpoint /metrics/; con varios workers (gunicorn) definir un directorio compartido
+METRICS_ENABLED = _get_env_bool("METRICS_ENABLED", True)
+METRICS_MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR", "")
+
+# Precarga (modulos pesados, plantilla, editor.html) al iniciar la app; usar con gunicorn --preload
+EDITOR_WARMUP = _get_env_bool("EDITOR_WARMUP", False)
+
+# Cache en memoria de DOCX/PDF exportados (por proceso); 0 la desactiva
+EXPORT_CACHE_MAX_MB = float(os.environ.get("EXPORT_CACHE_MAX_MB", "64"))
+# Exportaciones mas grandes no se guardan en la cache
+EXPORT_CACHE_MAX_ENTRY_MB = float(os.environ.get("EXPORT_CACHE_MAX_ENTRY_MB", "4"))
+# Cada export nuevo se escribe en un archivo temporal: en memoria hasta este tamaño, luego a disco
+EXPORT_SPOOL_MAX_MB = float(os.environ.get("EXPORT_SPOOL_MAX_MB", "2"))
+
+# Control de admision: trabajos pesados simultaneos por clase (0 = sin limite), cuantos
+# requests pueden esperar cupo y por cuanto tiempo antes de responder 503. Los cupos se
+# comparten entre workers con lock files en ADMISSION_DIR (vacio = solo por proceso)
+ADMISSION_LIMITS = {
+    "parse_pdf": int(os.environ.get("ADMISSION_PARSE_PDF", "2")),
+    "parse_docx": int(os.environ.get("ADMISSION_PARSE_DOCX", "4")),
+    "render_docx": int(os.environ.get("ADMISSION_RENDER_DOCX", "4")),
+    "convert_pdf": int(os.environ.get("ADMISSION_CONVERT_PDF", "2")),
+}
+ADMISSION_QUEUE_SIZE = int(os.environ.get("ADMISSION_QUEUE_SIZE", "8"))
+ADMISSION_WAIT_SECONDS = float(os.environ.get("ADMISSION_WAIT_SECONDS", "10"))
+ADMISSION_RETRY_AFTER = int(os.environ.get("ADMISSION_RETRY_AFTER", "5"))
+# Opcional: un directorio propio por instalacion (dos instalaciones con el mismo directorio
+# comparten los cupos)
+ADMISSION_DIR = os.environ.get("ADMISSION_DIR", "")
+
+# Coalescencia de subidas identicas entre workers (lock files); vacio = solo dentro del proceso
+SINGLEFLIGHT_DIR = os.environ.get("SINGLEFLIGHT_DIR", "")
+SINGLEFLIGHT_TIMEOUT = float(os.environ.get("SINGLEFLIGHT_TIMEOUT", "60"))
+
+# Borradores del editor (JSON Patch) para exportar sin reenviar el formulario.
+# En memoria por proceso; con varios workers definir DRAFTS_CACHE_DIR (compartido)
+DRAFTS_ENABLED = _get_env_bool("DRAFTS_ENABLED", True)
+DRAFTS_TTL_SECONDS = int(os.environ.get("DRAFTS_TTL_SECONDS", str(24 * 3600)))
+DRAFTS_CACHE_DIR = os.environ.get("DRAFTS_CACHE_DIR", "")
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "drafts": (
+        {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": DRAFTS_CACHE_DIR}
+        if DRAFTS_CACHE_DIR
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "trufadocs-drafts"}
+    ),
+}
+
+# Profiler de requests lentos (desactivado si PROFILING_DIR esta vacio o el muestreo es 0)
+PROFILING_DIR = os.environ.get("PROFILING_DIR", "")
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_THRESHOLD_MS = float(os.environ.get("PROFILING_THRESHOLD_MS", "2000"))
+PROFILING_MAX_DUMPS = int(os.environ.get("PROFILING_MAX_DUMPS", "200"))
 
 FILE_UPLOAD_MAX_MEMORY_SIZE = MAX_UPLOAD_MB * 1024 * 1024
 DATA_UPLOAD_MAX_MEMORY_SIZE = MAX_UPLOAD_MB * 1024 * 1024